@@ -0,0 +1,35 @@
+import pytest
+
+from src.data.process_data import SetProcessData
+from tests.test_fixtures import create_seeded_process_data
+
+# Grid of the benchmarks: number of samples (rows) of each circuit, number of circuits of each plant and
+# number of plants of the industrial park. 2,160 rows are 90 days of hourly samples (as the sample data of
+# the application) and 52,560 rows are one year of 10 minutes samples.
+BENCHMARK_ROWS = [2_160, 52_560]
+BENCHMARK_CIRCUITS = [3, 20]
+BENCHMARK_PLANTS = [1, 5]
+
+# Time frequency of the synthetic samples
+BENCHMARK_SAMPLE_FREQ = '10min'
+
+@pytest.fixture(params=BENCHMARK_ROWS, ids=lambda n_rows: f'rows{n_rows}')
+def n_rows(request):
+    return request.param
+
+@pytest.fixture(params=BENCHMARK_CIRCUITS, ids=lambda n_circuits: f'circuits{n_circuits}')
+def n_circuits(request):
+    return request.param
+
+@pytest.fixture(params=BENCHMARK_PLANTS, ids=lambda n_plants: f'plants{n_plants}')
+def n_plants(request):
+    return request.param
+
+@pytest.fixture
+def process_data_obj(n_rows, n_circuits):
+    return create_seeded_process_data('Plant 1', n_rows, n_circuits, seed=0, freq=BENCHMARK_SAMPLE_FREQ)
+
+@pytest.fixture
+def data_ind_park(n_rows, n_circuits, n_plants):
+    return SetProcessData([create_seeded_process_data(f'Plant {i + 1}', n_rows, n_circuits, seed=i,
+                                                    freq=BENCHMARK_SAMPLE_FREQ) for i in range(n_plants)])
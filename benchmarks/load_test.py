@@ -0,0 +1,342 @@
+"""
+Load test of the Dash server: simulated users replay the callback requests sent by the browser
+('_dash-update-component') while they switch plants, months and date ranges, and the throughput and the
+latency percentiles of each callback are reported for several server configurations:
+
+    dev: development server of Flask/Werkzeug handling one request at a time (serial baseline).
+    threaded: development server with a thread per request (as 'python app.py'), a single process.
+    workers: gunicorn with the configuration of 'gunicorn.conf.py' (workers and threads per worker, requires
+        the 'gunicorn' package).
+
+Each server runs locally in a new process, with the data and figures warmed up ('wsgi.create_server').
+
+Example of command (from the project directory):
+```
+python benchmarks/load_test.py --configs dev threaded workers --users 20 --sequences 5
+```
+"""
+import argparse
+import http.client
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / 'src'
+
+SERVER_CONFIGS = ('dev', 'threaded', 'workers')
+
+# Value of the circuit filters with all the circuits (see 'app_layout.CIRCUIT_FILTER_ALL')
+CIRCUIT_FILTER_ALL = 'all'
+
+# Development server (Werkzeug) of the WSGI application of 'wsgi.py'
+_DEV_SERVER_SCRIPT = """
+from werkzeug.serving import run_simple
+from wsgi import create_server
+run_simple({host!r}, {port}, create_server(), threaded={threaded})
+"""
+
+def callback_payload(outputs: t.Sequence[tuple], inputs: t.Sequence[tuple], changed_ids: t.Sequence[str] = None) -> dict:
+    """
+    Create the body of the request sent by the Dash renderer to run the callback with the given outputs
+    and inputs (lists of (component id, property) and (component id, property, value)).
+
+    Args:
+        outputs (list of tuple): Outputs (component id, property) of the callback.
+        inputs (list of tuple): Inputs (component id, property, value) of the callback.
+        changed_ids (list of str, optional): Component ids of the inputs that triggered the callback.
+                                            Default: all the inputs.
+
+    Returns:
+        payload (dict): Body of the request.
+    """
+    output = '..' + '...'.join(f'{component_id}.{prop}' for component_id, prop in outputs) + '..' \
+        if len(outputs) > 1 else '{}.{}'.format(*outputs[0])
+    return {
+        'output': output,
+        'outputs': [{'id': component_id, 'property': prop} for component_id, prop in outputs]
+                    if len(outputs) > 1 else {'id': outputs[0][0], 'property': outputs[0][1]},
+        'inputs': [{'id': component_id, 'property': prop, 'value': value} for component_id, prop, value in inputs],
+        'changedPropIds': [f'{component_id}.{prop}' for component_id, prop, _ in inputs
+                        if changed_ids is None or component_id in changed_ids],
+        'state': [],
+    }
+
+class SimulatedUser(object):
+    """
+    User of the dashboard that replays the callback requests of the browser over a keep-alive connection,
+    recording the latency of each request in the shared list 'results' as (callback name, seconds, ok).
+    """
+
+    def __init__(self, host: str, port: int, plant_names: t.Sequence[str], results: list, seed: int = 0,
+                think_time: float = 0.0):
+        self.connection = http.client.HTTPConnection(host, port, timeout=120)
+        self.plant_names = list(plant_names)
+        self.results = results
+        self.rng = random.Random(seed)
+        self.think_time = think_time
+
+    def post_callback(self, callback_name: str, payload: dict) -> t.Optional[dict]:
+        start = time.perf_counter()
+        try:
+            self.connection.request('POST', '/_dash-update-component', body=json.dumps(payload),
+                                    headers={'Content-Type': 'application/json'})
+            response = self.connection.getresponse()
+            body = response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            body, ok = None, False
+        self.results.append((callback_name, time.perf_counter() - start, ok))
+
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, 2 * self.think_time))
+        return json.loads(body) if ok else None
+
+    def run_sequence(self):
+        """
+        Replay the requests of a plant switch in the Index Report, a month switch and a plant switch followed
+        by a date range change in the Control Chart.
+        """
+
+        plant_name = self.rng.choice(self.plant_names)
+
+        # Plant switch (Index Report): options of the month selector and report with the month updates
+        self.post_callback('get_month_selector_options_callback',
+                        callback_payload([('month-selector', 'options'), ('month-selector', 'value')],
+                                        [('plant-selector', 'value', plant_name)]))
+        self.post_callback('create_figure_report_callback',
+                        callback_payload([('fig_index_report', 'figure'), ('report-month-store', 'data')],
+                                        [('plant-selector', 'value', plant_name),
+                                        ('circuit-filter', 'value', CIRCUIT_FILTER_ALL),
+                                        ('circuit-page', 'value', 1)],
+                                        changed_ids=['plant-selector']))
+
+        # Month switch: the report is updated in the browser with the month updates (clientside callback),
+        # so no request is sent to the server
+
+        # Plant switch (Control Chart): options of the date range selector and control chart of the default range
+        response = self.post_callback('get_date_range_selector_options_callback',
+                                    callback_payload([('date-range-selector', 'min_date_allowed'),
+                                                    ('date-range-selector', 'max_date_allowed'),
+                                                    ('date-range-selector', 'start_date'),
+                                                    ('date-range-selector', 'end_date')],
+                                                    [('plant-selector-cc', 'value', plant_name)]))
+        if response is None:
+            return
+        date_range = response['response']['date-range-selector']
+        self._post_control_chart(plant_name, date_range['start_date'], date_range['end_date'], 'plant-selector-cc')
+
+        # Date range change: random range of 7 to 30 days of the data
+        min_date = np.datetime64(date_range['min_date_allowed'][:10])
+        max_date = np.datetime64(date_range['max_date_allowed'][:10])
+        n_days = self.rng.randint(7, 30)
+        n_days_data = int((max_date - min_date) / np.timedelta64(1, 'D'))
+        start_date = min_date + np.timedelta64(self.rng.randint(0, max(n_days_data - n_days, 0)), 'D')
+        self._post_control_chart(plant_name, str(start_date), str(start_date + np.timedelta64(n_days, 'D')),
+                                'date-range-selector')
+
+    def _post_control_chart(self, plant_name: str, start_date: str, end_date: str, changed_id: str):
+        inputs = [('plant-selector-cc', 'value', plant_name),
+                ('circuit-filter-cc', 'value', CIRCUIT_FILTER_ALL),
+                ('circuit-page-cc', 'value', 1),
+                ('date-range-selector', 'start_date', start_date),
+                ('date-range-selector', 'end_date', end_date)]
+        self.post_callback('create_figure_control_chart_callback',
+                        callback_payload([('fig_control_chart', 'figure')], inputs, changed_ids=[changed_id]))
+        self.post_callback('toggle_live_mode_callback',
+                        callback_payload([('live-interval', 'disabled'), ('live-store', 'data')],
+                                        [('live-mode', 'value', [])] + inputs, changed_ids=[changed_id]))
+
+    def close(self):
+        self.connection.close()
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(server_config: str, host: str, port: int, workers: int = None, threads: int = None,
+                ready_timeout: float = 300.0) -> subprocess.Popen:
+    """
+    Start the application server with the given configuration in a new process, and wait until it is ready
+    (route '/ready', after the warm-up).
+
+    Args:
+        server_config (str): Configuration of the server ('dev', 'threaded' or 'workers').
+        host (str): Host of the server.
+        port (int): Port of the server.
+        workers (int, optional): Number of gunicorn workers. Default: 'config.server_config.workers'.
+        threads (int, optional): Number of threads of each gunicorn worker. Default: 'config.server_config.threads'.
+        ready_timeout (float, default=300.0): Maximum time (seconds) to wait for the server.
+
+    Returns:
+        process (subprocess.Popen): Process of the server.
+    """
+
+    if server_config in ('dev', 'threaded'):
+        command = [sys.executable, '-c', _DEV_SERVER_SCRIPT.format(host=host, port=port,
+                                                                  threaded=server_config == 'threaded')]
+    elif server_config == 'workers':
+        command = [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'{host}:{port}']
+        if workers is not None:
+            command += ['--workers', str(workers)]
+        if threads is not None:
+            command += ['--threads', str(threads)]
+    else:
+        raise ValueError(f"Invalid server configuration: {server_config!r}. Valid values: {', '.join(SERVER_CONFIGS)}")
+
+    process = subprocess.Popen(command, cwd=SRC_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + ready_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server {server_config!r} exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.request('GET', '/ready')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.5)
+
+    stop_server(process)
+    raise TimeoutError(f"Server {server_config!r} was not ready after {ready_timeout} seconds")
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def get_plant_names(host: str, port: int) -> list:
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    connection.request('GET', '/api/plants')
+    return [plant['plant'] for plant in json.loads(connection.getresponse().read())]
+
+def summarize_results(results: t.Sequence[tuple], duration: float) -> dict:
+    """
+    Summarize the latencies of the requests of each callback.
+
+    Args:
+        results (list of tuple): Requests (callback name, latency in seconds, ok).
+        duration (float): Duration (seconds) of the load test.
+
+    Returns:
+        summary (dict): Dictionary {callback name: statistics} with the number of 'requests' and 'errors',
+                        the 'throughput' (requests per second) and the 'p50_ms', 'p95_ms' and 'p99_ms'
+                        latencies. The key 'all' has the statistics of all the requests.
+    """
+
+    latencies = {}
+    errors = {}
+    for callback_name, latency, ok in results:
+        for key in (callback_name, 'all'):
+            latencies.setdefault(key, []).append(latency)
+            errors[key] = errors.get(key, 0) + (not ok)
+
+    summary = {}
+    for key, values in latencies.items():
+        p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+        summary[key] = {'requests': len(values), 'errors': errors[key], 'throughput': len(values) / duration,
+                        'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+    return summary
+
+def run_load_test(host: str, port: int, n_users: int = 20, n_sequences: int = 5, think_time: float = 0.0,
+                seed: int = 0) -> dict:
+    """
+    Run the load test against a running server: 'n_users' concurrent simulated users replay 'n_sequences'
+    callback sequences each ('SimulatedUser.run_sequence').
+
+    Args:
+        host (str): Host of the server.
+        port (int): Port of the server.
+        n_users (int, default=20): Number of concurrent users.
+        n_sequences (int, default=5): Number of sequences replayed by each user.
+        think_time (float, default=0.0): Mean pause (seconds) of the users after each request.
+        seed (int, default=0): Seed of the random choices (plants and date ranges) of the users.
+
+    Returns:
+        summary (dict): Statistics of each callback ('summarize_results') and the 'duration' (seconds).
+    """
+
+    plant_names = get_plant_names(host, port)
+    results = []
+    users = [SimulatedUser(host, port, plant_names, results, seed=seed + i, think_time=think_time)
+            for i in range(n_users)]
+
+    # All the users start at the same time
+    start_barrier = threading.Barrier(n_users)
+
+    def run_user(user):
+        start_barrier.wait()
+        for _ in range(n_sequences):
+            user.run_sequence()
+        user.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_users) as executor:
+        list(executor.map(run_user, users))
+    duration = time.perf_counter() - start
+
+    return {'duration': duration, 'callbacks': summarize_results(results, duration)}
+
+def format_summary(server_config: str, summary: dict) -> str:
+    lines = [f"Server: {server_config} ({summary['duration']:.1f} s)",
+            f"{'callback':<42}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    for callback_name, stats in sorted(summary['callbacks'].items(), key=lambda item: item[0] == 'all'):
+        lines.append(f"{callback_name:<42}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput']:>9.1f}"
+                    f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+    return '\n'.join(lines)
+
+def _setup_parser_load_test():
+    parser = argparse.ArgumentParser(description='Load test of the Dash server')
+    parser.add_argument('--configs', nargs='+', choices=SERVER_CONFIGS, default=list(SERVER_CONFIGS))
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--sequences', type=int, default=5)
+    parser.add_argument('--think-time', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=None, help='JSON file with the summaries')
+    return parser
+
+if __name__ == '__main__':
+    args = _setup_parser_load_test().parse_args()
+    host = '127.0.0.1'
+    summaries = {}
+
+    for server_config in args.configs:
+        port = get_free_port()
+        try:
+            process = start_server(server_config, host, port, workers=args.workers, threads=args.threads)
+        except RuntimeError as e:
+            print(f"Server: {server_config} (not available: {e})\n")
+            continue
+        try:
+            summaries[server_config] = run_load_test(host, port, n_users=args.users, n_sequences=args.sequences,
+                                                    think_time=args.think_time, seed=args.seed)
+        finally:
+            stop_server(process)
+        print(format_summary(server_config, summaries[server_config]) + '\n')
+
+    if len(summaries) > 1:
+        print(f"{'server':<12}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for server_config, summary in summaries.items():
+            stats = summary['callbacks']['all']
+            print(f"{server_config:<12}{stats['throughput']:>9.1f}{stats['p50_ms']:>10.1f}"
+                f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(summaries, indent=2))
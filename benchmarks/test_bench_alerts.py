@@ -0,0 +1,34 @@
+from src.alerts.engine import AlertEngine
+
+# Samples appended before each evaluation (one hour of 10 minutes samples), and number of evaluations
+NEW_SAMPLES = 6
+ROUNDS = 10
+
+class _NullSink(object):
+    def write(self, alerts):
+        return list(alerts)
+
+class TestBenchAlerts(object):
+    """
+    Evaluation of the alerting engine after new samples arrive, which must not depend on the number of rows of
+    the history (compare the results of the 'rows' grid).
+    """
+
+    def test_evaluate_new_samples(self, benchmark, data_ind_park):
+        new_data = {}
+        for process_data_obj in data_ind_park.process_data_objs:
+            data = process_data_obj.data
+            process_data_obj.update_data(data.iloc[:-NEW_SAMPLES * ROUNDS].copy())
+            new_data[process_data_obj.plant_name] = data.iloc[-NEW_SAMPLES * ROUNDS:]
+
+        alert_engine = AlertEngine(data_ind_park, [_NullSink()])
+        alert_engine.evaluate()
+
+        rounds = iter(range(ROUNDS))
+        def append_new_samples():
+            i = next(rounds)
+            for process_data_obj in data_ind_park.process_data_objs:
+                new_samples = new_data[process_data_obj.plant_name].iloc[i * NEW_SAMPLES:(i + 1) * NEW_SAMPLES]
+                process_data_obj.append_data(new_samples)
+
+        benchmark.pedantic(alert_engine.evaluate, setup=append_new_samples, rounds=ROUNDS)
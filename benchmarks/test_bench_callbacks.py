@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+# The callbacks are registered by the application modules imported from the 'src' directory (pythonpath),
+# so they are imported in the same way here
+import app_layout
+import pipeline
+from app import create_app
+from cache.result_cache import get_result_cache
+
+from benchmarks.load_test import callback_payload
+
+@pytest.fixture(scope='session')
+def dash_app():
+    # The callbacks are registered globally, so the application is created once
+    return create_app()
+
+@pytest.fixture
+def client(monkeypatch, dash_app, data_ind_park):
+    monkeypatch.setattr(pipeline, '_data_ind_park', data_ind_park)
+    get_result_cache().clear()
+    yield dash_app.server.test_client()
+    get_result_cache().clear()
+
+def _report_payload(plant_name):
+    return callback_payload([('fig_index_report', 'figure'), ('report-month-store', 'data')],
+                            [('plant-selector', 'value', plant_name),
+                            ('circuit-filter', 'value', app_layout.CIRCUIT_FILTER_ALL),
+                            ('circuit-page', 'value', 1)])
+
+def _control_chart_payload(process_data_obj):
+    start_date, end_date = app_layout._get_default_date_range(process_data_obj)
+    return callback_payload([('fig_control_chart', 'figure')],
+                            [('plant-selector-cc', 'value', process_data_obj.plant_name),
+                            ('circuit-filter-cc', 'value', app_layout.CIRCUIT_FILTER_ALL),
+                            ('circuit-page-cc', 'value', 1),
+                            ('date-range-selector', 'start_date', start_date.isoformat()),
+                            ('date-range-selector', 'end_date', end_date.isoformat())])
+
+def _clear_caches(data_ind_park):
+    get_result_cache().clear()
+    for process_data_obj in data_ind_park.process_data_objs:
+        process_data_obj.clear_derived_cache()
+
+class TestBenchCallbacks(object):
+    """
+    End-to-end latency of the figure callbacks (request handling, computation, figure build and JSON
+    encoding), requesting the figures of all the plants of the industrial park.
+    """
+
+    def _post_all_plants(self, client, payloads):
+        for payload in payloads:
+            response = client.post('/_dash-update-component', data=json.dumps(payload),
+                                content_type='application/json')
+            assert response.status_code == 200
+
+    def test_report_callback_cold(self, benchmark, client, data_ind_park):
+        payloads = [_report_payload(plant_name) for plant_name in data_ind_park.list_plant_names]
+        benchmark.pedantic(self._post_all_plants, args=(client, payloads),
+                        setup=lambda: _clear_caches(data_ind_park), rounds=3)
+
+    def test_report_callback_cached(self, benchmark, client, data_ind_park):
+        payloads = [_report_payload(plant_name) for plant_name in data_ind_park.list_plant_names]
+        self._post_all_plants(client, payloads)
+        benchmark(self._post_all_plants, client, payloads)
+
+    def test_control_chart_callback_cold(self, benchmark, client, data_ind_park):
+        payloads = [_control_chart_payload(obj) for obj in data_ind_park.process_data_objs]
+        benchmark.pedantic(self._post_all_plants, args=(client, payloads),
+                        setup=lambda: _clear_caches(data_ind_park), rounds=3)
+
+    def test_control_chart_callback_cached(self, benchmark, client, data_ind_park):
+        payloads = [_control_chart_payload(obj) for obj in data_ind_park.process_data_objs]
+        self._post_all_plants(client, payloads)
+        benchmark(self._post_all_plants, client, payloads)
@@ -0,0 +1,34 @@
+import importlib.util
+
+import pytest
+
+from benchmarks.load_test import SERVER_CONFIGS, get_free_port, run_load_test, start_server, stop_server
+
+# Concurrent users of the load test, and sequences (plant, month and date range switches) of each user
+LOAD_TEST_USERS = 10
+LOAD_TEST_SEQUENCES = 3
+
+HOST = '127.0.0.1'
+
+@pytest.fixture(params=SERVER_CONFIGS)
+def server_port(request):
+    if request.param == 'workers' and importlib.util.find_spec('gunicorn') is None:
+        pytest.skip("Package 'gunicorn' is required by the 'workers' server configuration")
+
+    port = get_free_port()
+    process = start_server(request.param, HOST, port)
+    yield port
+    stop_server(process)
+
+class TestBenchLoad(object):
+    """
+    Load test of each server configuration ('load_test.py'). The benchmark measures the duration of the whole
+    load test, and the 'extra_info' of the results has the throughput and latency percentiles of each callback.
+    """
+
+    def test_load(self, benchmark, server_port):
+        summary = benchmark.pedantic(run_load_test, args=(HOST, server_port),
+                                    kwargs=dict(n_users=LOAD_TEST_USERS, n_sequences=LOAD_TEST_SEQUENCES), rounds=1)
+
+        benchmark.extra_info.update(summary['callbacks'])
+        assert summary['callbacks']['all']['errors'] == 0
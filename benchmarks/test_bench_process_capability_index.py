@@ -0,0 +1,29 @@
+import pytest
+
+from src.process_capability_index.utils import calculate_cap_index_ppk, get_circuits_below_goal, get_worst_circuits
+
+class TestBenchCapIndexPpk(object):
+
+    @pytest.mark.parametrize('freq', ['BMS', 'W', 'D'])
+    def test_calculate_cap_index_ppk(self, benchmark, process_data_obj, freq):
+        ppk_rep = benchmark(calculate_cap_index_ppk, process_data_obj, freq=freq)
+        assert len(ppk_rep)
+
+    def test_get_circuits_below_goal(self, benchmark, process_data_obj):
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+        benchmark(get_circuits_below_goal, process_data_obj, ppk_rep_monthly)
+
+class TestBenchWorstCircuits(object):
+
+    def test_get_worst_circuits_cold(self, benchmark, data_ind_park):
+        def clear_derived_caches():
+            for process_data_obj in data_ind_park.process_data_objs:
+                process_data_obj.clear_derived_cache()
+
+        worst_circuits = benchmark.pedantic(get_worst_circuits, args=(data_ind_park, 20), setup=clear_derived_caches,
+                                            rounds=5)
+        assert len(worst_circuits)
+
+    def test_get_worst_circuits_cached(self, benchmark, data_ind_park):
+        get_worst_circuits(data_ind_park, 20)
+        benchmark(get_worst_circuits, data_ind_park, 20)
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / 'src'
+
+# Modules whose import cost is measured (as imported by the production server: 'gunicorn.conf.py' imports
+# 'app_config', the WSGI factory imports 'app' and the callbacks are in 'app_layout')
+STARTUP_MODULES = ['app_config', 'pipeline', 'app', 'app_layout']
+
+# Script run in a new interpreter until the first response of the application: creation of the application
+# (imports, data of the industrial park and layout) and request of the layout by the browser
+FIRST_RESPONSE_SCRIPT = """
+from app import create_app
+app = create_app()
+response = app.server.test_client().get('/_dash-layout')
+assert response.status_code == 200
+"""
+
+def _run_python(*args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=SRC_ROOT, capture_output=True, text=True, check=True)
+
+def parse_import_times(importtime_output: str) -> dict:
+    """
+    Parse the output of 'python -X importtime' into a dictionary {module name: (self, cumulative)} with the
+    import times in microseconds.
+    """
+    import_times = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module_name = line[len('import time:'):].split('|')
+        import_times[module_name.strip()] = (int(self_us), int(cumulative_us))
+    return import_times
+
+class TestBenchStartup(object):
+    """
+    Cold start of the application, each round in a new interpreter (so no module is already imported).
+    The benchmarks measure the wall time of the interpreter, and the 'extra_info' of the results has the
+    cumulative import time of the module and its slowest imports given by 'python -X importtime'.
+    """
+
+    @pytest.mark.parametrize('module_name', STARTUP_MODULES)
+    def test_import(self, benchmark, module_name):
+        result = benchmark.pedantic(_run_python, args=('-X', 'importtime', '-c', f'import {module_name}'), rounds=3)
+
+        import_times = parse_import_times(result.stderr)
+        slowest = sorted(import_times.items(), key=lambda item: item[1][0], reverse=True)[:10]
+        benchmark.extra_info['import_time_ms'] = import_times[module_name][1] / 1000
+        benchmark.extra_info['slowest_imports_ms'] = {name: times[0] / 1000 for name, times in slowest}
+
+    def test_time_to_first_response(self, benchmark):
+        benchmark.pedantic(_run_python, args=('-c', FIRST_RESPONSE_SCRIPT), rounds=3)
@@ -0,0 +1,68 @@
+from src.app_config import config
+from src.process_capability_index.utils import calculate_cap_index_ppk
+from src.visualization.utils import (
+    create_figure_control_chart,
+    create_figure_report,
+    get_bar_plot_color_codes,
+    get_bar_plot_hovertemplate,
+    get_histograms_selected_month,
+    get_scatter_plot_color_codes,
+    get_scatter_plot_hovertemplate
+)
+
+def _control_chart_range(process_data_obj):
+    return (process_data_obj.data.index[0].strftime('%Y-%m-%dT%H:%M:%S'),
+            process_data_obj.data.index[-1].strftime('%Y-%m-%dT%H:%M:%S'))
+
+class TestBenchFigures(object):
+
+    def test_create_figure_report(self, benchmark, process_data_obj):
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+        month = process_data_obj.data.index[-1].month
+        n_bins = config.layout_config.plt_histogram_bins
+
+        def create_report():
+            # The skeleton and histograms are cached in the derived cache, which is cleared to measure a cold build
+            process_data_obj.clear_derived_cache()
+            return create_figure_report(process_data_obj, ppk_rep_monthly,
+                                        ppk_rep_daily.loc[ppk_rep_daily.index.month == month],
+                                        process_data_obj.data.loc[process_data_obj.data.index.month == month],
+                                        histograms=get_histograms_selected_month(process_data_obj, month, n_bins))
+
+        benchmark(create_report)
+
+    def test_create_figure_control_chart(self, benchmark, process_data_obj):
+        start_date, end_date = _control_chart_range(process_data_obj)
+
+        def create_control_chart():
+            process_data_obj.clear_derived_cache()
+            return create_figure_control_chart(process_data_obj, start_date, end_date)
+
+        benchmark(create_control_chart)
+
+class TestBenchPlotHelpers(object):
+
+    def test_scatter_plot_hovertemplate(self, benchmark, process_data_obj):
+        start_date, end_date = _control_chart_range(process_data_obj)
+        hovertemplate = benchmark(get_scatter_plot_hovertemplate, process_data_obj=process_data_obj,
+                                start_date=start_date, end_date=end_date, circ=process_data_obj.circuit_names[0])
+        assert len(hovertemplate) == len(process_data_obj.data)
+
+    def test_scatter_plot_color_codes(self, benchmark, process_data_obj):
+        start_date, end_date = _control_chart_range(process_data_obj)
+        benchmark(get_scatter_plot_color_codes, process_data_obj=process_data_obj, start_date=start_date,
+                end_date=end_date, circ=process_data_obj.circuit_names[0])
+
+    def test_bar_plot_hovertemplate(self, benchmark, process_data_obj):
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+        circ = process_data_obj.circuit_names[0]
+        benchmark(get_bar_plot_hovertemplate, time_unit='Day', time_unit_format='%d.%m.%y',
+                process_data_obj=process_data_obj, ppk_rep_df=ppk_rep_daily, circ=circ,
+                ppk_goal=process_data_obj.ppk_goals[circ], prob_dist_name='Normal')
+
+    def test_bar_plot_color_codes(self, benchmark, process_data_obj):
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+        circ = process_data_obj.circuit_names[0]
+        benchmark(get_bar_plot_color_codes, ppk_rep_df=ppk_rep_daily, circ=circ,
+                ppk_goal=process_data_obj.ppk_goals[circ])
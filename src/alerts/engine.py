@@ -0,0 +1,283 @@
+import logging
+import threading
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from monitoring.metrics import increment
+
+logger = logging.getLogger(__name__)
+
+# Rules evaluated by the alerting engine
+RULE_PPK_BELOW_GOAL = 'ppk_below_goal'
+RULE_OUT_OF_SPEC = 'out_of_spec'
+RULE_RUN_SAME_SIDE = 'run_same_side'
+
+def make_alert(plant_name: str, circ: str, rule: str, timestamp: pd.Timestamp, value: float, message: str) -> dict:
+    """
+    Create an alert. The key identifies the event (plant, circuit, rule and timestamp of the event), so the
+    same event found again (e.g. by another server worker) is deduplicated by the sinks.
+    """
+    timestamp = pd.Timestamp(timestamp).isoformat()
+    return {
+        'key': f'{plant_name}|{circ}|{rule}|{timestamp}',
+        'plant': plant_name,
+        'circuit': circ,
+        'rule': rule,
+        'timestamp': timestamp,
+        'value': None if np.isnan(value) else float(value),
+        'message': message,
+    }
+
+def get_run_lengths(sides: np.ndarray, previous_side: int = 0, previous_length: int = 0) -> np.ndarray:
+    """
+    Return the length of the run of consecutive samples on the same side of the center line ending at each
+    sample, continuing the run of the previous samples.
+
+    Args:
+        sides (np.ndarray): Side of each sample (1 above, -1 below, 0 on the line or missing).
+        previous_side (int, default=0): Side of the last previous sample.
+        previous_length (int, default=0): Length of the run ending at the last previous sample.
+
+    Returns:
+        run_lengths (np.ndarray): Run length of each sample (0 for the samples with side 0).
+    """
+
+    n_samples = len(sides)
+    if n_samples == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    new_run = np.empty(n_samples, dtype=bool)
+    new_run[0] = sides[0] != previous_side
+    new_run[1:] = sides[1:] != sides[:-1]
+
+    positions = np.arange(n_samples)
+    run_starts = np.maximum.accumulate(np.where(new_run, positions, 0))
+    run_lengths = positions - run_starts + 1
+    if not new_run[0]:
+        run_lengths[run_starts == 0] += previous_length
+    run_lengths[sides == 0] = 0
+
+    return run_lengths
+
+class AlertEngine():
+    """
+    Alerting engine of the circuits of the industrial park. The rules are:
+
+        ppk_below_goal: the Ppk index of a bucket ('ppk_freq', e.g. daily) is below the goal of the circuit.
+        out_of_spec: a sample is out of the specification limits (once per excursion).
+        run_same_side: 'run_length' consecutive samples on the same side of the center of the specification
+            limits (once per run).
+
+    Each evaluation only processes the samples appended since the previous one and the buckets completed by
+    them (a bucket is complete when a sample of a later bucket arrives), keeping the state of the excursions
+    and runs of each circuit, so its cost grows with the new data and not with the history. In the first
+    evaluation of a plant (or when its data is replaced) the last 'lookback_days' days are evaluated.
+    The alerts are written to the sinks in order, and each sink receives the alerts that are new for the
+    previous sink (e.g. the log file only receives the alerts not stored before in the database).
+
+    Attributes:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        sinks (sequence of AlertSink): Sinks of the alerts.
+        ppk_freq (str): Time frequency of the buckets of the Ppk index.
+        run_length (int): Number of consecutive samples of the 'run_same_side' rule.
+        lookback_days (float): Days evaluated in the first evaluation of a plant.
+
+    Methods:
+        evaluate(): Evaluate the rules on the new data of all the plants and write the alerts.
+        evaluate_plant(process_data_obj): Return the alerts of the new data of the plant.
+    """
+
+    def __init__(self, data_ind_park, sinks: t.Sequence, ppk_freq: str = 'D', run_length: int = 9,
+                lookback_days: float = 7):
+        self.data_ind_park = data_ind_park
+        self.sinks = list(sinks)
+        self.ppk_freq = ppk_freq
+        self.run_length = run_length
+        self.lookback_days = lookback_days
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def evaluate(self) -> list:
+        """
+        Evaluate the rules on the new data of all the plants and write the alerts to the sinks.
+
+        Returns:
+            new_alerts (list): Alerts written by the last sink (not found before).
+        """
+
+        with self._lock:
+            alerts = []
+            for process_data_obj in self.data_ind_park.process_data_objs:
+                alerts += self.evaluate_plant(process_data_obj)
+
+            for sink in self.sinks:
+                if not alerts:
+                    break
+                alerts = sink.write(alerts)
+
+        for alert in alerts:
+            increment('alerts', plant=alert['plant'], rule=alert['rule'])
+        if alerts:
+            logger.info(f"{len(alerts)} new alerts")
+
+        return alerts
+
+    def _initial_state(self, process_data_obj) -> dict:
+        data = process_data_obj.data
+        start = data.index[-1] - pd.Timedelta(days=self.lookback_days)
+        first_position = data.index.searchsorted(start)
+        n_circuits = len(process_data_obj.circuit_names)
+
+        return {
+            'data_version': None,
+            'last_position': first_position - 1,
+            'last_timestamp': data.index[first_position - 1] if first_position > 0 else None,
+            # Start of the first bucket not evaluated (the bucket of the first evaluated sample)
+            'next_bucket': data.index[first_position:first_position + 1].to_series().resample(self.ppk_freq).size().index[0],
+            'out_of_spec': np.zeros(n_circuits, dtype=bool),
+            'run_sides': np.zeros(n_circuits, dtype=np.int64),
+            'run_lengths': np.zeros(n_circuits, dtype=np.int64),
+        }
+
+    def evaluate_plant(self, process_data_obj) -> list:
+        """
+        Return the alerts of the samples and buckets of the plant not evaluated before. Plants whose data did
+        not change since the last evaluation are skipped (without loading unloaded plants).
+
+        Args:
+            process_data_obj (ProcessData): Process Data object of the plant.
+
+        Returns:
+            alerts (list): Alerts of the plant ('make_alert').
+        """
+
+        state = self._states.get(process_data_obj.plant_name)
+        if state is not None and state['data_version'] == process_data_obj.data_version:
+            return []
+
+        data = process_data_obj.data
+        if len(data) == 0:
+            return []
+
+        # The data is only appended, so the samples before the last evaluated one are unchanged, unless the data
+        # was replaced
+        if state is None or len(data) <= state['last_position'] or \
+                (state['last_timestamp'] is not None and data.index[state['last_position']] != state['last_timestamp']):
+            state = self._initial_state(process_data_obj)
+
+        new_data = data.iloc[state['last_position'] + 1:]
+        alerts = self._evaluate_samples(process_data_obj, new_data, state)
+
+        bucket_data = data.iloc[data.index.searchsorted(state['next_bucket']):]
+        if len(bucket_data):
+            bucket_alerts, state['next_bucket'] = self._evaluate_ppk_buckets(process_data_obj, bucket_data)
+            alerts += bucket_alerts
+
+        state['data_version'] = process_data_obj.data_version
+        state['last_position'] = len(data) - 1
+        state['last_timestamp'] = data.index[-1]
+        self._states[process_data_obj.plant_name] = state
+
+        return alerts
+
+    def _evaluate_samples(self, process_data_obj, new_data: pd.DataFrame, state: dict) -> list:
+        """
+        Evaluate the rules of the samples ('out_of_spec' and 'run_same_side') on the new samples, updating the
+        state of the excursions and runs of each circuit.
+        """
+
+        plant_name = process_data_obj.plant_name
+        alerts = []
+        if len(new_data) == 0:
+            return alerts
+
+        for j, circ in enumerate(process_data_obj.circuit_names):
+            values = new_data[circ].to_numpy(dtype=float)
+            lsl = process_data_obj.specifications_limits[circ]['LSL']
+            usl = process_data_obj.specifications_limits[circ]['USL']
+
+            out_of_spec = (values < lsl) | (values > usl)
+            excursion_starts = out_of_spec & ~np.concatenate([[state['out_of_spec'][j]], out_of_spec[:-1]])
+            for i in np.flatnonzero(excursion_starts):
+                alerts.append(make_alert(plant_name, circ, RULE_OUT_OF_SPEC, new_data.index[i], values[i],
+                                        f"Sample {values[i]:.3f} out of the specification limits [{lsl}, {usl}]"))
+            state['out_of_spec'][j] = out_of_spec[-1]
+
+            center = (lsl + usl) / 2
+            sides = np.where(np.isnan(values), 0, np.sign(values - center)).astype(np.int64)
+            run_lengths = get_run_lengths(sides, state['run_sides'][j], state['run_lengths'][j])
+            for i in np.flatnonzero(run_lengths == self.run_length):
+                side_text = 'above' if sides[i] > 0 else 'below'
+                alerts.append(make_alert(plant_name, circ, RULE_RUN_SAME_SIDE, new_data.index[i], values[i],
+                                        f"{self.run_length} consecutive samples {side_text} the center {center}"))
+            state['run_sides'][j] = sides[-1]
+            state['run_lengths'][j] = run_lengths[-1]
+
+        return alerts
+
+    def _evaluate_ppk_buckets(self, process_data_obj, bucket_data: pd.DataFrame) -> tuple:
+        """
+        Evaluate the 'ppk_below_goal' rule on the complete buckets of the data (which starts at the first bucket
+        not evaluated), and return the alerts and the start of the first bucket not evaluated.
+        """
+
+        plant_name = process_data_obj.plant_name
+        buckets = bucket_data.resample(self.ppk_freq)
+        mean, std = buckets.mean(), buckets.std(ddof=0)
+
+        # The last bucket may be incomplete
+        complete = slice(0, len(mean) - 1)
+        lsl = pd.Series({circ: limits['LSL'] for circ, limits in process_data_obj.specifications_limits.items()})
+        usl = pd.Series({circ: limits['USL'] for circ, limits in process_data_obj.specifications_limits.items()})
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ppk = np.minimum(mean - lsl, usl - mean).iloc[complete] / std.iloc[complete] / 3
+
+        alerts = []
+        for circ in process_data_obj.circuit_names:
+            ppk_goal = process_data_obj.ppk_goals[circ]
+            ppk_circ = ppk[circ]
+            for bucket, value in ppk_circ[ppk_circ < ppk_goal].items():
+                alerts.append(make_alert(plant_name, circ, RULE_PPK_BELOW_GOAL, bucket, value,
+                                        f"Ppk ({self.ppk_freq}) {value:.2f} below the goal {ppk_goal}"))
+
+        return alerts, mean.index[-1]
+
+class AlertScheduler():
+    """
+    Scheduler that evaluates the alerting engine periodically in a daemon thread.
+
+    Attributes:
+        alert_engine (AlertEngine): Alerting engine.
+        interval_seconds (float): Time between the end of an evaluation and the start of the next one.
+
+    Methods:
+        start(): Start the scheduler thread.
+        stop(): Stop the scheduler thread.
+    """
+    def __init__(self, alert_engine: AlertEngine, interval_seconds: float):
+        self.alert_engine = alert_engine
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.alert_engine.evaluate()
+            except Exception:
+                logger.exception("Scheduled alerts evaluation failed")
+            if self._stop_event.wait(self.interval_seconds):
+                break
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import typing as t
+from datetime import datetime, timezone
+from pathlib import Path
+
+class AlertSink():
+    """
+    Base class of the sinks of the alerting engine. The alerts are dictionaries with the keys 'key' (unique
+    identifier of the alert, used to deduplicate), 'plant', 'circuit', 'rule', 'timestamp', 'value' and
+    'message'.
+
+    Methods:
+        write(alerts): Store the alerts not stored before and return them.
+    """
+
+    def write(self, alerts: t.Sequence[dict]) -> list:
+        raise NotImplementedError
+
+class SQLiteAlertSink(AlertSink):
+    """
+    Sink of the alerts in a SQLite table ('alerts'), deduplicated by the key of the alerts. The database is
+    shared by all the processes of the server (e.g. gunicorn workers) and kept between restarts, so an
+    alert is only stored once.
+
+    Attributes:
+        db_path (Path): Path of the SQLite database.
+
+    Methods:
+        write(alerts): Store the alerts not stored before and return them.
+        get_alerts(limit, plant_name): Return the last stored alerts.
+    """
+
+    def __init__(self, db_path: t.Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS alerts (key TEXT PRIMARY KEY, plant TEXT, circuit TEXT, '
+                            'rule TEXT, timestamp TEXT, value REAL, message TEXT, created_at TEXT)')
+            connection.execute('CREATE INDEX IF NOT EXISTS alerts_created_at ON alerts (created_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection is created for each call, so the sink can be used from any thread
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def write(self, alerts: t.Sequence[dict]) -> list:
+        created_at = datetime.now(timezone.utc).isoformat()
+        new_alerts = []
+        connection = self._connect()
+        try:
+            with connection:
+                for alert in alerts:
+                    cursor = connection.execute('INSERT OR IGNORE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                                (alert['key'], alert['plant'], alert['circuit'], alert['rule'],
+                                                alert['timestamp'], alert['value'], alert['message'], created_at))
+                    if cursor.rowcount == 1:
+                        new_alerts.append(alert)
+        finally:
+            connection.close()
+        return new_alerts
+
+    def get_alerts(self, limit: int = 100, plant_name: str = None) -> list:
+        """
+        Return the last stored alerts (newest first), optionally of a single plant.
+        """
+        query = 'SELECT key, plant, circuit, rule, timestamp, value, message, created_at FROM alerts'
+        params = []
+        if plant_name is not None:
+            query += ' WHERE plant = ?'
+            params.append(plant_name)
+        query += ' ORDER BY created_at DESC, timestamp DESC LIMIT ?'
+        params.append(limit)
+
+        connection = self._connect()
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(query, params)]
+        finally:
+            connection.close()
+
+class LogAlertSink(AlertSink):
+    """
+    Sink of the alerts in a log file, with one JSON line per alert. The alerts are deduplicated by their key
+    in the process.
+
+    Attributes:
+        log_path (Path): Path of the log file.
+    """
+
+    def __init__(self, log_path: t.Union[str, Path]):
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def write(self, alerts: t.Sequence[dict]) -> list:
+        with self._lock:
+            new_alerts = [alert for alert in alerts if alert['key'] not in self._keys]
+            if new_alerts:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    for alert in new_alerts:
+                        f.write(json.dumps(alert) + '\n')
+                self._keys.update(alert['key'] for alert in new_alerts)
+        return new_alerts
@@ -1,14 +1,65 @@
 import argparse
+import os
 import dash
-from dash import html
-from dash import dcc
 
-from app_config import EXT_STYLESHEETS_REL_PATH, config
-from app_layout import app_layout
+from app_config import EXT_STYLESHEETS_REL_PATH, PROJECT_ROOT, config
 
-app = dash.Dash(__name__, external_stylesheets = EXT_STYLESHEETS_REL_PATH)
-app.title = config.app_config.app_title
-app.layout = app_layout
+def create_app(data_ind_park=None) -> dash.Dash:
+    """
+    Create the Dash application: layout, callbacks and routes of the server (health, API, memory, alerts,
+    metrics and request profiling).
+    The modules of the layout and callbacks (pandas, plotly and the statistics) are imported here and the data
+    of the industrial park is created here (not at import), so importing this module is fast.
+    The callbacks are registered globally when 'app_layout' is first imported, so only one application should
+    be created in each process.
+
+    Args:
+        data_ind_park (SetProcessData, optional): Process Data objects of the industrial park.
+                                                Default: created with 'pipeline.get_data_ind_park'.
+
+    Returns:
+        app (dash.Dash): Dash application.
+    """
+
+    from app_layout import create_app_layout, register_data_listeners
+    from pipeline import get_data_ind_park, set_data_ind_park
+    from server.alerts import register_alerts_endpoint
+    from server.api import register_api_routes
+    from server.health import register_health_endpoints
+    from server.memory import record_memory_metrics, register_memory_endpoint
+    from server.metrics import register_metrics_endpoint
+    from server.profiling import register_request_profiling
+
+    if data_ind_park is None:
+        data_ind_park = get_data_ind_park()
+    else:
+        set_data_ind_park(data_ind_park)
+    register_data_listeners(data_ind_park)
+
+    # The content of the Tabs is rendered when they are selected, so the callbacks refer to components that
+    # are not in the initial layout
+    app = dash.Dash(__name__, external_stylesheets = EXT_STYLESHEETS_REL_PATH, suppress_callback_exceptions = True)
+    app.title = config.app_config.app_title
+    app.layout = create_app_layout(data_ind_park)
+    register_health_endpoints(app.server)
+    register_api_routes(app.server, data_ind_park)
+    register_memory_endpoint(app.server, data_ind_park)
+    register_alerts_endpoint(app.server)
+    register_metrics_endpoint(app.server, collectors=[lambda: record_memory_metrics(data_ind_park)])
+    register_request_profiling(app.server, config.monitoring_config.profiling_enabled,
+                            PROJECT_ROOT / config.monitoring_config.profiles_dir)
+
+    return app
+
+def _str_to_bool(value: str) -> bool:
+    """
+    Parse a boolean command line argument ('true'/'false', 'yes'/'no', '1'/'0', case insensitive).
+    """
+    if value.lower() in ('true', 'yes', '1'):
+        return True
+    if value.lower() in ('false', 'no', '0'):
+        return False
+    raise argparse.ArgumentTypeError(f"Boolean value expected, got {value!r}")
 
 def _setup_parser_run_app_config():
     """
@@ -22,13 +73,13 @@ def _setup_parser_run_app_config():
     parser.add_argument('--help', '-h', action='help')
     parser.add_argument('--host', type=str, default=config.app_config.host)
     parser.add_argument('--port', type=int, default=config.app_config.port)
-    parser.add_argument('--debug', type=bool, default=config.app_config.debug)
+    parser.add_argument('--debug', type=_str_to_bool, default=config.app_config.debug)
 
     return parser
 
 if __name__ == '__main__':
     """
-    Server application
+    Development server application (see 'wsgi.py' for production servers)
 
     Example of command:
     ```
@@ -39,6 +90,25 @@ if __name__ == '__main__':
     parser = _setup_parser_run_app_config()
     run_app_config = parser.parse_args()
 
+    from app_layout import precompute_default_figures
+    from pipeline import get_data_ind_park
+    from server.alerts import start_alert_scheduler
+    from server.live import start_live_poller
+    from server.memory import enforce_configured_memory_budget
+    from server.warmup import start_warm_up_scheduler, warm_up
+
+    app = create_app()
+    data_ind_park = get_data_ind_park()
+
+    # In debug mode, the Werkzeug reloader runs this script again in a child process, which serves the requests,
+    # so the warm-up and the schedulers only run in the child process
+    if not run_app_config.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warm_up(data_ind_park, [precompute_default_figures])
+        enforce_configured_memory_budget(data_ind_park)
+        start_warm_up_scheduler(data_ind_park, [precompute_default_figures], [enforce_configured_memory_budget])
+        start_alert_scheduler(data_ind_park)
+        start_live_poller(data_ind_park)
+
     app.run_server(debug=run_app_config.debug,
                 port=run_app_config.port,
                 host=run_app_config.host)
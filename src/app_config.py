@@ -6,6 +6,7 @@ from strictyaml import load, YAML
 
 # Directories
 APP_ROOT = Path(__file__).resolve().parent
+PROJECT_ROOT = APP_ROOT.parent
 DOCS_ROOT = APP_ROOT.parent.joinpath('docs/').resolve()
 CONFIG_FILE_PATH = APP_ROOT.joinpath('conf/base/conf.yml').resolve()
 EXT_STYLESHEETS_REL_PATH = ['.assets/bWlwgP.css']
@@ -21,6 +22,24 @@ class AppConfig(BaseModel):
     port: int
     debug: bool
 
+class ServerConfig(BaseModel):
+    """
+    Create configuration object of the production server (gunicorn).
+    """
+
+    workers: int
+    threads: int
+    timeout: int
+
+class WarmUpConfig(BaseModel):
+    """
+    Create configuration object of the warm-up (precomputation of the statistics and default figures).
+    Obs.: The scheduled refresh is disabled if 'warm_up_refresh_seconds' is 0.
+    """
+
+    warm_up_workers: int
+    warm_up_refresh_seconds: int
+
 class LayoutConfig(BaseModel):
     """
     Create Layout configuration object.
@@ -46,6 +65,110 @@ class LayoutConfig(BaseModel):
     plt_control_chart_height: int
     plt_full_report_width: int
     plt_full_report_height: int
+    plt_control_chart_max_points: int
+    plt_control_chart_webgl_threshold: int
+    plt_histogram_bins: int
+    plt_violin_grid_points: int
+    plt_violin_max_points: int
+    plt_circuits_page_size: int
+    worst_circuits_default_n: int
+
+class DataConfig(BaseModel):
+    """
+    Create configuration object of the process data.
+    """
+
+    pyramid_levels: t.List[str]
+
+class SerializationConfig(BaseModel):
+    """
+    Create configuration object of the serialization of the callback outputs.
+    Obs.: The typed arrays ('typed_arrays') require plotly.js 2.28 or newer in the Dash Graph component.
+    """
+
+    typed_arrays: bool
+
+class CacheConfig(BaseModel):
+    """
+    Create configuration object of the result cache of the callbacks.
+    Obs.: 'result_cache_backend' must be 'lru', 'filesystem' or 'diskcache', and 'result_cache_dir'
+    is relative to the project root.
+    """
+
+    result_cache_backend: str
+    result_cache_maxsize: int
+    result_cache_dir: str
+
+class BackgroundConfig(BaseModel):
+    """
+    Create configuration object of the background callbacks (long-running figure callbacks).
+    Obs.: The background jobs run in separate processes, so the 'lru' result cache (in-process) is replaced by
+    the 'diskcache' backend when the background callbacks are enabled.
+    """
+
+    background_callbacks: bool
+    background_cache_dir: str
+
+class LiveConfig(BaseModel):
+    """
+    Create configuration object of the live mode of the control chart.
+    Obs.: If 'live_simulated_samples' is True, the plants with sample data receive samples of a simulated live
+    source with the time frequency 'live_sample_freq' (the plants loaded from a source are never simulated),
+    which is polled by the server every 'live_interval_seconds'.
+    """
+
+    live_interval_seconds: int
+    live_max_points: int
+    live_simulated_samples: bool
+    live_sample_freq: str
+
+class MonitoringConfig(BaseModel):
+    """
+    Create configuration object of the monitoring of the server ('/metrics' route and request profiling).
+    Obs.: If 'profiling_enabled' is True, the requests with the header 'X-Profile' ('cprofile' or
+    'pyinstrument') are profiled and the profiles are saved in 'profiles_dir' (relative to the project root).
+    """
+
+    profiling_enabled: bool
+    profiles_dir: str
+
+class MemoryConfig(BaseModel):
+    """
+    Create configuration object of the memory budget of the plants.
+    Obs.: The budget is disabled if 'memory_budget_mb' is 0, and 'memory_spill_dir' (directory of the data of
+    the unloaded plants) is relative to the project root.
+    """
+
+    memory_budget_mb: int
+    memory_idle_plant_seconds: int
+    memory_spill_dir: str
+
+class AlertsConfig(BaseModel):
+    """
+    Create configuration object of the alerting engine.
+    Obs.: The scheduler is disabled if 'alerts_interval_seconds' is 0, and 'alerts_db_path' (SQLite database of
+    the alerts) and 'alerts_log_file' are relative to the project root.
+    """
+
+    alerts_interval_seconds: int
+    alerts_ppk_freq: str
+    alerts_run_length: int
+    alerts_lookback_days: int
+    alerts_db_path: str
+    alerts_log_file: str
+
+class LoaderConfig(BaseModel):
+    """
+    Create configuration object of the concurrent loader of the data of the plants from their sources.
+    Obs.: The payloads are parsed in the threads of the event loop if 'loader_parse_workers' is 0, and in a
+    pool of 'loader_parse_workers' processes otherwise.
+    """
+
+    loader_max_concurrency: int
+    loader_timeout_seconds: float
+    loader_retries: int
+    loader_retry_backoff_seconds: float
+    loader_parse_workers: int
 
 class DocumentationTabConfig(BaseModel):
     """
@@ -62,7 +185,18 @@ class Config(BaseModel):
     """
 
     app_config: AppConfig
+    server_config: ServerConfig
+    warm_up_config: WarmUpConfig
     layout_config: LayoutConfig
+    data_config: DataConfig
+    serialization_config: SerializationConfig
+    cache_config: CacheConfig
+    background_config: BackgroundConfig
+    live_config: LiveConfig
+    monitoring_config: MonitoringConfig
+    memory_config: MemoryConfig
+    alerts_config: AlertsConfig
+    loader_config: LoaderConfig
     documentation_tab_config: DocumentationTabConfig
 
 def find_config_file() -> Path:
@@ -115,7 +249,18 @@ def create_and_validate_config(parsed_config: YAML = None) -> Config:
     # specify the data attribute from the strictyaml YAML type.
     _config = Config(
         app_config=AppConfig(**parsed_config.data),
+        server_config=ServerConfig(**parsed_config.data),
+        warm_up_config=WarmUpConfig(**parsed_config.data),
         layout_config=LayoutConfig(**parsed_config.data),
+        data_config=DataConfig(**parsed_config.data),
+        serialization_config=SerializationConfig(**parsed_config.data),
+        cache_config=CacheConfig(**parsed_config.data),
+        background_config=BackgroundConfig(**parsed_config.data),
+        live_config=LiveConfig(**parsed_config.data),
+        monitoring_config=MonitoringConfig(**parsed_config.data),
+        memory_config=MemoryConfig(**parsed_config.data),
+        alerts_config=AlertsConfig(**parsed_config.data),
+        loader_config=LoaderConfig(**parsed_config.data),
         documentation_tab_config=DocumentationTabConfig(**parsed_config.data),
     )
 
@@ -1,14 +1,31 @@
 import datetime
-from dash import html, dcc, callback, callback_context
-from dash.dependencies import Input, Output
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import functools
+import pandas as pd
+import numpy as np
+from dash import html, dcc, dash_table, callback, callback_context, clientside_callback, ClientsideFunction, Patch, no_update
+from dash.dash_table.Format import Format, Scheme
+from dash.dependencies import Input, Output, State
+from dash.exceptions import MissingCallbackContextException, PreventUpdate
+from flask import has_request_context
 
 from app_config import DOCS_ROOT, config
 
-from pipeline import data_ind_park
-from process_capability_index.utils import calculate_cap_index_ppk
-from visualization.utils import create_figure_report, create_figure_control_chart
+from background.manager import get_background_callback_kwargs, progress_callback, report_progress
+from cache.result_cache import cached_result, get_result_cache
+from monitoring.metrics import instrument_callback
+from pipeline import get_data_ind_park
+from process_capability_index.utils import get_cap_index_ppk, get_circuits_below_goal, get_worst_circuits
+from visualization.pagination import get_circuit_page_options, get_circuit_pages
+from visualization.serialization import serialize_figure_output
+from visualization.utils import (create_figure_report, create_figure_control_chart, get_histograms_selected_month,
+                                create_report_month_store, get_figure_control_chart_updates, apply_figure_updates,
+                                get_control_chart_trace_data, get_control_chart_xaxis_ranges,
+                                get_control_chart_scatter_updates, get_control_chart_running_stats,
+                                get_control_chart_live_updates)
+
+# Values of the circuit filter selectors
+CIRCUIT_FILTER_ALL = 'all'
+CIRCUIT_FILTER_BELOW_GOAL = 'below_goal'
 
 def banner_layout():
     """
@@ -31,16 +48,57 @@ def banner_layout():
         )
     return banner_layout_div
 
+def circuit_selectors_layout(id_suffix: str):
+    """
+    Create the layout divisions of the circuit filter ('circuit-filter') and page ('circuit-page') selectors,
+    which limit the circuits plotted in the figure of a Tab. The 'id_suffix' is added to the component ids.
+    """
+    circuit_selectors_layout = [
+                            html.Div(
+                                [
+                                html.P('Show circuits:'),
+                                dcc.RadioItems(id=f'circuit-filter{id_suffix}',
+                                        options = [{'label': 'All', 'value': CIRCUIT_FILTER_ALL},
+                                                {'label': 'Below goal (worst first)', 'value': CIRCUIT_FILTER_BELOW_GOAL}],
+                                        value = CIRCUIT_FILTER_ALL
+                                        ),
+                                ],
+                                style = {'width': '20%'}
+                            ),
+
+                            html.Div(
+                                [
+                                html.P('Select circuits page:'),
+                                dcc.Dropdown(id=f'circuit-page{id_suffix}',
+                                        multi=False,
+                                        clearable=False)
+                                ],
+                                style = {'width': '20%'}
+                            ),
+                            ]
+
+    return circuit_selectors_layout
+
 def tab_index_report_layout():
     """
-    Create the Tab component with the Ppk index complete report.
+    Create the Tab component with the Ppk index complete report (the content is created by
+    'tab_index_report_content' when the Tab is selected).
     """
     tab_index_report_layout = \
                 dcc.Tab(
                     label = 'Index Report',
                     value = 'Index Report',
                     className = 'custom-tab',
-                    selected_className = 'custom-tab--selected',
+                    selected_className = 'custom-tab--selected')
+
+    return tab_index_report_layout
+
+def tab_index_report_content(selected_plant_name: str):
+    """
+    Create the content of the Tab with the Ppk index complete report, which is rendered when the Tab is selected.
+    """
+    tab_index_report_content = \
+                html.Div(
                     children = [
                         html.Div(html.H2('Index Report: PPK ', style = {'textAlign': 'left'})),
 
@@ -53,8 +111,8 @@ def tab_index_report_layout():
                                 dcc.Dropdown(id='plant-selector',
                                         multi=False,
                                         clearable=False,
-                                        options = [{'label': p_name, 'value': p_name} for p_name in data_ind_park.list_plant_names],
-                                        value = data_ind_park.list_plant_names[0]
+                                        options = [{'label': p_name, 'value': p_name} for p_name in get_data_ind_park().list_plant_names],
+                                        value = selected_plant_name
                                         ),
                                 ],
                                 style = {'width': '20%'}
@@ -70,29 +128,44 @@ def tab_index_report_layout():
                                 style = {'width': '20%'}
                             ),
 
+                            *circuit_selectors_layout(id_suffix=''),
+
                             ],
                             style = {'display' : 'flex', 'width' : '100%' }
                         ),
 
                         html.Div(
                             children = [
-                                html.Div([dcc.Graph(id = 'fig_index_report')], style = {'display': 'inline-block'})
+                                html.Div([html.Progress(id = 'fig_index_report_progress')],
+                                        id = 'fig_index_report_running', style = {'display': 'none'}),
+                                html.Div([dcc.Graph(id = 'fig_index_report')], style = {'display': 'inline-block'}),
+                                dcc.Store(id = 'report-month-store')
                             ]
                         )
                     ])
 
-    return tab_index_report_layout
+    return tab_index_report_content
 
 def tab_control_chart_layout():
     """
-    Create the Tab component with the Control Chart report.
+    Create the Tab component with the Control Chart report (the content is created by
+    'tab_control_chart_content' when the Tab is selected).
     """
     tab_control_chart_layout = \
                 dcc.Tab(
                     label = 'Control Chart',
                     value = 'Control Chart',
                     className = 'custom-tab',
-                    selected_className = 'custom-tab--selected',
+                    selected_className = 'custom-tab--selected')
+
+    return tab_control_chart_layout
+
+def tab_control_chart_content(selected_plant_name: str):
+    """
+    Create the content of the Tab with the Control Chart report, which is rendered when the Tab is selected.
+    """
+    tab_control_chart_content = \
+                html.Div(
                     children = [
                         html.Div(html.H2('Control Chart ', style = {'textAlign': 'left'})),
                         html.Div(
@@ -104,8 +177,8 @@ def tab_control_chart_layout():
                                 dcc.Dropdown(id='plant-selector-cc',
                                         multi=False,
                                         clearable=False,
-                                        options = [{'label': p_name, 'value': p_name} for p_name in data_ind_park.list_plant_names],
-                                        value = data_ind_park.list_plant_names[0]
+                                        options = [{'label': p_name, 'value': p_name} for p_name in get_data_ind_park().list_plant_names],
+                                        value = selected_plant_name
                                         ),
                                 ], style = {'width': '20%'}
                             ),
@@ -119,50 +192,144 @@ def tab_control_chart_layout():
                                        display_format='DD.MM.YY'
                                 )
                                 ], style = {'width' : '40%'}
-                            )
+                            ),
+
+                            *circuit_selectors_layout(id_suffix='-cc'),
+
+                            html.Div(
+                                [
+                                html.P('Live mode:'),
+                                dcc.Checklist(id='live-mode',
+                                        options = [{'label': 'Live updates', 'value': 'live'}],
+                                        value = []
+                                        ),
+                                dcc.Interval(id='live-interval',
+                                        interval = config.live_config.live_interval_seconds * 1000,
+                                        disabled = True),
+                                dcc.Store(id='live-store'),
+                                dcc.Store(id='live-relayout-applied'),
+                                ],
+                                style = {'width': '10%'}
+                            ),
 
                             ], style = {'width': '100%', 'display' : 'flex'}
                         ),
 
                         html.Div(
                             children = [
+                                html.Div([html.Progress(id='fig_control_chart_progress')],
+                                        id='fig_control_chart_running', style = {'display': 'none'}),
                                 html.Div([dcc.Graph(id='fig_control_chart', style = {'display': 'inline-block'})])
                             ]
                         )
                     ])
 
-    return tab_control_chart_layout
+    return tab_control_chart_content
 
-def tab_about_layout():
+def tab_worst_circuits_layout():
     """
-    Create the Tab component with the documentation file 'Basics on Capability Control'
+    Create the Tab component with the circuits of the industrial park with the lowest Ppk index (the content
+    is created by 'tab_worst_circuits_content' when the Tab is selected).
     """
+    tab_worst_circuits_layout = \
+                dcc.Tab(
+                    label = 'Worst Circuits',
+                    value = 'Worst Circuits',
+                    className = 'custom-tab',
+                    selected_className = 'custom-tab--selected')
 
-    basics_on_cap_control_path = DOCS_ROOT / config.documentation_tab_config.basics_on_cap_control_file
-    with open(basics_on_cap_control_path, encoding='utf-8') as f:
-        basics_on_cap_control = f.read()
+    return tab_worst_circuits_layout
+
+def tab_worst_circuits_content():
+    """
+    Create the content of the Tab with the table of the circuits of all the plants with the lowest Ppk index
+    of the last month relative to their goal, which is rendered when the Tab is selected. The table is
+    refreshed periodically when the data of any plant changes.
+    """
+    ppk_format = Format(precision=2, scheme=Scheme.fixed)
+    tab_worst_circuits_content = \
+                html.Div(
+                    children = [
+                        html.Div(html.H2('Worst Circuits: PPK ', style = {'textAlign': 'left'})),
+                        html.Div(
+                            [
+                            html.P('Number of circuits:'),
+                            dcc.Input(id='worst-circuits-n',
+                                    type='number',
+                                    min=1,
+                                    step=1,
+                                    debounce=True,
+                                    value=config.layout_config.worst_circuits_default_n),
+                            dcc.Interval(id='worst-circuits-interval',
+                                    interval = config.live_config.live_interval_seconds * 1000),
+                            dcc.Store(id='worst-circuits-versions'),
+                            ],
+                            style = {'width': '20%'}
+                        ),
+
+                        dash_table.DataTable(
+                            id='worst-circuits-table',
+                            columns=[{'name': 'Rank', 'id': 'rank'},
+                                    {'name': 'Plant', 'id': 'plant'},
+                                    {'name': 'Circuit', 'id': 'circuit'},
+                                    {'name': 'Month', 'id': 'month'},
+                                    {'name': 'PPK', 'id': 'ppk', 'type': 'numeric', 'format': ppk_format},
+                                    {'name': 'Goal', 'id': 'ppk_goal', 'type': 'numeric', 'format': ppk_format},
+                                    {'name': 'Distance to goal', 'id': 'distance_to_goal', 'type': 'numeric',
+                                    'format': ppk_format},
+                                    {'name': 'PPK previous month', 'id': 'previous_ppk', 'type': 'numeric',
+                                    'format': ppk_format},
+                                    {'name': 'Trend', 'id': 'trend', 'type': 'numeric', 'format': ppk_format}],
+                            page_size=config.layout_config.plt_circuits_page_size,
+                            style_data_conditional=[
+                                {'if': {'filter_query': '{distance_to_goal} < 0 || {ppk} is blank'},
+                                'color': config.layout_config.plt_markers_outliers_color},
+                                {'if': {'filter_query': '{trend} < 0', 'column_id': 'trend'},
+                                'color': config.layout_config.plt_markers_outliers_color}],
+                        ),
+                    ])
+
+    return tab_worst_circuits_content
+
+def tab_about_layout():
+    """
+    Create the Tab component with the documentation file 'Basics on Capability Control' (the content is
+    created by 'tab_about_content' when the Tab is selected).
+    """
 
     tab_about_layout = \
                 dcc.Tab(
                     label = 'Basics on Ppk index',
                     value = 'Basics on Ppk index',
                     className = 'custom-tab',
-                    selected_className = 'custom-tab--selected',
-                    children = [
-                            html.Div(
-                                [dcc.Markdown(basics_on_cap_control, mathjax=True)],
-                                style = {'width': config.documentation_tab_config.doc_tab_width}
-                                )
-
-                            ],
-                        )
+                    selected_className = 'custom-tab--selected')
 
     return tab_about_layout
 
+@functools.lru_cache(maxsize=None)
+def tab_about_content():
+    """
+    Create the content of the Tab with the documentation file 'Basics on Capability Control'. The file is
+    read once and the component is reused.
+    """
+
+    basics_on_cap_control_path = DOCS_ROOT / config.documentation_tab_config.basics_on_cap_control_file
+    with open(basics_on_cap_control_path, encoding='utf-8') as f:
+        basics_on_cap_control = f.read()
+
+    tab_about_content = \
+                html.Div(
+                    [dcc.Markdown(basics_on_cap_control, mathjax=True)],
+                    style = {'width': config.documentation_tab_config.doc_tab_width}
+                    )
+
+    return tab_about_content
 
-def set_tabs_layout():
+def set_tabs_layout(default_plant_name: str):
     """
-    Create the layout division component that contains all Tab components of the application.
+    Create the layout division component that contains all Tab components of the application, the
+    division where the content of the selected Tab is rendered and the store of the selected plant
+    (shared by the plant selectors of the Tabs), initially 'default_plant_name'.
     """
     set_tabs_layout = \
         html.Div([
@@ -174,18 +341,143 @@ def set_tabs_layout():
             children = [
                 tab_index_report_layout(),
                 tab_control_chart_layout(),
+                tab_worst_circuits_layout(),
                 tab_about_layout()
                 ]
-            )
+            ),
+            html.Div(id = 'tab-content'),
+            dcc.Store(id = 'selected-plant-store', data = default_plant_name)
         ])
     return set_tabs_layout
 
-app_layout = html.Div(children=
-    [
-        banner_layout(),
-        set_tabs_layout(),
-    ]
-)
+def _triggered_ids() -> set:
+    """
+    Return the set of component ids that triggered the running callback (empty for the initial call
+    or when the callback function is called directly).
+    """
+    try:
+        triggered = callback_context.triggered
+    except (MissingCallbackContextException, LookupError):
+        return set()
+
+    return {item['prop_id'].split('.')[0] for item in triggered if item['prop_id'] != '.'}
+
+def _get_plant_months(process_data_obj):
+    """
+    Return the months (first business day) of the data of the plant.
+    """
+    return process_data_obj.data.resample('BMS').count().index
+
+def _get_circuit_pages(process_data_obj, circuit_filter):
+    """
+    Return the pages of circuits of the plant for the selected filter: all the circuits, or only the circuits
+    below the goal in the last month (worst first).
+    """
+    if circuit_filter == CIRCUIT_FILTER_BELOW_GOAL:
+        circuit_names = get_circuits_below_goal(process_data_obj, get_cap_index_ppk(process_data_obj, freq='BMS'))
+    else:
+        circuit_names = process_data_obj.circuit_names
+    return get_circuit_pages(circuit_names, config.layout_config.plt_circuits_page_size)
+
+def _get_page_circuit_names(process_data_obj, circuit_filter, circuit_page):
+    """
+    Return the circuits of the selected page (empty list if there is no such page).
+    """
+    pages = _get_circuit_pages(process_data_obj, circuit_filter)
+    if circuit_page is None or not 1 <= circuit_page <= len(pages):
+        return []
+    return pages[circuit_page - 1]
+
+def _create_empty_figure(text):
+    """
+    Create an empty figure with a message, shown when no circuit is selected.
+    """
+    import plotly.graph_objects as go
+
+    fig_empty = go.Figure()
+    fig_empty.update_layout(template = config.layout_config.plt_template_name,
+                            xaxis = {'visible': False}, yaxis = {'visible': False},
+                            annotations = [{'text': text, 'showarrow': False, 'font': {'size': 20}}])
+    return fig_empty
+
+def _get_plant(plant_name: str):
+    """
+    Return the Process Data object of the plant. The time of its last access is only updated by the requests,
+    so the callbacks called by the warm-up ('precompute_default_figures') do not keep the idle plants loaded.
+    """
+    return get_data_ind_park().get(plant_name, touch=has_request_context())
+
+# The cache keys are resolved without updating the time of the last access to the plant, as the cached
+# results do not need its data
+def _report_cache_key(selected_plant_name, circuit_filter, circuit_page, set_progress=None):
+    return get_data_ind_park().get(selected_plant_name, touch=False), (circuit_filter, circuit_page)
+
+def _get_default_date_range(process_data_obj):
+    """
+    Return the default time range (last 30 days) of the control chart of the plant.
+    """
+    end_date = process_data_obj.data.index.max()
+    return end_date - datetime.timedelta(days=30), end_date
+
+def _date_key(date) -> str:
+    # Dates are sent back by the DatePickerRange as strings, which may differ in format from the
+    # Timestamps set by the server
+    return pd.Timestamp(date).isoformat()
+
+def _date_range_until(end_date) -> pd.Timestamp:
+    # The date strings select the samples of the whole end day, so the cached figures of the time range are
+    # kept while the appended samples are newer than the end day
+    return pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+
+def _control_chart_cache_key(selected_plant_name_cc, circuit_filter, circuit_page, start_date, end_date,
+                            set_progress=None):
+    patch_mode = bool(_triggered_ids()) and _triggered_ids() <= {'date-range-selector'}
+    return get_data_ind_park().get(selected_plant_name_cc, touch=False), (circuit_filter, circuit_page,
+                                                                    _date_key(start_date), _date_key(end_date),
+                                                                    patch_mode), _date_range_until(end_date)
+
+def _zoom_control_chart_cache_key(relayout_data, selected_plant_name_cc, circuit_filter, circuit_page,
+                                start_date, end_date):
+    data_selected_plant_cc = get_data_ind_park().get(selected_plant_name_cc, touch=False)
+    n_rows = len(_get_page_circuit_names(data_selected_plant_cc, circuit_filter, circuit_page))
+    xaxis_ranges = get_control_chart_xaxis_ranges(relayout_data, n_rows)
+    return data_selected_plant_cc, (circuit_filter, circuit_page, sorted(xaxis_ranges.items()),
+                                    _date_key(start_date), _date_key(end_date)), _date_range_until(end_date)
+
+def create_app_layout(data_ind_park):
+    """
+    Create the layout of the application for the plants of the industrial park.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+
+    Returns:
+        app_layout (html.Div): Layout of the application.
+    """
+
+    return html.Div(children=
+        [
+            banner_layout(),
+            set_tabs_layout(data_ind_park.list_plant_names[0]),
+        ]
+    )
+
+def _invalidate_cached_results(plant_name: str, since=None):
+    if since is None:
+        get_result_cache().invalidate_plant(plant_name)
+
+def register_data_listeners(data_ind_park):
+    """
+    Register the listeners of the data of the plants of the industrial park: the cached results of a plant
+    are discarded when its data is replaced. When samples are appended, only the results depending on them
+    change their key ('cached_result'), so the results of the past time ranges are kept.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+    """
+
+    for process_data_obj in data_ind_park.process_data_objs:
+        process_data_obj.add_data_listener(_invalidate_cached_results)
 
 @callback(
     [Output('month-selector', 'options'),
@@ -197,7 +489,7 @@ def get_month_selector_options_callback(selected_plant_name):
     Callback to return the options for the 'month-selector' given the selected plant name.
     """
 
-    data_selected_plant_months = data_ind_park[selected_plant_name].data.resample('BMS').count().index
+    data_selected_plant_months = _get_plant_months(get_data_ind_park()[selected_plant_name])
     month_selector_options = [{'label': item.strftime('%B'), 'value': item.month} for item in data_selected_plant_months]
     month_selector_value = data_selected_plant_months[-1].month
 
@@ -215,66 +507,314 @@ def get_date_range_selector_options_callback(selected_plant_name):
     Callback to return the options for the 'date-range-selector' given the selected plant name.
     """
 
-    data_selected_plant = data_ind_park[selected_plant_name]
+    data_selected_plant = get_data_ind_park()[selected_plant_name]
     min_date_allowed=data_selected_plant.data.index.min()
     max_date_allowed=data_selected_plant.data.index.max()
-    start_date=data_selected_plant.data.index.max() - datetime.timedelta(days=30)
-    end_date=data_selected_plant.data.index.max()
+    start_date, end_date = _get_default_date_range(data_selected_plant)
 
     return min_date_allowed, max_date_allowed, start_date, end_date
 
 
 @callback(
-    [Output('plant-selector', 'value'),
-    Output('plant-selector-cc', 'value')],
-    [Input('plant-selector', 'value'),
-    Input('plant-selector-cc', 'value')]
+    Output('tab-content', 'children'),
+    Input('tabs', 'value'),
+    State('selected-plant-store', 'data')
 )
-def sync_plant_selectors_dropdown_callback(selected_plant_rep, selected_plant_cc):
+def render_tab_content_callback(selected_tab, selected_plant_name):
     """
-    Callback to synchronize the Dropdown components 'plant-selector' (full report) and 'plant-selector-cc' (control chart)
+    Callback to render the content of the selected Tab, so the figures of the other Tabs are not
+    created until their Tab is selected.
     """
-    ctx = callback_context
-    input_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
-    if input_id == 'plant-selector':
-        return selected_plant_rep, selected_plant_rep
-    else:
-        return selected_plant_cc, selected_plant_cc
+    if selected_tab == 'Index Report':
+        return tab_index_report_content(selected_plant_name)
+    if selected_tab == 'Control Chart':
+        return tab_control_chart_content(selected_plant_name)
+    if selected_tab == 'Worst Circuits':
+        return tab_worst_circuits_content()
+    return tab_about_content()
+
+for plant_selector_id in ['plant-selector', 'plant-selector-cc']:
+    clientside_callback(
+        ClientsideFunction(namespace='plant_selectors', function_name='store'),
+        Output('selected-plant-store', 'data', allow_duplicate=True),
+        Input(plant_selector_id, 'value'),
+        prevent_initial_call=True
+    )
+
+for id_suffix in ['', '-cc']:
+    @callback(
+        [Output(f'circuit-page{id_suffix}', 'options'),
+        Output(f'circuit-page{id_suffix}', 'value')],
+        [Input(f'plant-selector{id_suffix}', 'value'),
+        Input(f'circuit-filter{id_suffix}', 'value')]
+    )
+    def get_circuit_page_options_callback(selected_plant_name, circuit_filter):
+        """
+        Callback to return the options for the circuit page selector given the selected plant name and
+        circuit filter. The first page is selected.
+        """
+
+        pages = _get_circuit_pages(get_data_ind_park()[selected_plant_name], circuit_filter)
+        return get_circuit_page_options(pages), 1 if pages else None
 
 @callback(
-    Output('fig_index_report', 'figure'),
+    [Output('fig_index_report', 'figure'),
+    Output('report-month-store', 'data')],
     [Input('plant-selector', 'value'),
-    Input('month-selector', 'value')]
+    Input('circuit-filter', 'value'),
+    Input('circuit-page', 'value')],
+    **get_background_callback_kwargs(progress_id='fig_index_report_progress', running_id='fig_index_report_running')
 )
-def create_figure_report_callback(selected_plant_name, selected_month):
+@progress_callback
+@instrument_callback('create_figure_report_callback')
+@cached_result(_report_cache_key)
+@serialize_figure_output('create_figure_report_callback')
+def create_figure_report_callback(selected_plant_name, circuit_filter, circuit_page, set_progress=None):
     """
-    Callback to create and return the figure of the Ppk index full report.
+    Callback to create and return the figure of the Ppk index full report for the last month of the selected
+    plant and the circuits of the selected page, and the data of the report month store (figure updates of
+    every month). The month selection is applied in the browser by a clientside callback.
     """
 
-    data_selected_plant = data_ind_park[selected_plant_name]
+    report_progress(set_progress, 'compute')
+    data_selected_plant = _get_plant(selected_plant_name)
+    circuit_names = _get_page_circuit_names(data_selected_plant, circuit_filter, circuit_page)
+    if not circuit_names:
+        return _create_empty_figure('No circuits to show'), None
 
-    ppk_rep_monthly = calculate_cap_index_ppk(data_selected_plant, freq='BMS')
-    ppk_rep_daily = calculate_cap_index_ppk(data_selected_plant, freq='D')
+    ppk_rep_monthly = get_cap_index_ppk(data_selected_plant, freq='BMS')
+    ppk_rep_daily = get_cap_index_ppk(data_selected_plant, freq='D')
 
+    selected_month = _get_plant_months(data_selected_plant)[-1].month
     ppk_rep_daily_sel_month = ppk_rep_daily.loc[ppk_rep_daily.index.month == selected_month]
     process_data_sel_month = data_selected_plant.data.loc[data_selected_plant.data.index.month == selected_month]
-
-    fig_index_report = create_figure_report(data_selected_plant, ppk_rep_monthly, ppk_rep_daily_sel_month, process_data_sel_month)
-
-    return fig_index_report
+    histograms_sel_month = get_histograms_selected_month(data_selected_plant, selected_month,
+                                                        config.layout_config.plt_histogram_bins)
+    report_month_store = create_report_month_store(data_selected_plant, ppk_rep_monthly, ppk_rep_daily,
+                                                config.layout_config.plt_histogram_bins, circuit_names=circuit_names)
+
+    report_progress(set_progress, 'figure')
+    fig_index_report = create_figure_report(data_selected_plant, ppk_rep_monthly, ppk_rep_daily_sel_month, process_data_sel_month,
+                                            histograms=histograms_sel_month, circuit_names=circuit_names)
+
+    return fig_index_report, report_month_store
+
+clientside_callback(
+    ClientsideFunction(namespace='report', function_name='apply_month_updates'),
+    Output('fig_index_report', 'figure', allow_duplicate=True),
+    [Input('month-selector', 'value'),
+    Input('report-month-store', 'data')],
+    State('fig_index_report', 'figure'),
+    prevent_initial_call=True
+)
 
 @callback(
     Output('fig_control_chart', 'figure'),
     [Input('plant-selector-cc', 'value'),
+    Input('circuit-filter-cc', 'value'),
+    Input('circuit-page-cc', 'value'),
     Input('date-range-selector', 'start_date'),
-    Input('date-range-selector', 'end_date')]
+    Input('date-range-selector', 'end_date')],
+    **get_background_callback_kwargs(progress_id='fig_control_chart_progress', running_id='fig_control_chart_running')
+)
+@progress_callback
+@instrument_callback('create_figure_control_chart_callback')
+@cached_result(_control_chart_cache_key)
+@serialize_figure_output('create_figure_control_chart_callback')
+def create_figure_control_chart_callback(selected_plant_name_cc, circuit_filter, circuit_page, start_date, end_date,
+                                        set_progress=None):
+    """
+    Callback to create and return the figure of the Control Chart with the circuits of the selected page.
+    If only the time range changed, a Patch with the new trace data and moving lines is returned
+    instead of the full figure.
+    """
+    report_progress(set_progress, 'compute')
+    data_selected_plant_cc = _get_plant(selected_plant_name_cc)
+    circuit_names = _get_page_circuit_names(data_selected_plant_cc, circuit_filter, circuit_page)
+    if not circuit_names:
+        return _create_empty_figure('No circuits to show')
+    report_progress(set_progress, 'figure')
+
+    if _triggered_ids() and _triggered_ids() <= {'date-range-selector'}:
+        updates = get_figure_control_chart_updates(data_selected_plant_cc, start_date, end_date, circuit_names)
+        return apply_figure_updates(Patch(), updates)
+
+    fig_control_chart = create_figure_control_chart(data_selected_plant_cc, start_date, end_date, circuit_names)
+
+    return fig_control_chart
+
+@callback(
+    Output('fig_control_chart', 'figure', allow_duplicate=True),
+    Input('fig_control_chart', 'relayoutData'),
+    [State('plant-selector-cc', 'value'),
+    State('circuit-filter-cc', 'value'),
+    State('circuit-page-cc', 'value'),
+    State('date-range-selector', 'start_date'),
+    State('date-range-selector', 'end_date')],
+    prevent_initial_call=True
 )
-def create_figure_control_chart_callback(selected_plant_name_cc, start_date, end_date):
+@instrument_callback('zoom_figure_control_chart_callback')
+@cached_result(_zoom_control_chart_cache_key)
+@serialize_figure_output('zoom_figure_control_chart_callback')
+def zoom_figure_control_chart_callback(relayout_data, selected_plant_name_cc, circuit_filter, circuit_page,
+                                    start_date, end_date):
     """
-    Callback to create and return the figure of the Control Chart.
+    Callback to update the Control Chart points of the zoomed (or panned) subplots with the samples of the
+    visible range, at the resolution that fits the point budget. Only the changed traces are sent.
     """
-    data_selected_plant_cc = data_ind_park[selected_plant_name_cc]
-    fig_control_chart = create_figure_control_chart(data_selected_plant_cc, start_date, end_date)
+    data_selected_plant_cc = get_data_ind_park()[selected_plant_name_cc]
+    circuit_names = _get_page_circuit_names(data_selected_plant_cc, circuit_filter, circuit_page)
+    xaxis_ranges = get_control_chart_xaxis_ranges(relayout_data, len(circuit_names))
+
+    if not xaxis_ranges:
+        raise PreventUpdate
+
+    fig_control_chart = Patch()
+    for i, xaxis_range in xaxis_ranges.items():
+        circ = circuit_names[i]
+
+        # Visible range limited to the selected time range
+        range_start, range_end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        if xaxis_range is not None:
+            range_start = max(range_start, pd.Timestamp(xaxis_range[0]))
+            range_end = min(range_end, pd.Timestamp(xaxis_range[1]))
+
+        trace_data = get_control_chart_trace_data(process_data_obj=data_selected_plant_cc,
+                                                start_date=range_start,
+                                                end_date=range_end,
+                                                circ=circ,
+                                                max_points=config.layout_config.plt_control_chart_max_points)
+
+        apply_figure_updates(fig_control_chart, get_control_chart_scatter_updates(i, trace_data))
 
     return fig_control_chart
+
+@callback(
+    [Output('live-interval', 'disabled'),
+    Output('live-store', 'data')],
+    [Input('live-mode', 'value'),
+    Input('plant-selector-cc', 'value'),
+    Input('circuit-filter-cc', 'value'),
+    Input('circuit-page-cc', 'value'),
+    Input('date-range-selector', 'start_date'),
+    Input('date-range-selector', 'end_date')]
+)
+def toggle_live_mode_callback(live_mode, selected_plant_name_cc, circuit_filter, circuit_page, start_date, end_date):
+    """
+    Callback to enable the live updates of the Control Chart. The live state is reset whenever the figure
+    is created again (plant, circuits or time range change).
+    """
+    return 'live' not in (live_mode or []), None
+
+@callback(
+    [Output('fig_control_chart', 'extendData'),
+    Output('live-store', 'data', allow_duplicate=True)],
+    Input('live-interval', 'n_intervals'),
+    [State('plant-selector-cc', 'value'),
+    State('circuit-filter-cc', 'value'),
+    State('circuit-page-cc', 'value'),
+    State('date-range-selector', 'start_date'),
+    State('date-range-selector', 'end_date'),
+    State('live-store', 'data')],
+    prevent_initial_call=True
+)
+@instrument_callback('live_figure_control_chart_callback')
+def live_figure_control_chart_callback(n_intervals, selected_plant_name_cc, circuit_filter, circuit_page,
+                                    start_date, end_date, live_store):
+    """
+    Callback to append the samples received since the last tick to the Control Chart (live mode). The samples
+    are appended to the data by the live poller of the server ('start_live_poller'), and the callback only reads
+    the samples after the last timestamp of the client. Only the new points are sent ('extendData', limited to
+    'live_max_points' points per trace), and the running average and the limits lines are moved by the
+    clientside callback 'live.apply_relayout', so the cost of each tick is proportional to the number of new
+    samples.
+    Obs.: Other figure updates (zoom or time range change) redraw the figure with the selected time range.
+    """
+    data_selected_plant_cc = get_data_ind_park()[selected_plant_name_cc]
+    circuit_names = _get_page_circuit_names(data_selected_plant_cc, circuit_filter, circuit_page)
+    if not circuit_names:
+        raise PreventUpdate
+
+    new_live_store = no_update
+    if live_store is None:
+        # The live samples start after the last sample of the data when the live mode starts: the figure already
+        # has the samples of the time range ('.loc[start_date:end_date]', with the whole end day for dates
+        # without time), and the samples after a historical time range are not live samples
+        last_timestamp = data_selected_plant_cc.last_timestamp
+        last_timestamp = last_timestamp if last_timestamp is not None else pd.Timestamp(end_date)
+        live_store = new_live_store = {'last_timestamp': last_timestamp.isoformat(),
+                    'running_stats': get_control_chart_running_stats(data_selected_plant_cc, start_date, end_date,
+                                                                    circuit_names)}
+
+    live_updates = get_control_chart_live_updates(data_selected_plant_cc, live_store['last_timestamp'],
+                                                live_store['running_stats'], config.live_config.live_max_points,
+                                                circuit_names)
+    if live_updates is None:
+        return no_update, new_live_store
+
+    extend_data = (live_updates['extend_data'], live_updates['trace_indices'], config.live_config.live_max_points)
+    live_store = {'last_timestamp': live_updates['last_timestamp'],
+                'running_stats': live_updates['running_stats'],
+                'relayout': live_updates['relayout']}
+
+    return extend_data, live_store
+
+clientside_callback(
+    ClientsideFunction(namespace='live', function_name='apply_relayout'),
+    Output('live-relayout-applied', 'data'),
+    Input('live-store', 'data'),
+    prevent_initial_call=True
+)
+
+def _table_value(value: float):
+    # Missing values are shown as empty cells
+    return None if np.isnan(value) else value
+
+@callback(
+    [Output('worst-circuits-table', 'data'),
+    Output('worst-circuits-versions', 'data')],
+    [Input('worst-circuits-n', 'value'),
+    Input('worst-circuits-interval', 'n_intervals')],
+    State('worst-circuits-versions', 'data')
+)
+@instrument_callback('worst_circuits_callback')
+def worst_circuits_callback(n_circuits, n_intervals, data_versions):
+    """
+    Callback to return the rows of the table of the circuits of the industrial park with the lowest Ppk index
+    of the last month relative to their goal. When the callback is triggered by the refresh interval, the
+    table is only updated if the data of any plant changed (only the Ppk of those plants is calculated again).
+    """
+
+    data_ind_park = get_data_ind_park()
+    new_data_versions = {obj.plant_name: obj.data_version for obj in data_ind_park.process_data_objs}
+    if not n_circuits or (_triggered_ids() == {'worst-circuits-interval'} and new_data_versions == data_versions):
+        raise PreventUpdate
+
+    rows = []
+    for rank, worst_circuit in enumerate(get_worst_circuits(data_ind_park, int(n_circuits)), start=1):
+        rows.append({
+            'rank': rank,
+            'plant': worst_circuit['plant'],
+            'circuit': worst_circuit['circuit'],
+            'month': worst_circuit['period'].strftime('%Y-%m'),
+            **{key: _table_value(worst_circuit[key]) for key in ['ppk', 'ppk_goal', 'distance_to_goal',
+                                                                'previous_ppk', 'trend']},
+        })
+
+    return rows, new_data_versions
+
+def precompute_default_figures(process_data_obj):
+    """
+    Precompute the figures shown by default for the plant (full report of the last month and control chart
+    of the last 30 days, first page of all the circuits), which are stored in the result cache.
+    The callbacks are called without the progress wrapper ('__wrapped__'), so the figures are stored with the
+    same keys used by the requests, and the time of the last access to the plant is not updated.
+    """
+
+    create_figure_report_callback.__wrapped__(process_data_obj.plant_name, CIRCUIT_FILTER_ALL, 1,
+                                            set_progress=None)
+
+    start_date, end_date = _get_default_date_range(process_data_obj)
+    create_figure_control_chart_callback.__wrapped__(process_data_obj.plant_name, CIRCUIT_FILTER_ALL, 1,
+                                                    start_date, end_date, set_progress=None)
@@ -0,0 +1,57 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+
+    report: {
+        /*
+         * Apply the updates of the selected month (report month store) on a copy of the full report figure.
+         * Each update is a pair [path, value], where the path is a list of keys (and list positions) from
+         * the figure root.
+         */
+        apply_month_updates: function(selectedMonth, storeData, figure) {
+            if (!storeData || !figure || !(String(selectedMonth) in storeData.months)) {
+                return window.dash_clientside.no_update;
+            }
+
+            const newFigure = JSON.parse(JSON.stringify(figure));
+            storeData.months[String(selectedMonth)].forEach(function(update) {
+                const path = update[0];
+                let obj = newFigure;
+                for (let i = 0; i < path.length - 1; i++) {
+                    if (obj[path[i]] === undefined || obj[path[i]] === null) {
+                        obj[path[i]] = {};
+                    }
+                    obj = obj[path[i]];
+                }
+                obj[path[path.length - 1]] = update[1];
+            });
+
+            return newFigure;
+        }
+    },
+
+    live: {
+        /*
+         * Move the average and specification limits lines of the Control Chart in live mode, with the
+         * relayout attributes (e.g. 'shapes[2].y0') computed by the server. The figure property of the
+         * Graph component is not changed, so the points appended with 'extendData' are kept.
+         */
+        apply_relayout: function(liveStore) {
+            const graph = document.querySelector('#fig_control_chart .js-plotly-plot');
+            if (!liveStore || !liveStore.relayout || !graph) {
+                return window.dash_clientside.no_update;
+            }
+
+            window.Plotly.relayout(graph, liveStore.relayout);
+            return liveStore.last_timestamp;
+        }
+    },
+
+    plant_selectors: {
+        /*
+         * Store the plant selected in the Dropdown components 'plant-selector' (full report) and
+         * 'plant-selector-cc' (control chart), which is used when the other Tab is rendered.
+         */
+        store: function(selectedPlant) {
+            return selectedPlant;
+        }
+    }
+});
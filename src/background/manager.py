@@ -0,0 +1,96 @@
+import functools
+import logging
+import typing as t
+from pathlib import Path
+from dash.dependencies import Output
+
+from app_config import PROJECT_ROOT, config
+
+logger = logging.getLogger(__name__)
+
+# Steps of the figure callbacks reported as progress by the background callbacks
+PROGRESS_STEPS = ('compute', 'figure', 'serialize')
+
+def create_background_callback_manager(enabled: bool, directory: t.Union[str, Path]):
+    """
+    Create the Dash background callback manager, which runs the callbacks as jobs of a local queue backed
+    by 'diskcache' (job processes started by the 'multiprocess' package).
+
+    Args:
+        enabled (bool): Enable the background callbacks.
+        directory (str or Path): Directory of the diskcache of the jobs.
+
+    Returns:
+        manager (dash.DiskcacheManager): Background callback manager, or None if the background callbacks
+                    are disabled or the required packages are not installed.
+    """
+
+    if not enabled:
+        return None
+
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+        manager = DiskcacheManager(diskcache.Cache(str(directory)))
+    except ImportError:
+        logger.warning("Packages 'diskcache', 'multiprocess' and 'psutil' are required by the background callbacks. "
+                       "Running the callbacks in the request thread.")
+        return None
+
+    return manager
+
+background_callback_manager = create_background_callback_manager(config.background_config.background_callbacks,
+                                                PROJECT_ROOT / config.background_config.background_cache_dir)
+
+def get_background_callback_kwargs(progress_id: str, running_id: str) -> dict:
+    """
+    Return the keyword arguments of the 'dash.callback' decorator that run the callback in the background.
+    The progress is set in the 'value' and 'max' properties of the component 'progress_id' and the component
+    'running_id' is shown while the job is running.
+    Superseded jobs (the inputs changed again while the job was running) are terminated by Dash.
+
+    Args:
+        progress_id (str): Id of the html.Progress component.
+        running_id (str): Id of the component shown while the job is running.
+
+    Returns:
+        kwargs (dict): Keyword arguments of the callback decorator (empty if the background callbacks are disabled).
+
+    Obs.: All arguments must be passed as kwargs.
+    """
+
+    if background_callback_manager is None:
+        return {}
+
+    return dict(
+        background=True,
+        manager=background_callback_manager,
+        progress=[Output(progress_id, 'value'), Output(progress_id, 'max')],
+        running=[(Output(running_id, 'style'), {'display': 'block'}, {'display': 'none'})],
+    )
+
+def report_progress(set_progress: t.Optional[t.Callable], step: str):
+    """
+    Report that the callback started the given step of PROGRESS_STEPS (no-op if 'set_progress' is None).
+    """
+
+    if set_progress is not None:
+        set_progress((str(PROGRESS_STEPS.index(step)), str(len(PROGRESS_STEPS))))
+
+def progress_callback(func):
+    """
+    Decorator of the callbacks that report progress. Dash passes the 'set_progress' function as the first
+    argument of the background callbacks with progress; the decorated function receives it as the keyword
+    argument 'set_progress' (None if the background callbacks are disabled).
+    """
+
+    if background_callback_manager is None:
+        @functools.wraps(func)
+        def wrapper(*args):
+            return func(*args, set_progress=None)
+    else:
+        @functools.wraps(func)
+        def wrapper(set_progress, *args):
+            return func(*args, set_progress=set_progress)
+
+    return wrapper
@@ -0,0 +1,303 @@
+import collections
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import typing as t
+from pathlib import Path
+
+from app_config import PROJECT_ROOT, config
+from data.memory import estimate_size
+from monitoring.metrics import increment
+
+logger = logging.getLogger(__name__)
+
+def get_plant_key_prefix(plant_name: str) -> str:
+    """
+    Return the prefix of the cache keys of the results related to the given plant.
+    """
+    return hashlib.sha1(plant_name.encode('utf-8')).hexdigest()[:16]
+
+class ResultCache():
+    """
+    Base class of the result caches of the callbacks. The keys start with the prefix of the plant related
+    to the result ('get_plant_key_prefix'), so all the entries of a plant can be invalidated at once.
+
+    Methods:
+        get(key): Return the stored value, or None if the key is not stored.
+        set(key, value): Store the value.
+        invalidate_plant(plant_name): Remove all the entries of the plant.
+        clear(): Remove all the entries.
+        memory_usage(plant_name): Return the process memory used by the entries of the plant, in bytes.
+    """
+
+    def get(self, key: str) -> t.Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: t.Any):
+        raise NotImplementedError
+
+    def invalidate_plant(self, plant_name: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def memory_usage(self, plant_name: str) -> int:
+        # Entries stored out of the process (e.g. files) do not use process memory
+        return 0
+
+class LRUResultCache(ResultCache):
+    """
+    In-process result cache with Least Recently Used eviction.
+
+    Attributes:
+        maxsize (int): Maximum number of stored entries.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_plant(self, plant_name):
+        prefix = get_plant_key_prefix(plant_name)
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def memory_usage(self, plant_name):
+        prefix = get_plant_key_prefix(plant_name)
+        with self._lock:
+            values = [value for key, value in self._entries.items() if key.startswith(prefix)]
+        return sum(estimate_size(value) for value in values)
+
+class FileSystemResultCache(ResultCache):
+    """
+    Result cache stored as pickle files in a local directory (one sub-directory per plant), which is
+    shared by all the workers running in the same host.
+
+    Attributes:
+        directory (Path): Root directory of the cache files.
+    """
+    def __init__(self, directory: t.Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _file_path(self, key: str) -> Path:
+        return self.directory / key.split('-')[0] / f'{key}.pkl'
+
+    def get(self, key):
+        try:
+            with open(self._file_path(key), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, value):
+        plant_directory = self._file_path(key).parent
+        plant_directory.mkdir(parents=True, exist_ok=True)
+
+        # Writing in a temporary file first, so other workers never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=plant_directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._file_path(key))
+
+    def invalidate_plant(self, plant_name):
+        shutil.rmtree(self.directory / get_plant_key_prefix(plant_name), ignore_errors=True)
+
+    def clear(self):
+        for plant_directory in self.directory.iterdir():
+            shutil.rmtree(plant_directory, ignore_errors=True)
+
+class DiskcacheResultCache(ResultCache):
+    """
+    Result cache backed by the 'diskcache' package (SQLite and files in a local directory), which is
+    shared by all the workers running in the same host. The plant key prefix is stored as the entry tag.
+
+    Attributes:
+        directory (Path): Directory of the cache.
+    """
+    def __init__(self, directory: t.Union[str, Path]):
+        import diskcache
+
+        self.directory = Path(directory)
+        self._cache = diskcache.Cache(str(self.directory))
+        self._cache.create_tag_index()
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value, tag=key.split('-')[0])
+
+    def invalidate_plant(self, plant_name):
+        self._cache.evict(get_plant_key_prefix(plant_name))
+
+    def clear(self):
+        self._cache.clear()
+
+class TieredResultCache(ResultCache):
+    """
+    Result cache with an in-process LRU cache in front of a shared cache. Values found only in the
+    shared cache are copied to the in-process cache.
+
+    Attributes:
+        local_cache (LRUResultCache): In-process cache.
+        shared_cache (ResultCache): Cache shared by the workers.
+    """
+    def __init__(self, local_cache: LRUResultCache, shared_cache: ResultCache):
+        self.local_cache = local_cache
+        self.shared_cache = shared_cache
+
+    def get(self, key):
+        value = self.local_cache.get(key)
+        if value is None:
+            value = self.shared_cache.get(key)
+            if value is not None:
+                self.local_cache.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.local_cache.set(key, value)
+        self.shared_cache.set(key, value)
+
+    def invalidate_plant(self, plant_name):
+        self.local_cache.invalidate_plant(plant_name)
+        self.shared_cache.invalidate_plant(plant_name)
+
+    def clear(self):
+        self.local_cache.clear()
+        self.shared_cache.clear()
+
+    def memory_usage(self, plant_name):
+        return self.local_cache.memory_usage(plant_name)
+
+def create_result_cache(backend: str, maxsize: int, directory: t.Union[str, Path]) -> ResultCache:
+    """
+    Create the result cache for the given backend.
+
+    Args:
+        backend (str): 'lru' (in-process only), 'filesystem' or 'diskcache' (in-process LRU in front of
+                    a cache shared by the workers of the host).
+        maxsize (int): Maximum number of entries of the in-process cache.
+        directory (str or Path): Directory of the shared cache.
+
+    Returns:
+        result_cache (ResultCache): Result cache object.
+    """
+
+    local_cache = LRUResultCache(maxsize)
+
+    if backend == 'lru':
+        return local_cache
+    if backend == 'filesystem':
+        return TieredResultCache(local_cache, FileSystemResultCache(directory))
+    if backend == 'diskcache':
+        try:
+            return TieredResultCache(local_cache, DiskcacheResultCache(directory))
+        except ImportError:
+            logger.warning("Package 'diskcache' is not installed. Using the 'filesystem' result cache backend.")
+            return TieredResultCache(local_cache, FileSystemResultCache(directory))
+
+    raise ValueError(f"Unknown result cache backend: {backend!r}")
+
+def get_config_hash() -> str:
+    """
+    Return the hash of the application configuration, so cached results are not reused after a
+    configuration change.
+    """
+    return hashlib.sha1(config.json(sort_keys=True).encode('utf-8')).hexdigest()
+
+def make_cache_key(plant_name: str, data_version: str, *parts) -> str:
+    """
+    Create the key of a cached result from the plant name, the data version of the plant, the configuration
+    hash and the other parts of the key (e.g. callback name and arguments).
+    """
+    key_text = repr((plant_name, data_version, _config_hash) + parts)
+    return f"{get_plant_key_prefix(plant_name)}-{hashlib.sha256(key_text.encode('utf-8')).hexdigest()}"
+
+_config_hash = get_config_hash()
+
+# Result cache of the callbacks, created on the first call of 'get_result_cache' (the shared backends create
+# their directory, so the cache is not created at import)
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """
+    Return the result cache of the callbacks, which is created ('create_result_cache' with the values of
+    'config.cache_config') on the first call. With the background callbacks, which run in job processes, the
+    in-process 'lru' backend is replaced by the 'diskcache' backend, so the results (and the figures
+    precomputed by the warm-up) are shared by the server and the jobs.
+
+    Returns:
+        result_cache (ResultCache): Result cache object.
+    """
+
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                backend = config.cache_config.result_cache_backend
+                if config.background_config.background_callbacks and backend == 'lru':
+                    logger.warning("The 'lru' result cache is not shared with the background callbacks. "
+                                "Using the 'diskcache' result cache backend.")
+                    backend = 'diskcache'
+                _result_cache = create_result_cache(backend,
+                                                config.cache_config.result_cache_maxsize,
+                                                PROJECT_ROOT / config.cache_config.result_cache_dir)
+    return _result_cache
+
+def cached_result(key_func: t.Callable[..., tuple]):
+    """
+    Decorator that stores the results of a function in the result cache.
+    The 'key_func' function receives the same arguments of the decorated function and returns the
+    tuple (process_data_obj, key_parts), where the key parts identify the result for the plant, or the tuple
+    (process_data_obj, key_parts, until) for the results that only depend on the samples up to the timestamp
+    'until' (the key uses the version of these samples, so the result is reused after newer samples are
+    appended).
+    Results equal to None are not stored. The hits and misses are counted in the 'result_cache_requests'
+    metric.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            process_data_obj, key_parts, *until = key_func(*args, **kwargs)
+            data_version = process_data_obj.get_data_version(*until) if until else process_data_obj.data_version
+            key = make_cache_key(process_data_obj.plant_name, data_version, func.__name__, *key_parts)
+
+            result_cache = get_result_cache()
+            result = result_cache.get(key)
+            increment('result_cache_requests', callback=func.__name__, result='miss' if result is None else 'hit')
+            if result is None:
+                result = func(*args, **kwargs)
+                if result is not None:
+                    result_cache.set(key, result)
+
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+import threading
+import pandas as pd
+
+class FrameBuffer():
+    """
+    Create a DataFrame with timestamp index stored as a consolidated frame and the chunks appended since the
+    last consolidation, so appending rows does not copy the whole frame. The chunks are concatenated when
+    the whole frame is read (or when there are more than 'max_chunks' chunks).
+
+    ...
+
+    Attributes:
+        frame (pd.DataFrame): Whole DataFrame (the chunks are consolidated first).
+        frames (list): Consolidated frame and chunks, without consolidating them.
+        columns (pd.Index): Columns of the DataFrame.
+        last_index: Last timestamp of the index, or None if the DataFrame is empty.
+        max_chunks (int): Maximum number of chunks kept without consolidation.
+
+    Methods:
+        append(chunk): Append the rows of the chunk, replacing the rows from its first timestamp onwards.
+        tail(start): Return the rows from 'start' onwards, without consolidating the chunks.
+    """
+    def __init__(self, frame: pd.DataFrame, max_chunks: int = 64):
+        self.max_chunks = max_chunks
+        self._frame = frame
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frame) + sum(len(chunk) for chunk in self._chunks)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            self._consolidate()
+            return self._frame
+
+    @property
+    def frames(self) -> list:
+        with self._lock:
+            return [self._frame] + self._chunks
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    @property
+    def last_index(self):
+        with self._lock:
+            for frame in reversed([self._frame] + self._chunks):
+                if len(frame):
+                    return frame.index[-1]
+            return None
+
+    def _consolidate(self):
+        if self._chunks:
+            self._frame = pd.concat([self._frame] + self._chunks)
+            self._chunks = []
+
+    def append(self, chunk: pd.DataFrame):
+        """
+        Append the rows of the chunk (sorted by timestamp). The rows of the buffer with timestamps equal or
+        newer than the first timestamp of the chunk are replaced (e.g. the last bucket of an aggregated table).
+
+        Args:
+            chunk (pd.DataFrame): DataFrame with the same columns of the buffer.
+        """
+        if len(chunk) == 0:
+            return
+
+        start = chunk.index[0]
+        with self._lock:
+            while self._chunks and (len(self._chunks[-1]) == 0 or self._chunks[-1].index[0] >= start):
+                self._chunks.pop()
+            if self._chunks:
+                last_chunk = self._chunks[-1]
+                self._chunks[-1] = last_chunk.iloc[:last_chunk.index.searchsorted(start, side='left')]
+            elif len(self._frame) and self._frame.index[-1] >= start:
+                # Slicing the rows does not copy the frame
+                self._frame = self._frame.iloc[:self._frame.index.searchsorted(start, side='left')]
+
+            self._chunks.append(chunk)
+            if len(self._chunks) > self.max_chunks:
+                self._consolidate()
+
+    def tail(self, start) -> pd.DataFrame:
+        """
+        Return the rows from 'start' onwards. Only the rows of the tail are copied, so the cost does not depend
+        on the size of the buffer.
+
+        Args:
+            start: First timestamp of the returned rows.
+
+        Returns:
+            tail (pd.DataFrame): Rows from 'start' onwards.
+        """
+        start = pd.Timestamp(start)
+        with self._lock:
+            frames = [self._frame] + self._chunks
+
+        parts = []
+        for frame in reversed(frames):
+            part = frame.iloc[frame.index.searchsorted(start, side='left'):]
+            if len(part):
+                parts.append(part)
+            if len(frame) and frame.index[0] < start:
+                break
+
+        if not parts:
+            return frames[0].iloc[:0]
+        return pd.concat(parts[::-1]) if len(parts) > 1 else parts[0]
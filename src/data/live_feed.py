@@ -0,0 +1,116 @@
+import logging
+import threading
+import zlib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_append_lock = threading.Lock()
+
+def simulate_live_samples(process_data_obj, until=None, freq: str = '1H') -> pd.DataFrame:
+    """
+    Simulate the samples received from a live source after the last timestamp of the data, up to 'until'.
+    The samples of each timestamp are generated with a random generator seeded by the plant name and the
+    timestamp, so all the workers of the application generate the same samples.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object of the plant.
+        until (optional): Timestamp of the last sample. Default: now.
+        freq (str, default='1H'): Time frequency of the samples.
+
+    Returns:
+        new_data (pd.DataFrame): DataFrame with the new samples (may be empty).
+    """
+
+    until = pd.Timestamp.now() if until is None else pd.Timestamp(until)
+    last_timestamp = process_data_obj.last_timestamp
+    index = pd.date_range(start=last_timestamp, end=until, freq=freq)[1:]
+
+    plant_seed = zlib.crc32(process_data_obj.plant_name.encode('utf-8'))
+    values = np.zeros(shape=(len(index), len(process_data_obj.circuit_names)))
+
+    for i, timestamp in enumerate(index):
+        rng = np.random.default_rng([plant_seed, int(timestamp.value // 10**9)])
+        for j, circ in enumerate(process_data_obj.circuit_names):
+            lsl = process_data_obj.specifications_limits[circ]['LSL']
+            usl = process_data_obj.specifications_limits[circ]['USL']
+            values[i, j] = rng.normal(loc=(usl + lsl) / 2, scale=(usl - lsl) / 14)
+
+    return pd.DataFrame(data=values, index=index, columns=process_data_obj.circuit_names)
+
+def poll_live_data(process_data_obj, freq: str = '1H') -> bool:
+    """
+    Append the samples of the (simulated) live source received since the last poll to the data of the plant.
+    Only the plants with sample data are simulated: the data loaded from a source (e.g. a process historian)
+    only receives its own samples.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object of the plant.
+        freq (str, default='1H'): Time frequency of the samples.
+
+    Returns:
+        appended (bool): True if any sample was appended.
+    """
+
+    if not process_data_obj.is_sample_data:
+        return False
+
+    with _append_lock:
+        new_data = simulate_live_samples(process_data_obj, freq=freq)
+        if len(new_data) == 0:
+            return False
+        return process_data_obj.append_data(new_data)
+
+class LivePoller():
+    """
+    Poll the (simulated) live source of the plants periodically in a daemon thread ('poll_live_data'), so the
+    samples are appended once by the server, whatever the number of open live Control Charts. The plants
+    unloaded by the memory budget are not polled (their samples are appended after the next access).
+
+    Attributes:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        interval_seconds (float): Time between the end of a poll and the start of the next one.
+        freq (str): Time frequency of the samples.
+
+    Methods:
+        poll(): Poll the live source of all the loaded plants.
+        start(): Start the poller thread.
+        stop(): Stop the poller thread.
+    """
+    def __init__(self, data_ind_park, interval_seconds: float, freq: str = '1H'):
+        self.data_ind_park = data_ind_park
+        self.interval_seconds = interval_seconds
+        self.freq = freq
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def poll(self) -> list:
+        """
+        Poll the live source of all the loaded plants.
+
+        Returns:
+            polled_plants (list): Names of the plants with appended samples.
+        """
+        return [process_data_obj.plant_name for process_data_obj in self.data_ind_park.process_data_objs
+                if process_data_obj.is_loaded and poll_live_data(process_data_obj, freq=self.freq)]
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Live data poll failed")
+            if self._stop_event.wait(self.interval_seconds):
+                break
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='live-poller', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,276 @@
+import asyncio
+import functools
+import io
+import json
+import logging
+import sqlite3
+import time
+import typing as t
+import urllib.request
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from data.process_data import ProcessData, SetProcessData
+
+logger = logging.getLogger(__name__)
+
+class PlantDataLoadError(Exception):
+    """
+    Error raised when the data of one or more plants could not be loaded from their sources.
+    """
+
+class DataSource():
+    """
+    Base class of the sources of the data of a plant. The load has two steps: 'fetch' (I/O-bound, awaited in
+    the event loop, so the sources are fetched concurrently) returns the raw payload of the source, and 'parse'
+    (CPU-bound, run in an executor) returns the DataFrame with columns named on the circuit names and
+    timestamp index. The blocking reads of 'fetch' run in the executor given by the loader, and must stop
+    after the timeout of the attempt (the loader does not wait for the reads of the attempts timed out).
+
+    Attributes:
+        timeout (float or None): Timeout in seconds of each fetch attempt (default of the loader if None).
+        retries (int or None): Number of retries of a failed fetch (default of the loader if None).
+
+    Methods:
+        fetch(timeout, executor): Return the raw payload of the source (coroutine).
+        parse(raw): Return the data parsed from the raw payload.
+    """
+
+    def __init__(self, timeout: float = None, retries: int = None):
+        self.timeout = timeout
+        self.retries = retries
+
+    async def fetch(self, timeout: float, executor: Executor):
+        raise NotImplementedError
+
+    def parse(self, raw) -> pd.DataFrame:
+        raise NotImplementedError
+
+class FileSource(DataSource):
+    """
+    Source of the data of a plant in a CSV or parquet file (timestamps in the first column of the CSV files).
+
+    Attributes:
+        path (Path): Path of the file.
+    """
+
+    def __init__(self, path: t.Union[str, Path], timeout: float = None, retries: int = None):
+        super().__init__(timeout, retries)
+        self.path = Path(path)
+
+    async def fetch(self, timeout: float, executor: Executor) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(executor, self.path.read_bytes)
+
+    def parse(self, raw: bytes) -> pd.DataFrame:
+        if self.path.suffix == '.parquet':
+            return pd.read_parquet(io.BytesIO(raw))
+        return pd.read_csv(io.BytesIO(raw), index_col=0, parse_dates=True)
+
+class HTTPSource(DataSource):
+    """
+    Source of the data of a plant in a HTTP service (e.g. a process historian), which returns the data as JSON
+    in the 'split' orientation of pandas ('index', 'columns' and 'data').
+
+    Attributes:
+        url (str): URL of the data of the plant.
+    """
+
+    def __init__(self, url: str, timeout: float = None, retries: int = None):
+        super().__init__(timeout, retries)
+        self.url = url
+
+    def _read(self, timeout: float) -> bytes:
+        with urllib.request.urlopen(self.url, timeout=timeout) as response:
+            return response.read()
+
+    async def fetch(self, timeout: float, executor: Executor) -> bytes:
+        # The socket timeout stops the read when the attempt times out
+        return await asyncio.get_running_loop().run_in_executor(executor, self._read, timeout)
+
+    def parse(self, raw: bytes) -> pd.DataFrame:
+        payload = json.loads(raw)
+        return pd.DataFrame(data=payload['data'], columns=payload['columns'],
+                            index=pd.to_datetime(payload['index'])).astype(float)
+
+class SQLiteSource(DataSource):
+    """
+    Source of the data of a plant in a SQLite database. The first column of the query is the timestamp of
+    the samples and the other ones are the circuits.
+
+    Attributes:
+        db_path (Path): Path of the SQLite database.
+        query (str): Query of the data of the plant.
+    """
+
+    def __init__(self, db_path: t.Union[str, Path], query: str, timeout: float = None, retries: int = None):
+        super().__init__(timeout, retries)
+        self.db_path = Path(db_path)
+        self.query = query
+
+    def _read(self, timeout: float) -> tuple:
+        deadline = time.monotonic() + timeout
+        connection = sqlite3.connect(self.db_path, timeout=timeout)
+        try:
+            # The query is interrupted when the attempt times out
+            connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+            cursor = connection.execute(self.query)
+            return [description[0] for description in cursor.description], cursor.fetchall()
+        finally:
+            connection.close()
+
+    async def fetch(self, timeout: float, executor: Executor) -> tuple:
+        return await asyncio.get_running_loop().run_in_executor(executor, self._read, timeout)
+
+    def parse(self, raw: tuple) -> pd.DataFrame:
+        columns, rows = raw
+        data = pd.DataFrame.from_records(rows, columns=columns)
+        return data.set_index(pd.to_datetime(data.pop(columns[0]))).rename_axis(None).astype(float)
+
+def _get_source_retries(source: DataSource, retries: int) -> int:
+    return source.retries if source.retries is not None else retries
+
+async def fetch_with_retries(source: DataSource, executor: Executor, timeout: float = 30, retries: int = 2,
+                            retry_backoff_seconds: float = 0.5):
+    """
+    Fetch the raw payload of a source, retrying the failed or timed out attempts with exponential backoff.
+    The timeout and retries of the source take precedence over the given defaults.
+
+    Args:
+        source (DataSource): Source of the data of a plant.
+        executor (Executor): Executor of the blocking reads of the source.
+        timeout (float, default=30): Timeout in seconds of each attempt.
+        retries (int, default=2): Number of retries.
+        retry_backoff_seconds (float, default=0.5): Wait before the first retry (doubled in each retry).
+
+    Returns:
+        raw: Raw payload of the source.
+    """
+
+    timeout = source.timeout if source.timeout is not None else timeout
+    retries = _get_source_retries(source, retries)
+
+    for attempt in range(retries + 1):
+        try:
+            return await asyncio.wait_for(source.fetch(timeout, executor), timeout)
+        except (asyncio.TimeoutError, OSError, sqlite3.Error) as error:
+            if attempt == retries:
+                raise
+            logger.warning(f"Fetch of {source.__class__.__name__} failed (attempt {attempt + 1}): {error!r}")
+            await asyncio.sleep(retry_backoff_seconds * 2 ** attempt)
+
+async def load_plants_data(sources: t.Mapping[str, DataSource], max_concurrency: int = 4, timeout: float = 30,
+                        retries: int = 2, retry_backoff_seconds: float = 0.5,
+                        executor: Executor = None) -> dict:
+    """
+    Load the data of the plants from their sources concurrently. At most 'max_concurrency' sources are fetched
+    at the same time, and the payloads are parsed in the executor while the other sources are fetched.
+    The blocking reads of the sources run in a thread pool of the load, which is shut down without waiting
+    for the reads of the attempts timed out, so a source that does not respond does not delay the load
+    beyond its timeouts.
+
+    Args:
+        sources (dict): Source of the data of each plant name.
+        max_concurrency (int, default=4): Maximum number of sources fetched at the same time.
+        timeout, retries, retry_backoff_seconds: Default timeout and retries of the sources
+                                                ('fetch_with_retries').
+        executor (Executor, optional): Executor of the parsing of the payloads (e.g. ProcessPoolExecutor).
+                                    Default: default executor of the event loop (threads).
+
+    Returns:
+        plants_data (dict): Data (DataFrame) of each plant name, or the exception raised by its load.
+    """
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Each fetched source may have a read running and the reads of its attempts timed out
+    max_retries = max((_get_source_retries(source, retries) for source in sources.values()), default=0)
+    io_executor = ThreadPoolExecutor(max_workers=max_concurrency * (max_retries + 1),
+                                    thread_name_prefix='plant-data-loader')
+
+    async def load(source: DataSource) -> pd.DataFrame:
+        async with semaphore:
+            raw = await fetch_with_retries(source, io_executor, timeout, retries, retry_backoff_seconds)
+        return await loop.run_in_executor(executor, source.parse, raw)
+
+    plant_names = list(sources)
+    try:
+        results = await asyncio.gather(*(load(sources[plant_name]) for plant_name in plant_names),
+                                        return_exceptions=True)
+    finally:
+        io_executor.shutdown(wait=False, cancel_futures=True)
+    return dict(zip(plant_names, results))
+
+def _raise_load_errors(plants_data: dict):
+    errors = {plant_name: result for plant_name, result in plants_data.items() if isinstance(result, BaseException)}
+    if errors:
+        raise PlantDataLoadError("The data of the plant(s) could not be loaded: " +
+                                "; ".join(f"{plant_name} ({error!r})" for plant_name, error in errors.items()))
+
+async def load_data_ind_park_async(plant_parameters: t.Sequence[dict], sources: t.Mapping[str, DataSource],
+                                **kwargs) -> SetProcessData:
+    """
+    Coroutine of 'load_data_ind_park'. The Process Data objects are created in the default executor, so the
+    event loop is not blocked by the pyramids and fingerprints of the data.
+    """
+
+    plants_data = await load_plants_data(sources, **kwargs)
+    _raise_load_errors(plants_data)
+
+    loop = asyncio.get_running_loop()
+    process_data_objs = await asyncio.gather(*(
+        loop.run_in_executor(None, functools.partial(ProcessData, data=plants_data[parameters['plant_name']],
+                                                    **parameters))
+        for parameters in plant_parameters))
+
+    return SetProcessData(process_data_objs=list(process_data_objs))
+
+def load_data_ind_park(plant_parameters: t.Sequence[dict], sources: t.Mapping[str, DataSource],
+                    **kwargs) -> SetProcessData:
+    """
+    Create the Process Data objects of the industrial park with the data loaded concurrently from the sources
+    of the plants ('load_plants_data'), so the load takes as long as the slowest source instead of the sum of
+    all of them.
+
+    Args:
+        plant_parameters (list): Parameters of the Process Data object of each plant ('plant_name',
+                                'circuit_names', 'specifications_limits', 'ppk_goals', 'pyramid_levels').
+        sources (dict): Source of the data of each plant name.
+        **kwargs: Arguments of 'load_plants_data' (e.g. 'max_concurrency', 'timeout', 'retries').
+
+    Returns:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+
+    Raises:
+        PlantDataLoadError: If the data of any plant could not be loaded.
+    """
+
+    return asyncio.run(load_data_ind_park_async(plant_parameters, sources, **kwargs))
+
+def refresh_data_ind_park(data_ind_park, sources: t.Mapping[str, DataSource], **kwargs) -> list:
+    """
+    Load the data of the plants from their sources concurrently ('load_plants_data') and append the new
+    samples to the Process Data objects ('append_data'). The plants whose sources fail keep their data.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        sources (dict): Source of the data of each plant name.
+        **kwargs: Arguments of 'load_plants_data' (e.g. 'max_concurrency', 'timeout', 'retries').
+
+    Returns:
+        refreshed_plants (list): Names of the plants with new samples.
+    """
+
+    plants_data = asyncio.run(load_plants_data(sources, **kwargs))
+
+    refreshed_plants = []
+    for plant_name, result in plants_data.items():
+        if isinstance(result, BaseException):
+            logger.error(f"Refresh of the data of {plant_name} failed: {result!r}")
+            continue
+        if data_ind_park[plant_name].append_data(result):
+            refreshed_plants.append(plant_name)
+
+    return refreshed_plants
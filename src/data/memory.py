@@ -0,0 +1,151 @@
+import logging
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Memory kinds accounted for each plant
+MEMORY_KINDS = ('data', 'pyramid', 'derived', 'cached_results')
+
+def estimate_size(obj: t.Any, _seen: set = None) -> int:
+    """
+    Estimate the memory used by an object and the objects it contains, in bytes. DataFrames, Series and
+    arrays are measured with their buffers (including the strings of object columns), and dictionaries,
+    lists, tuples and sets are walked recursively. Objects referenced more than once are counted once.
+
+    Args:
+        obj (Any): Object to be measured (e.g. derived table, figure dictionary).
+
+    Returns:
+        size (int): Estimated size in bytes.
+    """
+
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        memory_usage = obj.memory_usage(deep=True)
+        return int(memory_usage.sum() if isinstance(memory_usage, pd.Series) else memory_usage)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj.ravel())
+        return sys.getsizeof(obj) if obj.base is None else obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(key, _seen) + estimate_size(value, _seen)
+                                        for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj)
+    if hasattr(obj, 'to_plotly_json'):
+        return estimate_size(obj.to_plotly_json(), _seen)
+
+    return sys.getsizeof(obj)
+
+def get_plant_memory_usage(process_data_obj, result_cache=None) -> dict:
+    """
+    Return the memory used by a plant: raw data, multi-resolution pyramid, derived tables (statistics and
+    figure skeletons) and cached results of the callbacks (figures) in the in-process result cache.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object of the plant.
+        result_cache (ResultCache, optional): Result cache of the callbacks.
+
+    Returns:
+        memory_usage (dict): Dictionary with the bytes of each kind ('data', 'pyramid', 'derived' and
+                            'cached_results'), the 'total' bytes, and the plant state ('loaded' and
+                            'idle_seconds').
+    """
+
+    memory_usage = process_data_obj.memory_usage()
+    memory_usage['cached_results'] = 0
+    if result_cache is not None:
+        memory_usage['cached_results'] = result_cache.memory_usage(process_data_obj.plant_name)
+    memory_usage['total'] = sum(memory_usage[kind] for kind in MEMORY_KINDS)
+    memory_usage['loaded'] = process_data_obj.is_loaded
+    memory_usage['idle_seconds'] = time.monotonic() - process_data_obj.last_access
+
+    return memory_usage
+
+def get_memory_report(data_ind_park, result_cache=None, budget_bytes: int = 0) -> dict:
+    """
+    Return the memory usage of all the plants of the industrial park ('get_plant_memory_usage').
+
+    Returns:
+        memory_report (dict): Dictionary with the keys 'plants' (memory usage of each plant), 'total_bytes'
+                            and 'budget_bytes'.
+    """
+
+    plants = {obj.plant_name: get_plant_memory_usage(obj, result_cache) for obj in data_ind_park.process_data_objs}
+    return {
+        'plants': plants,
+        'total_bytes': sum(usage['total'] for usage in plants.values()),
+        'budget_bytes': budget_bytes,
+    }
+
+def enforce_memory_budget(data_ind_park, budget_bytes: int, idle_seconds: float, spill_directory: t.Union[str, Path],
+                        result_cache=None) -> list:
+    """
+    Free memory until the plants of the industrial park fit the budget. First, the derived tables and cached
+    results of the plants are removed (least recently accessed plants first), as they are recalculated when
+    needed. Then, the raw data of the plants idle for more than 'idle_seconds' is unloaded (saved in the spill
+    directory and loaded again when the plant is accessed).
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        budget_bytes (int): Memory budget of the plants. No memory is freed if it is 0.
+        idle_seconds (float): Minimum time since the last access of the plants to be unloaded.
+        spill_directory (str or Path): Directory of the data of the unloaded plants.
+        result_cache (ResultCache, optional): Result cache of the callbacks.
+
+    Returns:
+        evictions (list): List of the tuples (plant name, 'derived' or 'plant') of the evictions.
+    """
+
+    if budget_bytes <= 0:
+        return []
+
+    usage = {obj.plant_name: get_plant_memory_usage(obj, result_cache)['total'] for obj in data_ind_park.process_data_objs}
+    total_bytes = sum(usage.values())
+    evictions = []
+
+    # Least recently accessed plants first
+    process_data_objs = sorted(data_ind_park.process_data_objs, key=lambda obj: obj.last_access)
+
+    for process_data_obj in process_data_objs:
+        if total_bytes <= budget_bytes:
+            break
+        if not process_data_obj.derived_cache and result_cache is None:
+            continue
+
+        process_data_obj.evict_derived_cache()
+        if result_cache is not None:
+            result_cache.invalidate_plant(process_data_obj.plant_name)
+
+        new_usage = get_plant_memory_usage(process_data_obj, result_cache)['total']
+        total_bytes -= usage[process_data_obj.plant_name] - new_usage
+        usage[process_data_obj.plant_name] = new_usage
+        evictions.append((process_data_obj.plant_name, 'derived'))
+
+    now = time.monotonic()
+    for process_data_obj in process_data_objs:
+        if total_bytes <= budget_bytes:
+            break
+        if not process_data_obj.is_loaded or now - process_data_obj.last_access < idle_seconds:
+            continue
+
+        process_data_obj.unload_data(spill_directory)
+        total_bytes -= usage[process_data_obj.plant_name]
+        evictions.append((process_data_obj.plant_name, 'plant'))
+
+    if total_bytes > budget_bytes:
+        logger.warning(f"Memory of the plants ({total_bytes / 2**20:.1f} MB) is over the budget "
+                    f"({budget_bytes / 2**20:.1f} MB) after the evictions")
+
+    return evictions
@@ -1,7 +1,18 @@
 import datetime
+import hashlib
+import os
+import pickle
+import threading
+import time
+import uuid
 import numpy as np
 import pandas as pd
 import typing as t
+from pathlib import Path
+
+from data.frame_buffer import FrameBuffer
+from data.memory import estimate_size
+from data.pyramid import ResolutionPyramid
 
 class ProcessData():
     """
@@ -19,16 +30,51 @@ class ProcessData():
                         attribute.
         data (pd.DataFrame, optional): DataFrame with columns named on the circuit names and timestamp index.
                                     Obs.: If data is not given, the dataset will be generated using the
-                                    '_create_sample_data' method.
+                                    '_create_sample_data' method. The data is stored in a chunked buffer
+                                    ('FrameBuffer'), so the appended samples are consolidated when it is read.
+        last_timestamp (pd.Timestamp): Timestamp of the last sample of the data.
+        pyramid_levels (list, optional): List of time frequencies (e.g. '1H', '10min') of the multi-resolution
+                                    pyramid precomputed from the data. If not given, no pyramid is created.
+        pyramid (ResolutionPyramid): Multi-resolution pyramid (min/max/mean) of the data, or None.
+        derived_cache (dict): Dictionary with tables derived from the data (e.g. histograms of a month),
+                            which are reused while the data does not change.
+        data_version (str): Fingerprint of the data content, which changes whenever the data changes.
+                            See 'get_data_version' for the version of the samples up to a timestamp.
+        last_access (float): Time (monotonic clock) of the last access to the plant by the requests.
+        is_loaded (bool): False if the data was unloaded ('unload_data') and was not accessed since then.
+        is_derived_evicted (bool): True if the derived tables were evicted ('evict_derived_cache') and the plant
+                                was not accessed since then.
+        is_sample_data (bool): True if the data was generated ('_create_sample_data') and not replaced since then.
+
+    Methods:
+        get_data_since(start): Return the samples from 'start' onwards, without consolidating the data.
+        get_data_version(until): Return the version of the samples up to the given timestamp.
+        get_derived(key, func, update): Return the derived table stored with 'key', calculating it with 'func'
+                                        if needed.
+        clear_derived_cache(): Remove all the derived tables.
+        evict_derived_cache(): Remove all the derived tables to free memory until the next access.
+        update_data(data): Replace the data, updating the derived objects and notifying the data listeners.
+        append_data(new_data): Append new samples to the data, updating the derived objects incrementally.
+        add_data_listener(listener): Register a function called with the plant name (and the timestamp of the
+                                    first appended sample) when the data changes.
+        touch(): Update the time of the last access to the plant.
+        memory_usage(): Return the memory used by the data, the pyramid and the derived tables.
+        unload_data(directory): Save the data in the directory and free its memory until the next access.
     """
     def __init__(self,
                 plant_name: str,
                 circuit_names: t.Sequence[str],
                 specifications_limits: dict,
                 ppk_goals: dict,
-                data: pd.DataFrame = None):
+                data: pd.DataFrame = None,
+                pyramid_levels: t.Sequence[str] = None):
         self.plant_name = plant_name
 
+        self._spill_path = None
+        self._load_lock = threading.Lock()
+        self.last_access = time.monotonic()
+        self.is_derived_evicted = False
+
         self.data = data
         self.specifications_limits = specifications_limits
         self.ppk_goals = ppk_goals
@@ -41,11 +87,276 @@ class ProcessData():
         self._check_for_specifications_limits()
         self._check_for_ppk_goals()
 
+        self.is_sample_data = data is None
         if data is None:
             self.data = self._create_sample_data()
 
         self._check_for_data_columns()
 
+        self.pyramid_levels = pyramid_levels
+        self.pyramid = None
+        if pyramid_levels:
+            self.pyramid = ResolutionPyramid(self.data, pyramid_levels)
+
+        self.derived_cache = {}
+        self._derived_updates = {}
+        self.data_version = self._compute_data_version()
+        self._appended_versions = []
+        self._data_listeners = []
+
+    def _get_data_buffer(self) -> t.Optional[FrameBuffer]:
+        # The buffer is read once, as another thread may unload it meanwhile ('_spill_path' is set before the
+        # data is removed)
+        data_buffer = self._data_buffer
+        if data_buffer is None and self._spill_path is not None:
+            data_buffer = self._load_spilled_data()
+        return data_buffer
+
+    @property
+    def data(self) -> pd.DataFrame:
+        data_buffer = self._get_data_buffer()
+        return data_buffer.frame if data_buffer is not None else None
+
+    @data.setter
+    def data(self, data: pd.DataFrame):
+        self._data_buffer = FrameBuffer(data) if data is not None else None
+        self._spill_path = None
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        return self._get_data_buffer().last_index
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data_buffer is not None
+
+    def get_data_since(self, start) -> pd.DataFrame:
+        """
+        Return the samples from 'start' onwards. The samples appended since the last read of the data are not
+        consolidated, so the cost depends only on the number of returned samples (e.g. live updates).
+        """
+        return self._get_data_buffer().tail(start)
+
+    def get_data_version(self, until=None) -> str:
+        """
+        Return the version of the samples up to the timestamp 'until', which only changes when samples up to
+        'until' are appended or the data is replaced. Results depending only on these samples (e.g. a figure
+        of a past time range) can be reused after newer samples are appended.
+
+        Args:
+            until (optional): Timestamp of the last sample. Default: all the samples ('data_version').
+
+        Returns:
+            data_version (str): Version of the samples.
+        """
+        if until is not None:
+            until = pd.Timestamp(until)
+            for since, data_version in self._appended_versions:
+                if since > until:
+                    return data_version
+        return self.data_version
+
+    def touch(self):
+        """
+        Update the time of the last access to the plant, used to select the idle plants to be unloaded.
+        """
+        self.last_access = time.monotonic()
+        self.is_derived_evicted = False
+
+    def memory_usage(self) -> dict:
+        """
+        Return the memory used by the plant, in bytes: raw data ('data'), multi-resolution pyramid ('pyramid')
+        and derived tables ('derived', e.g. statistics and figure skeletons).
+        """
+        data_buffer = self._data_buffer
+        return {
+            'data': estimate_size(data_buffer.frames) if data_buffer is not None else 0,
+            'pyramid': self.pyramid.memory_usage() if self.pyramid is not None else 0,
+            'derived': estimate_size(self.derived_cache),
+        }
+
+    def unload_data(self, directory: t.Union[str, Path]):
+        """
+        Save the data in a pickle file in the directory and free the memory of the data, the pyramid and the
+        derived tables. The data is loaded again (and the pyramid recalculated) when it is accessed. The data
+        version does not change, as the data content is the same.
+
+        Args:
+            directory (str or Path): Directory of the saved data.
+        """
+        with self._load_lock:
+            if self._data_buffer is None:
+                return
+
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            # The directory is shared by the server workers (which may unload the same plant), so the file name
+            # is unique for each process and object
+            plant_hash = hashlib.sha1(self.plant_name.encode('utf-8')).hexdigest()[:16]
+            spill_path = directory / f"{plant_hash}-{os.getpid()}-{uuid.uuid4().hex[:8]}.pkl"
+            with open(spill_path, 'wb') as f:
+                pickle.dump(self._data_buffer.frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            self._spill_path = spill_path
+            self._data_buffer = None
+            self.pyramid = None
+            self.clear_derived_cache()
+
+    def _load_spilled_data(self) -> FrameBuffer:
+        with self._load_lock:
+            if self._data_buffer is not None:
+                return self._data_buffer
+
+            with open(self._spill_path, 'rb') as f:
+                data = pickle.load(f)
+            if self.pyramid_levels:
+                self.pyramid = ResolutionPyramid(data, self.pyramid_levels)
+
+            self._data_buffer = FrameBuffer(data)
+            self._spill_path.unlink(missing_ok=True)
+            self._spill_path = None
+            return self._data_buffer
+
+    def _compute_data_version(self) -> str:
+        """
+        Compute the fingerprint of the data content (index, columns and values), so identical data loaded
+        in different processes have the same version.
+        """
+        data_hash = pd.util.hash_pandas_object(self.data, index=True).to_numpy()
+        fingerprint = hashlib.sha1(data_hash.tobytes())
+        fingerprint.update(",".join(map(str, self.data.columns)).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def update_data(self, data: pd.DataFrame):
+        """
+        Replace the data of the object. The derived tables are removed, the pyramid is recalculated,
+        the data version is updated and the data listeners are notified.
+
+        Args:
+            data (pd.DataFrame): New DataFrame with columns named on the circuit names and timestamp index.
+        """
+        self.data = data
+        self.is_sample_data = False
+        self._check_for_data_columns()
+
+        if self.pyramid_levels:
+            self.pyramid = ResolutionPyramid(self.data, self.pyramid_levels)
+
+        self.clear_derived_cache()
+        self.data_version = self._compute_data_version()
+        self._appended_versions = []
+        self._notify_data_listeners()
+
+    def append_data(self, new_data: pd.DataFrame) -> bool:
+        """
+        Append new samples (e.g. received from a live source) to the data. Only the samples newer than the
+        last timestamp of the data are appended. The cost does not depend on the data size: the samples are
+        appended to the chunked buffer of the data, only the last bucket of each pyramid level is aggregated
+        again, the derived tables are updated with their update functions (or removed, see 'get_derived'),
+        the data version is updated from the previous version and the appended samples, and the data
+        listeners are notified with the timestamp of the first appended sample.
+
+        Args:
+            new_data (pd.DataFrame): DataFrame with the new samples, with columns named on the circuit names
+                                    and timestamp index.
+
+        Returns:
+            appended (bool): True if any sample was appended.
+        """
+        set_circ_names = set(self.circuit_names)
+        set_data_columns = set(new_data.columns)
+        if set_circ_names != set_data_columns:
+            raise OSError("The columns of the new data do not match the circuit(s): ", ", ".join(set_circ_names.symmetric_difference(set_data_columns)))
+
+        data_buffer = self._get_data_buffer()
+        new_data = new_data.sort_index()
+        if len(data_buffer):
+            new_data = new_data.loc[new_data.index > data_buffer.last_index]
+        if len(new_data) == 0:
+            return False
+
+        new_data = new_data[data_buffer.columns]
+        data_buffer.append(new_data)
+        since = new_data.index[0]
+
+        if self.pyramid is not None:
+            self.pyramid.update(data_buffer.tail(self.pyramid.get_update_start(since)), since=since)
+
+        self._update_derived_cache(new_data.index)
+        new_data_hash = pd.util.hash_pandas_object(new_data, index=True).to_numpy()
+        fingerprint = hashlib.sha1(self.data_version.encode('utf-8'))
+        fingerprint.update(new_data_hash.tobytes())
+        self._appended_versions.append((since, self.data_version))
+        self.data_version = fingerprint.hexdigest()
+        self._notify_data_listeners(since)
+
+        return True
+
+    def add_data_listener(self, listener: t.Callable[[str], None]):
+        """
+        Register a function that is called with the plant name and the timestamp of the first appended
+        sample (None if the data was replaced) whenever the data changes (e.g. to invalidate cached results).
+        A listener already registered is not added again.
+        """
+        if listener not in self._data_listeners:
+            self._data_listeners.append(listener)
+
+    def _notify_data_listeners(self, since=None):
+        for listener in self._data_listeners:
+            listener(self.plant_name, since)
+
+    def get_derived(self, key: t.Hashable, func: t.Callable[[], t.Any],
+                    update: t.Callable[[t.Any, pd.DatetimeIndex], t.Any] = None) -> t.Any:
+        """
+        Return the table derived from the data stored in the 'derived_cache' attribute with the given key.
+        If the key is not stored yet, the table is calculated with 'func' and stored.
+
+        Args:
+            key (Hashable): Key of the derived table (e.g. ('histograms', month, n_bins)).
+            func (Callable): Function without arguments that calculates the derived table.
+            update (Callable, optional): Function called with the derived table and the index of the appended
+                                        samples when samples are appended ('append_data'), which returns the
+                                        updated table, or None if the table must be calculated again.
+                                        If not given, the table is removed when samples are appended.
+
+        Returns:
+            derived (Any): Derived table.
+        """
+        if key not in self.derived_cache:
+            self.derived_cache[key] = func()
+            if update is not None:
+                self._derived_updates[key] = update
+        return self.derived_cache[key]
+
+    def _update_derived_cache(self, new_index: pd.DatetimeIndex):
+        """
+        Update the derived tables after new samples were appended, removing the tables without update function
+        and the ones affected by the appended samples.
+        """
+        for key in list(self.derived_cache):
+            update = self._derived_updates.get(key)
+            derived = update(self.derived_cache[key], new_index) if update is not None else None
+            if derived is None:
+                self.derived_cache.pop(key, None)
+                self._derived_updates.pop(key, None)
+            else:
+                self.derived_cache[key] = derived
+
+    def clear_derived_cache(self):
+        """
+        Remove all the tables derived from the data. Must be called when the data changes.
+        """
+        self.derived_cache.clear()
+        self._derived_updates.clear()
+
+    def evict_derived_cache(self):
+        """
+        Remove all the tables derived from the data to free memory (e.g. by the memory budget). The tables
+        are not precomputed again by the warm-up until the plant is accessed.
+        """
+        self.clear_derived_cache()
+        self.is_derived_evicted = True
+
     def _check_for_specifications_limits(self):
         """
         Check if all the circuits listed in the 'circuit_names' attribute has an related specification
@@ -143,7 +454,10 @@ class SetProcessData():
         process_data_obj (list): List with multiple ProcessData objects.
 
     Methods:
-        __getitem__(plant_name): Return the ProcessData object for given 'plant_name'
+        __getitem__(plant_name): Return the ProcessData object for given 'plant_name' (updating the time of
+                                its last access)
+        get(plant_name, touch): Return the ProcessData object for given 'plant_name', updating the time of
+                                its last access only if 'touch' is True.
 
     """
     def __init__(self, process_data_objs):
@@ -155,5 +469,11 @@ class SetProcessData():
         self.list_plant_names = [obj.plant_name for obj in process_data_objs]
 
     def __getitem__(self, plant_name):
+        return self.get(plant_name)
+
+    def get(self, plant_name, touch: bool = True):
         idx_plant_name = self.list_plant_names.index(plant_name)
-        return self.process_data_objs[idx_plant_name]
+        process_data_obj = self.process_data_objs[idx_plant_name]
+        if touch:
+            process_data_obj.touch()
+        return process_data_obj
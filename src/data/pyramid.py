@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import typing as t
+
+from data.frame_buffer import FrameBuffer
+from data.memory import estimate_size
+
+class ResolutionPyramid():
+    """
+    Create a multi-resolution pyramid of the process data: for each resolution level (time frequency),
+    the samples of each circuit are aggregated into their minimum, maximum and average values.
+    Levels that do not reduce the number of samples of the data are discarded.
+
+    ...
+
+    Attributes:
+        levels (list): List with the time frequencies of the pyramid levels, from the finest to the coarsest.
+        tables (dict): Dictionary with a DataFrame for each level, with columns ('circuit name', 'min'|'max'|'mean')
+                    and indexed by the start timestamp of the buckets. The tables are stored in chunked
+                    buffers ('FrameBuffer'), so the updates do not copy the whole tables.
+
+    Methods:
+        memory_usage(): Return the memory used by the tables, in bytes.
+        get_update_start(since): Return the first timestamp of the samples needed by 'update'.
+        update(data, since): Update the levels with the samples appended to the data since the given timestamp.
+        select_level(start_date, end_date, max_points): Return the finest level fitting the point budget.
+        get_range(circ, start_date, end_date, level): Return the aggregated values of a circuit.
+        get_min_max_points(circ, start_date, end_date, level): Return the bucket extremes of a circuit as points.
+    """
+    def __init__(self, data: pd.DataFrame, levels: t.Sequence[str]):
+
+        tables = {}
+        for level in levels:
+            table = self._aggregate(data, level)
+            if len(table) < len(data):
+                tables[level] = table
+
+        # Sorting the levels from the finest (more buckets) to the coarsest
+        self.levels = sorted(tables.keys(), key=lambda level: len(tables[level]), reverse=True)
+        self._buffers = {level: FrameBuffer(table) for level, table in tables.items()}
+
+    @property
+    def tables(self) -> dict:
+        return {level: self._buffers[level].frame for level in self.levels}
+
+    def memory_usage(self) -> int:
+        """
+        Return the memory used by the tables of the levels, in bytes (without consolidating the buffers).
+        """
+        return estimate_size([self._buffers[level].frames for level in self.levels])
+
+    @staticmethod
+    def _aggregate(data: pd.DataFrame, level: str) -> pd.DataFrame:
+        """
+        Aggregate the samples of each circuit into minimum, maximum and average values for the given level.
+        """
+
+        table = data.resample(level).agg(['min', 'max', 'mean'])
+        return table.dropna(how='all')
+
+    def _get_level_update_start(self, level: str, since: pd.Timestamp) -> pd.Timestamp:
+        # The last bucket of the level may be incomplete, so it is aggregated again
+        last_index = self._buffers[level].last_index
+        return min(last_index, since.floor(level)) if last_index is not None else since.floor(level)
+
+    def get_update_start(self, since) -> t.Optional[pd.Timestamp]:
+        """
+        Return the first timestamp of the samples needed to update the levels ('update') after new samples
+        were appended since the given timestamp (start of the last bucket of the coarsest level).
+        """
+
+        since = pd.Timestamp(since)
+        return min((self._get_level_update_start(level, since) for level in self.levels), default=since)
+
+    def update(self, data: pd.DataFrame, since):
+        """
+        Update the levels after new samples were appended to the data. Only the last bucket of each level
+        (which may be incomplete) and the new buckets are aggregated again and replaced in the tables, so
+        the cost is proportional to the appended samples and not to the data size.
+
+        Args:
+            data (pd.DataFrame): Data with the appended samples (at least the samples from the timestamp
+                                returned by 'get_update_start').
+            since: Timestamp of the first appended sample.
+        """
+
+        since = pd.Timestamp(since)
+
+        for level in self.levels:
+            start = self._get_level_update_start(level, since)
+            self._buffers[level].append(self._aggregate(data.loc[start:], level))
+
+    def count_buckets(self, start_date, end_date, level: str) -> int:
+        """
+        Count the number of buckets of the given level between 'start_date' and 'end_date'.
+        """
+
+        index = self._buffers[level].frame.index
+        return int(index.searchsorted(pd.Timestamp(end_date), side='right') -
+                   index.searchsorted(pd.Timestamp(start_date), side='left'))
+
+    def select_level(self, start_date, end_date, max_points: int) -> t.Optional[str]:
+        """
+        Select the finest level which fits the point budget (two points, minimum and maximum, per bucket)
+        between 'start_date' and 'end_date'. If no level fits the budget, the coarsest level is returned.
+
+        Args:
+            start_date: Start of the time range.
+            end_date: End of the time range.
+            max_points (int): Point budget.
+
+        Returns:
+            level (str): Time frequency of the selected level, or None if the pyramid has no levels.
+        """
+
+        for level in self.levels:
+            if 2 * self.count_buckets(start_date, end_date, level) <= max_points:
+                return level
+
+        return self.levels[-1] if self.levels else None
+
+    def get_range(self, circ: str, start_date, end_date, level: str) -> pd.DataFrame:
+        """
+        Return the aggregated values ('min', 'max' and 'mean' columns) of a circuit between
+        'start_date' and 'end_date' for the given level.
+        """
+
+        table = self._buffers[level].frame
+        start = table.index.searchsorted(pd.Timestamp(start_date), side='left')
+        end = table.index.searchsorted(pd.Timestamp(end_date), side='right')
+
+        return table[circ].iloc[start:end]
+
+    def get_min_max_points(self, circ: str, start_date, end_date, level: str) -> t.Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Return the minimum and maximum values of each bucket of a circuit as interleaved points,
+        so the extreme values of the samples are preserved in the plot.
+
+        Returns:
+            x (pd.DatetimeIndex): Start timestamps of the buckets (repeated for minimum and maximum).
+            y (np.ndarray): Interleaved minimum and maximum values.
+        """
+
+        table_range = self.get_range(circ, start_date, end_date, level).dropna()
+
+        x = table_range.index.repeat(2)
+        y = np.column_stack([table_range['min'].to_numpy(), table_range['max'].to_numpy()]).reshape(-1)
+
+        return x, y
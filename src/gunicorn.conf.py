@@ -0,0 +1,21 @@
+"""
+Configuration of the gunicorn server. The values are given by the 'config.app_config' and
+'config.server_config' objects.
+
+Example of command (from the 'src' directory):
+```
+gunicorn --config gunicorn.conf.py
+```
+"""
+from app_config import config
+
+wsgi_app = 'wsgi:create_server()'
+bind = f'{config.app_config.host}:{config.app_config.port}'
+workers = config.server_config.workers
+threads = config.server_config.threads
+timeout = config.server_config.timeout
+preload_app = True
+
+def post_fork(server, worker):
+    from wsgi import start_worker_scheduler
+    start_worker_scheduler()
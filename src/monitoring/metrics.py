@@ -0,0 +1,336 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+import typing as t
+
+from flask import g, has_request_context
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 5e7)
+ROWS_BUCKETS = (1e2, 1e3, 1e4, 1e5, 1e6, 1e7)
+
+# Histograms exposed in the '/metrics' route: name -> (description, buckets)
+HISTOGRAMS = {
+    'callback_seconds': ('Duration of the callbacks.', SECONDS_BUCKETS),
+    'stage_seconds': ('Duration of the stages (calculation, figure build and serialization) of the callbacks.',
+                    SECONDS_BUCKETS),
+    'payload_bytes': ('Size of the responses of the instrumented callbacks.', BYTES_BUCKETS),
+    'rows_processed': ('Number of data rows processed by the stages of the callbacks.', ROWS_BUCKETS),
+}
+
+# Counters exposed in the '/metrics' route: name -> description
+COUNTERS = {
+    'result_cache_requests': 'Requests to the result cache of the callbacks, by result (hit or miss).',
+    'memory_evictions': 'Evictions of the memory budget, by plant and kind (derived tables or plant data).',
+    'alerts': 'New (deduplicated) alerts of the alerting engine, by plant and rule.',
+}
+
+# Gauges exposed in the '/metrics' route: name -> description
+GAUGES = {
+    'plant_memory_bytes': 'Memory used by the plants, by kind (data, pyramid, derived tables and cached results).',
+    'memory_budget_bytes': 'Memory budget of the plants (0 if disabled).',
+}
+
+# Prefix of the metric names in the '/metrics' route
+METRICS_PREFIX = 'capability_'
+
+# Name of the callback being executed, used as label of the stages
+_current_callback = contextvars.ContextVar('current_callback', default='none')
+
+class PayloadMetrics():
+    """
+    Create a new object that accumulates the payload size of the responses of a callback and the encode time
+    of its outputs. The responses include the results of the cache, while the outputs are only encoded when
+    they are calculated, so both are counted separately.
+
+    ...
+
+    Attributes:
+        callback_name (str): Name of the callback related to the metrics.
+        calls (int): Number of recorded responses.
+        last_payload_bytes (int): Size of the last response.
+        total_payload_bytes (int): Total size of the responses.
+        encodes (int): Number of recorded encodes.
+        last_encode_seconds (float): Encode time of the last output.
+        total_encode_seconds (float): Total encode time of the outputs.
+    """
+    def __init__(self, callback_name: str):
+        self.callback_name = callback_name
+        self.calls = 0
+        self.last_payload_bytes = 0
+        self.total_payload_bytes = 0
+        self.encodes = 0
+        self.last_encode_seconds = 0.0
+        self.total_encode_seconds = 0.0
+
+    def record_payload(self, payload_bytes: int):
+        self.calls += 1
+        self.last_payload_bytes = payload_bytes
+        self.total_payload_bytes += payload_bytes
+
+    def record_encode(self, encode_seconds: float):
+        self.encodes += 1
+        self.last_encode_seconds = encode_seconds
+        self.total_encode_seconds += encode_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'last_payload_bytes': self.last_payload_bytes,
+            'avg_payload_bytes': self.total_payload_bytes / self.calls if self.calls else 0.0,
+            'encodes': self.encodes,
+            'last_encode_seconds': self.last_encode_seconds,
+            'avg_encode_seconds': self.total_encode_seconds / self.encodes if self.encodes else 0.0,
+        }
+
+_payload_metrics = {}
+_lock = threading.Lock()
+
+def _get_payload_metrics(callback_name: str) -> PayloadMetrics:
+    if callback_name not in _payload_metrics:
+        _payload_metrics[callback_name] = PayloadMetrics(callback_name)
+    return _payload_metrics[callback_name]
+
+def record_payload(callback_name: str, payload_bytes: int):
+    """
+    Record the payload size of a response of the given callback.
+
+    Args:
+        callback_name (str): Name of the callback.
+        payload_bytes (int): Size of the response, in bytes.
+    """
+    with _lock:
+        _get_payload_metrics(callback_name).record_payload(payload_bytes)
+
+    observe('payload_bytes', payload_bytes, callback=callback_name)
+    logger.debug("Callback '%s': response of %d bytes", callback_name, payload_bytes)
+
+def record_encode(callback_name: str, encode_seconds: float):
+    """
+    Record the encode time of the outputs of the given callback (stage 'serialize').
+
+    Args:
+        callback_name (str): Name of the callback.
+        encode_seconds (float): Time spent to encode the outputs, in seconds.
+    """
+    with _lock:
+        _get_payload_metrics(callback_name).record_encode(encode_seconds)
+
+    observe('stage_seconds', encode_seconds, callback=callback_name, stage='serialize')
+
+def get_payload_metrics() -> dict:
+    """
+    Return the payload metrics of all callbacks, with the callback names as keys.
+    """
+    with _lock:
+        return {name: metrics.to_dict() for name, metrics in _payload_metrics.items()}
+
+class Histogram():
+    """
+    Create a new histogram with cumulative buckets (as the Prometheus histograms).
+
+    ...
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, in increasing order.
+        bucket_counts (list): Number of observations of each bucket (not cumulative).
+        count (int): Number of observations.
+        sum (float): Sum of the observed values.
+    """
+    def __init__(self, buckets: t.Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list:
+        counts, total = [], 0
+        for bucket_count in self.bucket_counts:
+            total += bucket_count
+            counts.append(total)
+        return counts
+
+_histograms = {}
+_counters = {}
+_gauges = {}
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def observe(name: str, value: float, **labels):
+    """
+    Record a value in the histogram 'name' (see 'HISTOGRAMS') with the given labels.
+    """
+    key = (name, _labels_key(labels))
+    with _lock:
+        if key not in _histograms:
+            _histograms[key] = Histogram(HISTOGRAMS[name][1])
+        _histograms[key].observe(value)
+
+def increment(name: str, value: float = 1, **labels):
+    """
+    Increment the counter 'name' (see 'COUNTERS') with the given labels.
+    """
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name: str, value: float, **labels):
+    """
+    Set the value of the gauge 'name' (see 'GAUGES') with the given labels.
+    """
+    key = (name, _labels_key(labels))
+    with _lock:
+        _gauges[key] = value
+
+def get_current_callback() -> str:
+    """
+    Return the name of the callback being executed ('none' outside the instrumented callbacks).
+    """
+    return _current_callback.get()
+
+def instrument_callback(callback_name: str):
+    """
+    Decorator of the callbacks that records their duration ('callback_seconds' histogram) and sets the
+    callback name used as label of the stages executed by the callback. In a request, the callback name is
+    also kept in the request context, so the size of the response is recorded ('register_payload_metrics' in
+    'server/metrics.py'), including the responses of the result cache.
+
+    Args:
+        callback_name (str): Name of the callback in the metrics.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_callback.set(callback_name)
+            if has_request_context():
+                g.instrumented_callback = callback_name
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe('callback_seconds', time.perf_counter() - start_time, callback=callback_name)
+                _current_callback.reset(token)
+        return wrapper
+    return decorator
+
+@contextlib.contextmanager
+def stage_timer(stage: str, rows: int = None):
+    """
+    Context manager that records the duration of a stage ('stage_seconds' histogram) and, if given, the number
+    of processed rows ('rows_processed' histogram), labeled by the stage and the current callback.
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        callback_name = get_current_callback()
+        observe('stage_seconds', time.perf_counter() - start_time, callback=callback_name, stage=stage)
+        if rows is not None:
+            observe('rows_processed', rows, callback=callback_name, stage=stage)
+
+def instrument_stage(stage: str = None, rows: t.Callable[[dict], int] = None):
+    """
+    Decorator that records the duration of a function as a stage of the current callback ('stage_timer').
+
+    Args:
+        stage (str, optional): Name of the stage. Default: name of the function.
+        rows (Callable, optional): Function that receives the arguments of the call (dictionary with the
+                                argument names as keys) and returns the number of processed rows.
+    """
+
+    def decorator(func):
+        stage_name = stage or func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            n_rows = None
+            if rows is not None:
+                n_rows = rows(signature.bind(*args, **kwargs).arguments)
+            with stage_timer(stage_name, rows=n_rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    label_texts = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        label_texts.append(f'{name}="{value}"')
+    return '{' + ','.join(label_texts) + '}'
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def render_prometheus() -> str:
+    """
+    Render the histograms, counters and gauges in the Prometheus text exposition format.
+
+    Returns:
+        metrics_text (str): Metrics in the Prometheus text format.
+    """
+
+    with _lock:
+        histograms = {key: (histogram.buckets, histogram.cumulative_counts(), histogram.count, histogram.sum)
+                    for key, histogram in _histograms.items()}
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+
+    lines = []
+    for name, (description, _) in HISTOGRAMS.items():
+        metric_name = METRICS_PREFIX + name
+        lines += [f'# HELP {metric_name} {description}', f'# TYPE {metric_name} histogram']
+        for (key_name, labels), (buckets, cumulative_counts, count, total) in sorted(histograms.items()):
+            if key_name != name:
+                continue
+            for upper_bound, cumulative_count in zip(buckets, cumulative_counts):
+                bucket_labels = labels + (('le', _format_value(upper_bound)),)
+                lines.append(f'{metric_name}_bucket{_format_labels(bucket_labels)} {cumulative_count}')
+            lines.append(f'{metric_name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+            lines.append(f'{metric_name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{metric_name}_count{_format_labels(labels)} {count}')
+
+    for name, description in COUNTERS.items():
+        metric_name = METRICS_PREFIX + name
+        lines += [f'# HELP {metric_name}_total {description}', f'# TYPE {metric_name}_total counter']
+        for (key_name, labels), value in sorted(counters.items()):
+            if key_name == name:
+                lines.append(f'{metric_name}_total{_format_labels(labels)} {_format_value(value)}')
+
+    for name, description in GAUGES.items():
+        metric_name = METRICS_PREFIX + name
+        lines += [f'# HELP {metric_name} {description}', f'# TYPE {metric_name} gauge']
+        for (key_name, labels), value in sorted(gauges.items()):
+            if key_name == name:
+                lines.append(f'{metric_name}{_format_labels(labels)} {_format_value(value)}')
+
+    return '\n'.join(lines) + '\n'
+
+def reset_metrics():
+    """
+    Remove all the recorded metrics (payload metrics, histograms, counters and gauges).
+    """
+    with _lock:
+        _payload_metrics.clear()
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
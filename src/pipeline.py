@@ -1,27 +1,117 @@
-from data.process_data import ProcessData, SetProcessData
+import contextlib
+import threading
+
 from app_config import config
 
-# Plant A
-data_A = ProcessData(
-                        plant_name='Plant A',
-                        circuit_names=['Circuit 1', 'Circuit 2', 'Circuit 3'],
-                        specifications_limits = {'Circuit 1': {'LSL': 60.0, 'USL': 70.0},
-                                                'Circuit 2': {'LSL': 90.0, 'USL': 100.0},
-                                                'Circuit 3': {'LSL': 80.0, 'USL': 85.0}},
-                        ppk_goals = {'Circuit 1': 1.0,
-                                'Circuit 2': 1.0,
-                                'Circuit 3': 1.33}
-                        )
-
-# Plant B
-data_B = ProcessData(
-                    plant_name='Plant B',
-                    circuit_names=['Circuit 1', 'Circuit 2'],
-                    specifications_limits = {'Circuit 1': {'LSL': 40.0, 'USL': 70.0},
-                                            'Circuit 2': {'LSL': 50.0, 'USL': 100.0}},
-                    ppk_goals = {'Circuit 1': 1.0,
-                                'Circuit 2': 1.0}
-                    )
-
-# Industrial park
-data_ind_park = SetProcessData(process_data_objs=[data_A, data_B])
+# Process Data objects of the industrial park, created on the first call of 'get_data_ind_park'
+_data_ind_park = None
+_data_ind_park_lock = threading.Lock()
+
+# Circuits, specification limits and Ppk goals of the plants of the industrial park
+PLANT_PARAMETERS = [
+    {
+        'plant_name': 'Plant A',
+        'circuit_names': ['Circuit 1', 'Circuit 2', 'Circuit 3'],
+        'specifications_limits': {'Circuit 1': {'LSL': 60.0, 'USL': 70.0},
+                                'Circuit 2': {'LSL': 90.0, 'USL': 100.0},
+                                'Circuit 3': {'LSL': 80.0, 'USL': 85.0}},
+        'ppk_goals': {'Circuit 1': 1.0,
+                    'Circuit 2': 1.0,
+                    'Circuit 3': 1.33},
+    },
+    {
+        'plant_name': 'Plant B',
+        'circuit_names': ['Circuit 1', 'Circuit 2'],
+        'specifications_limits': {'Circuit 1': {'LSL': 40.0, 'USL': 70.0},
+                                'Circuit 2': {'LSL': 50.0, 'USL': 100.0}},
+        'ppk_goals': {'Circuit 1': 1.0,
+                    'Circuit 2': 1.0},
+    },
+]
+
+def create_data_ind_park(sources: dict = None):
+    """
+    Create the Process Data objects of the plants of the industrial park (the data is generated or loaded
+    here, so this function is not called at import). Without sources, the sample data of each plant is
+    generated; otherwise the data of the plants is loaded concurrently from their sources
+    ('data.loaders.load_data_ind_park', with the values of 'config.loader_config').
+
+    Args:
+        sources (dict, optional): Source (DataSource) of the data of each plant name.
+
+    Returns:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+    """
+
+    plant_parameters = [dict(parameters, pyramid_levels=config.data_config.pyramid_levels)
+                        for parameters in PLANT_PARAMETERS]
+
+    if sources is not None:
+        from data.loaders import load_data_ind_park
+
+        with _create_parse_executor() as executor:
+            return load_data_ind_park(plant_parameters, sources, executor=executor, **_loader_kwargs())
+
+    from data.process_data import ProcessData, SetProcessData
+
+    # Industrial park
+    return SetProcessData(process_data_objs=[ProcessData(**parameters) for parameters in plant_parameters])
+
+def refresh_data_ind_park(sources: dict) -> list:
+    """
+    Append the new samples of the sources of the plants to the data of the industrial park used by the
+    application ('data.loaders.refresh_data_ind_park', with the values of 'config.loader_config').
+
+    Args:
+        sources (dict): Source (DataSource) of the data of each plant name.
+
+    Returns:
+        refreshed_plants (list): Names of the plants with new samples.
+    """
+
+    from data.loaders import refresh_data_ind_park as refresh
+
+    with _create_parse_executor() as executor:
+        return refresh(get_data_ind_park(), sources, executor=executor, **_loader_kwargs())
+
+def _loader_kwargs() -> dict:
+    return dict(max_concurrency=config.loader_config.loader_max_concurrency,
+                timeout=config.loader_config.loader_timeout_seconds,
+                retries=config.loader_config.loader_retries,
+                retry_backoff_seconds=config.loader_config.loader_retry_backoff_seconds)
+
+def _create_parse_executor():
+    # Process pool of the parsing of the payloads, or the default executor of the event loop (threads)
+    if config.loader_config.loader_parse_workers > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=config.loader_config.loader_parse_workers)
+    return contextlib.nullcontext()
+
+def get_data_ind_park():
+    """
+    Return the Process Data objects of the industrial park used by the application, which are created
+    ('create_data_ind_park') on the first call, unless they were set with 'set_data_ind_park'.
+
+    Returns:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+    """
+
+    global _data_ind_park
+    if _data_ind_park is None:
+        with _data_ind_park_lock:
+            if _data_ind_park is None:
+                _data_ind_park = create_data_ind_park()
+    return _data_ind_park
+
+def set_data_ind_park(data_ind_park):
+    """
+    Set the Process Data objects of the industrial park used by the application (e.g. data loaded from
+    another source, or None to create them again on the next 'get_data_ind_park' call).
+
+    Args:
+        data_ind_park (SetProcessData or None): Process Data objects of the industrial park.
+    """
+
+    global _data_ind_park
+    with _data_ind_park_lock:
+        _data_ind_park = data_ind_park
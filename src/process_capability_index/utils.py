@@ -1,7 +1,14 @@
+import heapq
+import warnings
+
 import pandas as pd
 import numpy as np
 
-def calculate_cap_index_ppk(process_data_obj: pd.DataFrame, freq: str ='BMS'):
+from monitoring.metrics import instrument_stage
+
+@instrument_stage(rows=lambda arguments: len(arguments['data'] if arguments.get('data') is not None
+                                                else arguments['process_data_obj'].data))
+def calculate_cap_index_ppk(process_data_obj: pd.DataFrame, freq: str ='BMS', data: pd.DataFrame = None):
     """
     Calculate the Ppk index for the Process Data object and time frequency given.
 
@@ -9,13 +16,16 @@ def calculate_cap_index_ppk(process_data_obj: pd.DataFrame, freq: str ='BMS'):
         process_data_obj (pd.DataFrame): Process Data object on which the index will be calculated.
         freq (str, default='BMS'): Time unit used as reference to group the samples.
                                     Example: 'BMS' for month (Business Month Start, in this case), 'D' for day.
+        data (pd.DataFrame, optional): Samples on which the index will be calculated. Default: data of the
+                                    Process Data object.
 
     Returns:
         capidx_ppk (pd.DataFrame): DataFrame with columns 'count', 'mean', 'std', 'ppi', 'pps', and 'ppk' for
                                 each circuit given in the Process data object.
     """
 
-    groups = process_data_obj.data.groupby(pd.Grouper(freq=freq))
+    data = process_data_obj.data if data is None else data
+    groups = data.groupby(pd.Grouper(freq=freq))
 
     def ppi(x):
         return (np.mean(x) - spec_limits['LSL']) / np.std(x) / 3
@@ -34,3 +44,165 @@ def calculate_cap_index_ppk(process_data_obj: pd.DataFrame, freq: str ='BMS'):
         capidx_ppk = pd.concat([capidx_ppk, capidx_ppk_], axis=1, ignore_index=False)
 
     return capidx_ppk
+
+def update_cap_index_ppk(process_data_obj, capidx_ppk: pd.DataFrame, new_index: pd.DatetimeIndex,
+                        freq: str = 'BMS') -> pd.DataFrame:
+    """
+    Update the Ppk index after new samples were appended to the Process Data object. Only the periods from
+    the period of the first appended sample onwards are calculated again.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object on which the index was calculated.
+        capidx_ppk (pd.DataFrame): DataFrame as returned by 'calculate_cap_index_ppk' before the append.
+        new_index (pd.DatetimeIndex): Timestamps of the appended samples.
+        freq (str, default='BMS'): Time unit used as reference to group the samples.
+
+    Returns:
+        capidx_ppk (pd.DataFrame): Updated DataFrame.
+    """
+
+    period_position = capidx_ppk.index.searchsorted(new_index[0], side='right') - 1
+    start = capidx_ppk.index[period_position] if period_position >= 0 else new_index[0]
+
+    capidx_ppk_new = calculate_cap_index_ppk(process_data_obj, freq=freq, data=process_data_obj.get_data_since(start))
+    return pd.concat([capidx_ppk.loc[capidx_ppk.index < start], capidx_ppk_new[capidx_ppk.columns]])
+
+def get_cap_index_ppk(process_data_obj, freq: str = 'BMS') -> pd.DataFrame:
+    """
+    Get the Ppk index for the Process Data object and time frequency given ('calculate_cap_index_ppk').
+    The result is stored in the derived cache of the Process Data object, so it is calculated once per
+    data version (e.g. in the warm-up, before the server workers are forked), and only the periods with
+    appended samples are calculated again ('update_cap_index_ppk').
+
+    Args:
+        process_data_obj (ProcessData): Process Data object on which the index will be calculated.
+        freq (str, default='BMS'): Time unit used as reference to group the samples.
+
+    Returns:
+        capidx_ppk (pd.DataFrame): DataFrame as returned by 'calculate_cap_index_ppk'.
+    """
+
+    return process_data_obj.get_derived(
+        ('ppk', freq),
+        lambda: calculate_cap_index_ppk(process_data_obj, freq=freq),
+        update=lambda capidx_ppk, new_index: update_cap_index_ppk(process_data_obj, capidx_ppk, new_index, freq)
+    )
+
+def get_circuits_below_goal(process_data_obj, ppk_rep_monthly: pd.DataFrame) -> list:
+    """
+    Get the circuits whose Ppk index of the last month is below the goal (or missing), sorted from the
+    worst circuit (largest difference to the goal) to the best one.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the Ppk index.
+        ppk_rep_monthly (pd.DataFrame): Dataframe with calculated Ppk index using a monthly window.
+
+    Returns:
+        circuit_names (list): Names of the circuits below the goal.
+    """
+
+    ppk_last_month = ppk_rep_monthly.iloc[-1]
+    distance_to_goal = {}
+    for circ in process_data_obj.circuit_names:
+        ppk = ppk_last_month[(circ, 'PPK')]
+        if np.isnan(ppk) or ppk < process_data_obj.ppk_goals[circ]:
+            distance_to_goal[circ] = -np.inf if np.isnan(ppk) else ppk - process_data_obj.ppk_goals[circ]
+
+    return sorted(distance_to_goal, key=distance_to_goal.get)
+
+@instrument_stage(rows=lambda arguments: len(arguments['process_data_obj'].data))
+def calculate_last_periods_ppk(process_data_obj, freq: str = 'BMS') -> dict:
+    """
+    Calculate the Ppk index of all the circuits of the Process Data object for the last period (e.g. the
+    current month) and the previous one, in a single vectorized pass over the samples of both periods.
+    The values are the same as the last two rows of 'calculate_cap_index_ppk'.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object on which the index will be calculated.
+        freq (str, default='BMS'): Time unit used as reference to group the samples.
+
+    Returns:
+        last_periods_ppk (dict): Dictionary with the keys 'period' (start of the last period), 'circuit_names',
+                                'ppk' and 'previous_ppk' (arrays with the Ppk of each circuit, NaN if there
+                                is no previous period) and 'ppk_goals' (array).
+    """
+
+    data = process_data_obj.data
+    period_starts = data.index.to_series().resample(freq).size().index
+
+    lsl = np.array([process_data_obj.specifications_limits[circ]['LSL'] for circ in process_data_obj.circuit_names])
+    usl = np.array([process_data_obj.specifications_limits[circ]['USL'] for circ in process_data_obj.circuit_names])
+
+    def period_ppk(values):
+        # Periods (or circuits) without samples have a NaN Ppk, as in 'calculate_cap_index_ppk'
+        with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0)
+        return np.minimum(mean - lsl, usl - mean) / std / 3
+
+    values = data[process_data_obj.circuit_names].to_numpy(dtype=float)
+    ppk = period_ppk(values[data.index >= period_starts[-1]])
+    previous_ppk = np.full(len(process_data_obj.circuit_names), np.nan)
+    if len(period_starts) > 1:
+        previous_ppk = period_ppk(values[(data.index >= period_starts[-2]) & (data.index < period_starts[-1])])
+
+    return {
+        'period': period_starts[-1],
+        'circuit_names': list(process_data_obj.circuit_names),
+        'ppk': ppk,
+        'previous_ppk': previous_ppk,
+        'ppk_goals': np.array([process_data_obj.ppk_goals[circ] for circ in process_data_obj.circuit_names]),
+    }
+
+def get_last_periods_ppk(process_data_obj, freq: str = 'BMS') -> dict:
+    """
+    Get the Ppk index of the last two periods for the Process Data object ('calculate_last_periods_ppk').
+    The result is stored in the derived cache of the Process Data object, so it is only calculated again
+    for the plants whose data changed.
+    """
+
+    return process_data_obj.get_derived(('last_periods_ppk', freq),
+                                        lambda: calculate_last_periods_ppk(process_data_obj, freq=freq))
+
+def get_worst_circuits(data_ind_park, n: int, freq: str = 'BMS') -> list:
+    """
+    Get the 'n' circuits of the industrial park with the lowest Ppk index in the last period relative to
+    their goal (difference between the Ppk and the goal, missing Ppk first), from the worst circuit to the
+    best one. The circuits are selected with a heap of size 'n', without sorting all the circuits.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        n (int): Number of circuits.
+        freq (str, default='BMS'): Time unit used as reference to group the samples.
+
+    Returns:
+        worst_circuits (list of dict): Circuits with the keys 'plant', 'circuit', 'period', 'ppk', 'ppk_goal',
+                                    'distance_to_goal', 'previous_ppk' and 'trend' (difference between the Ppk
+                                    of the last period and the previous one). Missing values are NaN.
+    """
+
+    last_periods_ppk = {obj.plant_name: get_last_periods_ppk(obj, freq=freq) for obj in data_ind_park.process_data_objs}
+
+    def candidates():
+        for plant_name, plant_ppk in last_periods_ppk.items():
+            distance_to_goal = np.where(np.isnan(plant_ppk['ppk']), -np.inf, plant_ppk['ppk'] - plant_ppk['ppk_goals'])
+            for i, distance in enumerate(distance_to_goal.tolist()):
+                yield distance, plant_name, i
+
+    worst_circuits = []
+    for distance, plant_name, i in heapq.nsmallest(n, candidates()):
+        plant_ppk = last_periods_ppk[plant_name]
+        ppk, previous_ppk = float(plant_ppk['ppk'][i]), float(plant_ppk['previous_ppk'][i])
+        worst_circuits.append({
+            'plant': plant_name,
+            'circuit': plant_ppk['circuit_names'][i],
+            'period': plant_ppk['period'],
+            'ppk': ppk,
+            'ppk_goal': float(plant_ppk['ppk_goals'][i]),
+            'distance_to_goal': float(ppk - plant_ppk['ppk_goals'][i]),
+            'previous_ppk': previous_ppk,
+            'trend': ppk - previous_ppk,
+        })
+
+    return worst_circuits
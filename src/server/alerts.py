@@ -0,0 +1,57 @@
+from flask import jsonify, request
+
+from alerts.engine import AlertEngine, AlertScheduler
+from alerts.sinks import LogAlertSink, SQLiteAlertSink
+from app_config import PROJECT_ROOT, config
+
+def create_configured_alert_engine(data_ind_park) -> AlertEngine:
+    """
+    Create the alerting engine of the industrial park with the values of 'config.alerts_config': the alerts are
+    stored in the SQLite database 'alerts_db_path' (deduplicated between workers and restarts) and the new
+    ones are written to the log file 'alerts_log_file'.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+
+    Returns:
+        alert_engine (AlertEngine): Alerting engine.
+    """
+
+    sinks = [SQLiteAlertSink(PROJECT_ROOT / config.alerts_config.alerts_db_path),
+            LogAlertSink(PROJECT_ROOT / config.alerts_config.alerts_log_file)]
+    return AlertEngine(data_ind_park, sinks,
+                    ppk_freq=config.alerts_config.alerts_ppk_freq,
+                    run_length=config.alerts_config.alerts_run_length,
+                    lookback_days=config.alerts_config.alerts_lookback_days)
+
+def start_alert_scheduler(data_ind_park):
+    """
+    Start the scheduler of the alerting engine ('create_configured_alert_engine') with the interval
+    'config.alerts_config.alerts_interval_seconds' (no scheduler is started if the interval is 0).
+
+    Returns:
+        scheduler (AlertScheduler): Started scheduler, or None.
+    """
+
+    if config.alerts_config.alerts_interval_seconds <= 0:
+        return None
+
+    scheduler = AlertScheduler(create_configured_alert_engine(data_ind_park),
+                            config.alerts_config.alerts_interval_seconds)
+    scheduler.start()
+    return scheduler
+
+def register_alerts_endpoint(server):
+    """
+    Register the '/alerts' route in the Flask server of the application, with the last alerts stored in the
+    database (newest first). Query parameters: 'limit' (default 100) and 'plant'.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+    """
+
+    @server.route('/alerts')
+    def alerts():
+        limit = request.args.get('limit', 100, type=int)
+        sink = SQLiteAlertSink(PROJECT_ROOT / config.alerts_config.alerts_db_path)
+        return jsonify(sink.get_alerts(limit=limit, plant_name=request.args.get('plant')))
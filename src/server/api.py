@@ -0,0 +1,243 @@
+import hashlib
+import json
+import typing as t
+
+import numpy as np
+import pandas as pd
+from flask import Blueprint, Response, jsonify, request
+
+from process_capability_index.utils import get_cap_index_ppk
+
+# Time frequencies of the Ppk tables served by the API
+API_PPK_FREQS = ('BMS', 'W', 'D')
+
+# Output formats of the Ppk tables
+API_FORMATS = ('json', 'ndjson', 'arrow')
+
+class APIError(Exception):
+    """
+    Error of an API request, returned as a JSON response with the given HTTP status code.
+    """
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+def _get_process_data_obj(data_ind_park, plant_name: str):
+    if plant_name not in data_ind_park.list_plant_names:
+        raise APIError(f"Unknown plant: {plant_name!r}", 404)
+    return data_ind_park[plant_name]
+
+def _parse_ppk_query(process_data_obj, circuits: t.Optional[t.Union[str, t.Sequence[str]]], freq: str,
+                    start: t.Optional[str], end: t.Optional[str]) -> dict:
+    """
+    Validate the parameters of a Ppk table query and return them normalized. The circuits are given as a
+    list of circuit names or a comma-separated string (all the circuits if empty).
+    """
+
+    if freq not in API_PPK_FREQS:
+        raise APIError(f"Invalid freq: {freq!r}. Valid values: {', '.join(API_PPK_FREQS)}")
+
+    if isinstance(circuits, str):
+        circuits = circuits.split(',') if circuits else None
+    elif circuits is not None and (not isinstance(circuits, list) or not all(isinstance(circ, str) for circ in circuits)):
+        raise APIError(f"Invalid circuits: {circuits!r}. Expected a list of circuit names or a comma-separated string")
+
+    circuits = list(circuits) if circuits else list(process_data_obj.circuit_names)
+    unknown_circuits = [circ for circ in circuits if circ not in process_data_obj.circuit_names]
+    if unknown_circuits:
+        raise APIError(f"Unknown circuits of plant {process_data_obj.plant_name!r}: {unknown_circuits}", 404)
+
+    try:
+        start = pd.Timestamp(start).isoformat() if start else None
+        end = pd.Timestamp(end).isoformat() if end else None
+    except ValueError as e:
+        raise APIError(f"Invalid date: {e}")
+
+    return dict(plant=process_data_obj.plant_name, circuits=circuits, freq=freq, start=start, end=end)
+
+def iter_ppk_records(process_data_obj, query: dict) -> t.Iterator[dict]:
+    """
+    Iterate over the rows of the Ppk table of the query (one record per circuit and period).
+
+    Args:
+        process_data_obj (ProcessData): Process Data object of the plant.
+        query (dict): Normalized query ('plant', 'circuits', 'freq', 'start' and 'end').
+
+    Returns:
+        records (iterator of dict): Records with the keys 'plant', 'circuit', 'period', 'count', 'mean',
+                                    'std' and 'ppk'.
+    """
+
+    ppk_rep = get_cap_index_ppk(process_data_obj, freq=query['freq']).loc[query['start']:query['end']]
+    periods = [period.isoformat() for period in ppk_rep.index]
+
+    for circ in query['circuits']:
+        columns = [ppk_rep[(circ, name)].to_numpy(dtype=float) for name in ['count', 'mean', 'std', 'PPK']]
+        for period, count, mean, std, ppk in zip(periods, *columns):
+            yield {
+                'plant': query['plant'],
+                'circuit': circ,
+                'period': period,
+                'count': int(count),
+                'mean': None if np.isnan(mean) else float(mean),
+                'std': None if np.isnan(std) else float(std),
+                'ppk': None if not np.isfinite(ppk) else float(ppk),
+            }
+
+def _get_output_format(output_format: str) -> str:
+    if output_format not in API_FORMATS:
+        raise APIError(f"Invalid format: {output_format!r}. Valid values: {', '.join(API_FORMATS)}")
+    return output_format
+
+def _make_etag(data_versions: t.Sequence[str], params) -> str:
+    etag_text = json.dumps([list(data_versions), params], sort_keys=True, default=str)
+    return hashlib.sha1(etag_text.encode('utf-8')).hexdigest()
+
+def _not_modified(etag: str) -> t.Optional[Response]:
+    """
+    Return the 304 response if the client already has the version identified by the ETag.
+    """
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def _records_response(records: t.Iterable[dict], output_format: str) -> Response:
+    """
+    Create the response with the records in the requested format: a JSON list, streamed NDJSON (one
+    record per line) or an Arrow IPC stream (requires the 'pyarrow' package).
+    """
+
+    if output_format == 'ndjson':
+        return Response((json.dumps(record) + '\n' for record in records), mimetype='application/x-ndjson')
+
+    if output_format == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise APIError("Package 'pyarrow' is required by the 'arrow' format", 406)
+
+        table = pa.Table.from_pylist(list(records))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), mimetype='application/vnd.apache.arrow.stream')
+
+    return jsonify(list(records))
+
+def create_api_blueprint(data_ind_park) -> Blueprint:
+    """
+    Create the Blueprint of the JSON API of the capability indices (prefix '/api'):
+
+        GET /api/plants: plants with their circuits and data version.
+        GET /api/plants/<plant>/circuits: circuits of the plant with their specification limits and Ppk goal.
+        GET /api/plants/<plant>/ppk: Ppk table of the plant. Query parameters: 'circuits' (comma separated,
+            default all), 'freq' (default 'BMS'), 'start', 'end' and 'format' ('json', 'ndjson' or 'arrow').
+        POST /api/ppk/batch: Ppk tables of several plants and circuits. The JSON body has the key 'queries'
+            (list of objects with the keys 'plant', 'circuits', 'freq', 'start' and 'end') and optionally
+            'format'.
+
+    The responses have an ETag given by the data version of the plants and the query, so clients polling with
+    'If-None-Match' receive a 304 response (without any calculation) while the data does not change.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+
+    Returns:
+        api (flask.Blueprint): Blueprint of the API.
+    """
+
+    api = Blueprint('api', __name__, url_prefix='/api')
+
+    @api.errorhandler(APIError)
+    def handle_api_error(error):
+        return jsonify(error=error.message), error.status_code
+
+    @api.route('/plants')
+    def plants():
+        data_versions = [obj.data_version for obj in data_ind_park.process_data_objs]
+        etag = _make_etag(data_versions, 'plants')
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = jsonify([{'plant': obj.plant_name,
+                            'circuits': list(obj.circuit_names),
+                            'data_version': obj.data_version} for obj in data_ind_park.process_data_objs])
+        response.set_etag(etag)
+        return response
+
+    @api.route('/plants/<plant_name>/circuits')
+    def circuits(plant_name):
+        process_data_obj = _get_process_data_obj(data_ind_park, plant_name)
+        etag = _make_etag([process_data_obj.data_version], ['circuits', plant_name])
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = jsonify([{'circuit': circ,
+                            'specifications_limits': process_data_obj.specifications_limits[circ],
+                            'ppk_goal': process_data_obj.ppk_goals[circ]} for circ in process_data_obj.circuit_names])
+        response.set_etag(etag)
+        return response
+
+    @api.route('/plants/<plant_name>/ppk')
+    def ppk(plant_name):
+        process_data_obj = _get_process_data_obj(data_ind_park, plant_name)
+        query = _parse_ppk_query(process_data_obj,
+                                request.args.get('circuits'),
+                                request.args.get('freq', 'BMS'),
+                                request.args.get('start'),
+                                request.args.get('end'))
+        output_format = _get_output_format(request.args.get('format', 'json'))
+
+        etag = _make_etag([process_data_obj.data_version], [query, output_format])
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = _records_response(iter_ppk_records(process_data_obj, query), output_format)
+        response.set_etag(etag)
+        return response
+
+    @api.route('/ppk/batch', methods=['POST'])
+    def ppk_batch():
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get('queries'), list):
+            raise APIError("The body must be a JSON object with the list 'queries'")
+        output_format = _get_output_format(body.get('format', 'json'))
+
+        queries = []
+        for query in body['queries']:
+            if not isinstance(query, dict):
+                raise APIError("Each query must be a JSON object")
+            process_data_obj = _get_process_data_obj(data_ind_park, query.get('plant'))
+            queries.append((process_data_obj, _parse_ppk_query(process_data_obj, query.get('circuits'),
+                                                                query.get('freq', 'BMS'), query.get('start'),
+                                                                query.get('end'))))
+
+        etag = _make_etag([obj.data_version for obj, _ in queries], [[query for _, query in queries], output_format])
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+        records = (record for obj, query in queries for record in iter_ppk_records(obj, query))
+        response = _records_response(records, output_format)
+        response.set_etag(etag)
+        return response
+
+    return api
+
+def register_api_routes(server, data_ind_park):
+    """
+    Register the JSON API of the capability indices ('create_api_blueprint') in the Flask server of the
+    application.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+    """
+
+    server.register_blueprint(create_api_blueprint(data_ind_park))
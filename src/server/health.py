@@ -0,0 +1,56 @@
+import threading
+import time
+
+from flask import jsonify
+
+# Readiness status of the server (updated by the warm-up)
+_status = {
+    'ready': False,
+    'started_at': time.time(),
+    'warm_up_runs': 0,
+    'warm_up_seconds': None,
+    'last_warm_up_at': None,
+    'plants_warm_up_seconds': {},
+}
+_status_lock = threading.Lock()
+
+def record_warm_up(warm_up_seconds: float, plants_warm_up_seconds: dict):
+    """
+    Record a finished warm-up (initial or refresh) and mark the server as ready to answer requests.
+
+    Args:
+        warm_up_seconds (float): Duration of the warm-up.
+        plants_warm_up_seconds (dict): Duration of the warm-up of each plant.
+    """
+    with _status_lock:
+        _status['ready'] = True
+        _status['warm_up_runs'] += 1
+        _status['warm_up_seconds'] = warm_up_seconds
+        _status['last_warm_up_at'] = time.time()
+        _status['plants_warm_up_seconds'] = dict(plants_warm_up_seconds)
+
+def get_status() -> dict:
+    """
+    Return a copy of the readiness status of the server.
+    """
+    with _status_lock:
+        return dict(_status)
+
+def register_health_endpoints(server):
+    """
+    Register the health endpoints in the Flask server of the application:
+    '/health' (liveness, always 200) and '/ready' (readiness, 200 after the warm-up and 503 before, with
+    the status and duration of the warm-ups).
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+    """
+
+    @server.route('/health')
+    def health():
+        return jsonify(status='ok')
+
+    @server.route('/ready')
+    def ready():
+        status = get_status()
+        return jsonify(status), 200 if status['ready'] else 503
@@ -0,0 +1,19 @@
+from app_config import config
+from data.live_feed import LivePoller
+
+def start_live_poller(data_ind_park):
+    """
+    Start the poller of the simulated live source of the plants with the interval
+    'config.live_config.live_interval_seconds' (no poller is started if 'live_simulated_samples' is False).
+
+    Returns:
+        poller (LivePoller): Started poller, or None.
+    """
+
+    if not config.live_config.live_simulated_samples:
+        return None
+
+    poller = LivePoller(data_ind_park, config.live_config.live_interval_seconds,
+                        freq=config.live_config.live_sample_freq)
+    poller.start()
+    return poller
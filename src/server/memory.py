@@ -0,0 +1,66 @@
+import logging
+
+from flask import jsonify
+
+from app_config import PROJECT_ROOT, config
+from cache.result_cache import get_result_cache
+from data.memory import MEMORY_KINDS, enforce_memory_budget, get_memory_report
+from monitoring.metrics import increment, set_gauge
+
+logger = logging.getLogger(__name__)
+
+def get_memory_budget_bytes() -> int:
+    """
+    Return the memory budget of the plants ('config.memory_config.memory_budget_mb'), in bytes.
+    """
+    return config.memory_config.memory_budget_mb * 2**20
+
+def enforce_configured_memory_budget(data_ind_park) -> list:
+    """
+    Enforce the memory budget of the configuration file on the plants of the industrial park and the result
+    cache ('enforce_memory_budget'), counting the evictions in the 'memory_evictions' metric.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+
+    Returns:
+        evictions (list): List of the tuples (plant name, 'derived' or 'plant') of the evictions.
+    """
+
+    evictions = enforce_memory_budget(data_ind_park, get_memory_budget_bytes(),
+                                    config.memory_config.memory_idle_plant_seconds,
+                                    PROJECT_ROOT / config.memory_config.memory_spill_dir,
+                                    result_cache=get_result_cache())
+
+    for plant_name, kind in evictions:
+        increment('memory_evictions', plant=plant_name, kind=kind)
+    if evictions:
+        logger.info(f"Memory budget evictions: {evictions}")
+
+    return evictions
+
+def record_memory_metrics(data_ind_park):
+    """
+    Update the memory gauges ('plant_memory_bytes' and 'memory_budget_bytes') with the memory used by the
+    plants of the industrial park. Used as a collector of the '/metrics' route.
+    """
+
+    memory_report = get_memory_report(data_ind_park, get_result_cache(), get_memory_budget_bytes())
+    for plant_name, memory_usage in memory_report['plants'].items():
+        for kind in MEMORY_KINDS:
+            set_gauge('plant_memory_bytes', memory_usage[kind], plant=plant_name, kind=kind)
+    set_gauge('memory_budget_bytes', memory_report['budget_bytes'])
+
+def register_memory_endpoint(server, data_ind_park):
+    """
+    Register the '/memory' route in the Flask server of the application, with the memory used by each plant
+    (raw data, pyramid, derived tables and cached results), the total and the budget, in bytes.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+    """
+
+    @server.route('/memory')
+    def memory():
+        return jsonify(get_memory_report(data_ind_park, get_result_cache(), get_memory_budget_bytes()))
@@ -0,0 +1,44 @@
+from flask import Response, g, request
+
+from monitoring.metrics import record_payload, render_prometheus
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def register_metrics_endpoint(server, collectors=()):
+    """
+    Register the '/metrics' route in the Flask server of the application, with the stage timings, payload
+    sizes, processed rows and result cache requests of the callbacks in the Prometheus text format.
+    Obs.: The metrics are recorded by each process, so each gunicorn worker reports its own requests.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+        collectors (sequence of callables, default=()): Functions without arguments called before rendering
+                                                        the metrics (e.g. to update gauges).
+    """
+
+    @server.route('/metrics')
+    def metrics():
+        for collector in collectors:
+            collector()
+        return Response(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    register_payload_metrics(server)
+
+def register_payload_metrics(server):
+    """
+    Record the size of the responses of the callbacks decorated with 'instrument_callback' (which keeps the
+    callback name in the request context) in their payload metrics, including the results of the cache.
+    The size is taken from the response encoded by Dash, so the outputs are encoded only once.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+    """
+
+    @server.after_request
+    def record_callback_payload(response):
+        callback_name = g.pop('instrumented_callback', None)
+        if callback_name is not None and request.path.endswith('/_dash-update-component') \
+                and not response.direct_passthrough:
+            record_payload(callback_name, len(response.get_data()))
+        return response
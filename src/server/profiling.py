@@ -0,0 +1,90 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+import typing as t
+import uuid
+from pathlib import Path
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+# Request header that enables the profiling of the request, and its valid values
+PROFILE_HEADER = 'X-Profile'
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# Response header with the name of the saved profile file
+PROFILE_FILE_HEADER = 'X-Profile-File'
+
+def _start_profiler(profiler_name: str):
+    if profiler_name == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("Package 'pyinstrument' is not installed. Profiling the request with cProfile.")
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return 'pyinstrument', profiler
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return 'cprofile', profiler
+
+def _save_profile(profiler_name: str, profiler, directory: Path) -> Path:
+    """
+    Stop the profiler and save the profile: a pstats dump ('.prof', e.g. for snakeviz) and its text summary
+    ('.txt') for cProfile, or an HTML report for pyinstrument.
+    """
+
+    file_stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.path.strip('/').replace('/', '_') or 'root'}-{uuid.uuid4().hex[:8]}"
+
+    if profiler_name == 'pyinstrument':
+        profiler.stop()
+        profile_path = directory / f'{file_stem}.html'
+        profile_path.write_text(profiler.output_html(), encoding='utf-8')
+        return profile_path
+
+    profiler.disable()
+    profile_path = directory / f'{file_stem}.prof'
+    profiler.dump_stats(str(profile_path))
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(50)
+    profile_path.with_suffix('.txt').write_text(summary.getvalue(), encoding='utf-8')
+
+    return profile_path
+
+def register_request_profiling(server, enabled: bool, directory: t.Union[str, Path]):
+    """
+    Register the profiling of the requests in the Flask server of the application: the requests with the
+    header 'X-Profile' ('cprofile' or 'pyinstrument') are profiled, the profile is saved in the directory
+    and its file name is returned in the response header 'X-Profile-File'. Nothing is registered if the
+    profiling is not enabled.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash application.
+        enabled (bool): Enable the profiling of the requests.
+        directory (str or Path): Directory of the saved profiles.
+    """
+
+    if not enabled:
+        return
+
+    directory = Path(directory)
+
+    @server.before_request
+    def start_request_profiling():
+        profiler_name = request.headers.get(PROFILE_HEADER, '').lower()
+        if profiler_name in PROFILERS:
+            g.request_profiler = _start_profiler(profiler_name)
+
+    @server.after_request
+    def save_request_profile(response):
+        request_profiler = g.pop('request_profiler', None)
+        if request_profiler is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+            response.headers[PROFILE_FILE_HEADER] = _save_profile(*request_profiler, directory).name
+        return response
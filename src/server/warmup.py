@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from app_config import config
+from process_capability_index.utils import get_cap_index_ppk, get_last_periods_ppk
+from server.health import record_warm_up
+from visualization.utils import (get_figure_control_chart_skeleton, get_figure_report_skeleton,
+                                get_histograms_selected_month)
+
+logger = logging.getLogger(__name__)
+
+def warm_up_plant(process_data_obj, precompute_funcs: t.Sequence[t.Callable] = ()) -> float:
+    """
+    Precompute the statistics and figure skeletons of the plant, which are stored in the derived cache of
+    the Process Data object, and run the other precompute functions (e.g. default figures). Plants unloaded
+    or whose derived tables were evicted by the memory budget ('enforce_memory_budget') are skipped until they
+    are accessed again. The warm-up does not update the time of the last access to the plant, so the idle
+    plants can still be unloaded.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object of the plant.
+        precompute_funcs (sequence of callables, default=()): Functions called with the Process Data object.
+
+    Returns:
+        warm_up_seconds (float): Duration of the warm-up of the plant.
+    """
+
+    start_time = time.perf_counter()
+    if not process_data_obj.is_loaded or process_data_obj.is_derived_evicted:
+        return 0.0
+
+    get_cap_index_ppk(process_data_obj, freq='BMS')
+    get_last_periods_ppk(process_data_obj, freq='BMS')
+    ppk_rep_daily = get_cap_index_ppk(process_data_obj, freq='D')
+    for month in ppk_rep_daily.index.month.unique():
+        get_histograms_selected_month(process_data_obj, month, config.layout_config.plt_histogram_bins)
+
+    get_figure_report_skeleton(process_data_obj)
+    get_figure_control_chart_skeleton(process_data_obj)
+
+    for precompute_func in precompute_funcs:
+        precompute_func(process_data_obj)
+
+    return time.perf_counter() - start_time
+
+def warm_up(data_ind_park, precompute_funcs: t.Sequence[t.Callable] = (), max_workers: int = None) -> float:
+    """
+    Precompute the statistics of all the plants in parallel and mark the server as ready. When the server runs
+    with 'preload_app', the warm-up runs once in the master process and the results are shared copy-on-write
+    by the forked workers.
+
+    Args:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        precompute_funcs (sequence of callables, default=()): Functions called with each Process Data object
+                                                            (see 'warm_up_plant').
+        max_workers (int, optional): Number of plants warmed up in parallel. Default given by
+                                    'config.warm_up_config.warm_up_workers'.
+
+    Returns:
+        warm_up_seconds (float): Duration of the warm-up.
+    """
+
+    if max_workers is None:
+        max_workers = config.warm_up_config.warm_up_workers
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        plants_warm_up_seconds = dict(zip(
+            data_ind_park.list_plant_names,
+            executor.map(lambda obj: warm_up_plant(obj, precompute_funcs), data_ind_park.process_data_objs)
+        ))
+    warm_up_seconds = time.perf_counter() - start_time
+
+    logger.info(f"Warm-up of {len(plants_warm_up_seconds)} plants finished in {warm_up_seconds:.2f} s")
+    record_warm_up(warm_up_seconds, plants_warm_up_seconds)
+
+    return warm_up_seconds
+
+class WarmUpScheduler():
+    """
+    Run the warm-up periodically in a daemon thread, so the statistics and default figures are precomputed
+    again after the data of a plant changes (the caches of the plant are cleared by 'ProcessData.update_data').
+
+    Attributes:
+        data_ind_park (SetProcessData): Process Data objects of the industrial park.
+        interval_seconds (float): Time between the end of a warm-up and the start of the next one.
+        precompute_funcs (sequence of callables): Functions passed to 'warm_up'.
+        post_warm_up_funcs (sequence of callables): Functions called with the industrial park after each
+                                                    warm-up (e.g. memory budget enforcement).
+
+    Methods:
+        start(): Start the scheduler thread.
+        stop(): Stop the scheduler thread.
+    """
+    def __init__(self, data_ind_park, interval_seconds: float, precompute_funcs: t.Sequence[t.Callable] = (),
+                post_warm_up_funcs: t.Sequence[t.Callable] = ()):
+        self.data_ind_park = data_ind_park
+        self.interval_seconds = interval_seconds
+        self.precompute_funcs = precompute_funcs
+        self.post_warm_up_funcs = post_warm_up_funcs
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                warm_up(self.data_ind_park, self.precompute_funcs)
+                for post_warm_up_func in self.post_warm_up_funcs:
+                    post_warm_up_func(self.data_ind_park)
+            except Exception:
+                logger.exception("Scheduled warm-up failed")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='warm-up-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def start_warm_up_scheduler(data_ind_park, precompute_funcs: t.Sequence[t.Callable] = (),
+                            post_warm_up_funcs: t.Sequence[t.Callable] = ()):
+    """
+    Start the warm-up scheduler with the interval 'config.warm_up_config.warm_up_refresh_seconds'
+    (no scheduler is started if the interval is 0).
+
+    Returns:
+        scheduler (WarmUpScheduler): Started scheduler, or None.
+    """
+
+    if config.warm_up_config.warm_up_refresh_seconds <= 0:
+        return None
+
+    scheduler = WarmUpScheduler(data_ind_park, config.warm_up_config.warm_up_refresh_seconds, precompute_funcs,
+                                post_warm_up_funcs)
+    scheduler.start()
+    return scheduler
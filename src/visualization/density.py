@@ -0,0 +1,71 @@
+import numpy as np
+
+# Maximum number of samples for which the density is calculated directly (sum of the kernels of all samples)
+DIRECT_KDE_MAX_SAMPLES = 2000
+
+def calculate_kde_bandwidth(samples: np.ndarray) -> float:
+    """
+    Calculate the bandwidth of the Gaussian kernel with Silverman's rule of thumb, which is the same
+    rule used by plotly.js to draw violin plots.
+
+    Args:
+        samples (np.ndarray): Sample values, without missing values.
+
+    Returns:
+        bandwidth (float): Bandwidth of the Gaussian kernel.
+    """
+
+    std = np.std(samples)
+    iqr = np.subtract(*np.percentile(samples, [75, 25]))
+    spread = min(std, iqr / 1.349) if iqr > 0 else std
+
+    bandwidth = 1.059 * spread * len(samples) ** (-1 / 5)
+    return bandwidth if bandwidth > 0 else 1.0
+
+def calculate_kde(samples: np.ndarray, n_grid: int) -> tuple:
+    """
+    Calculate the Gaussian kernel density estimate of the samples on a fixed grid of 'n_grid' points
+    between (min - 3 * bandwidth) and (max + 3 * bandwidth).
+    For more than DIRECT_KDE_MAX_SAMPLES samples, the binned estimate is used: the samples are
+    linearly binned on the grid and the bin weights are convolved with the kernel using FFT, so the
+    cost grows with the grid size and not with the number of samples.
+
+    Args:
+        samples (np.ndarray): Sample values. Missing values are discarded.
+        n_grid (int): Number of points of the grid.
+
+    Returns:
+        grid (np.ndarray): Points where the density is evaluated.
+        density (np.ndarray): Estimated probability density on the grid.
+    """
+
+    samples = np.asarray(samples, dtype=float)
+    samples = samples[~np.isnan(samples)]
+    if len(samples) == 0:
+        return np.array([]), np.array([])
+
+    bandwidth = calculate_kde_bandwidth(samples)
+    grid = np.linspace(samples.min() - 3 * bandwidth, samples.max() + 3 * bandwidth, n_grid)
+
+    if len(samples) <= DIRECT_KDE_MAX_SAMPLES:
+        z = (grid[:, None] - samples[None, :]) / bandwidth
+        density = np.exp(-0.5 * z**2).sum(axis=1)
+    else:
+        delta = grid[1] - grid[0]
+
+        # Linear binning of the samples on the grid
+        position = (samples - grid[0]) / delta
+        left = np.clip(np.floor(position).astype(np.int64), 0, n_grid - 2)
+        weight_right = position - left
+        weights = np.bincount(left, weights=1 - weight_right, minlength=n_grid) + \
+                  np.bincount(left + 1, weights=weight_right, minlength=n_grid)
+
+        # Convolution with the kernel (truncated at 4 bandwidths) using FFT
+        n_kernel = int(np.ceil(4 * bandwidth / delta))
+        kernel = np.exp(-0.5 * (np.arange(-n_kernel, n_kernel + 1) * delta / bandwidth)**2)
+        n_fft = int(2 ** np.ceil(np.log2(n_grid + len(kernel))))
+        convolution = np.fft.irfft(np.fft.rfft(weights, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)
+        density = convolution[n_kernel:n_kernel + n_grid]
+
+    density = density / (len(samples) * bandwidth * np.sqrt(2 * np.pi))
+    return grid, np.clip(density, 0.0, None)
@@ -0,0 +1,80 @@
+import numpy as np
+
+def lttb_downsample_index(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the positions of the points kept by the Largest-Triangle-Three-Buckets (LTTB) algorithm.
+    The first and last points are always kept and the remaining points are split into 'n_out - 2'
+    buckets, from which the point forming the largest triangle with the previously selected point
+    and the average of the next bucket is kept.
+
+    Args:
+        x (np.ndarray): X coordinates (monotonically increasing) of the points.
+        y (np.ndarray): Y coordinates of the points. Must not contain missing values.
+        n_out (int): Number of points to be kept.
+
+    Returns:
+        index (np.ndarray): Sorted positions of the kept points.
+    """
+
+    n_in = len(x)
+    if n_out >= n_in or n_in <= 2:
+        return np.arange(n_in)
+    if n_out < 3:
+        return np.array([0, n_in - 1])
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket edges over the inner points (first and last points are kept)
+    edges = np.linspace(1, n_in - 1, n_out - 1).astype(int)
+
+    index = np.empty(n_out, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n_in - 1
+
+    selected = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+
+        # Average point of the next bucket (the last point for the last bucket)
+        next_start, next_end = end, (edges[b + 2] if b + 2 < len(edges) else n_in)
+        x_avg = x[next_start:next_end].mean()
+        y_avg = y[next_start:next_end].mean()
+
+        x_a, y_a = x[selected], y[selected]
+        areas = np.abs((x_a - x_avg) * (y[start:end] - y_a) - (x_a - x[start:end]) * (y_avg - y_a))
+
+        selected = start + int(np.argmax(areas))
+        index[b + 1] = selected
+
+    return index
+
+def downsample_index(x: np.ndarray, y: np.ndarray, n_out: int, keep_mask: np.ndarray = None) -> np.ndarray:
+    """
+    Select the positions of the points to be plotted within a point budget. Missing values are
+    discarded, the points flagged by 'keep_mask' are always kept and the rest of the budget is
+    filled with the points selected by the LTTB algorithm.
+
+    Args:
+        x (np.ndarray): X coordinates (monotonically increasing) of the points.
+        y (np.ndarray): Y coordinates of the points.
+        n_out (int): Point budget.
+        keep_mask (np.ndarray, optional): Boolean mask with the points that must always be kept.
+
+    Returns:
+        index (np.ndarray): Sorted positions of the kept points.
+    """
+
+    y = np.asarray(y, dtype=float)
+    valid_index = np.flatnonzero(~np.isnan(y))
+
+    if keep_mask is None:
+        keep_index = np.array([], dtype=np.int64)
+    else:
+        keep_index = np.flatnonzero(np.asarray(keep_mask, dtype=bool) & ~np.isnan(y))
+
+    n_lttb = max(n_out - len(keep_index), 3)
+    lttb_index = valid_index[lttb_downsample_index(np.asarray(x, dtype=float)[valid_index],
+                                                y[valid_index], n_lttb)]
+
+    return np.union1d(lttb_index, keep_index)
@@ -0,0 +1,31 @@
+import typing as t
+
+def get_circuit_pages(circuit_names: t.Sequence[str], page_size: int) -> list:
+    """
+    Split the circuits in pages of 'page_size' circuits, so each figure plots only one page.
+
+    Args:
+        circuit_names (sequence of str): Names of the circuits.
+        page_size (int): Maximum number of circuits of each page.
+
+    Returns:
+        pages (list): List of lists with the circuit names of each page.
+    """
+
+    circuit_names = list(circuit_names)
+    return [circuit_names[i:i + page_size] for i in range(0, len(circuit_names), page_size)]
+
+def get_circuit_page_options(pages: list) -> list:
+    """
+    Create the options of the page selector Dropdown (value: page number, starting at 1).
+    """
+
+    n_circuits = sum(len(page) for page in pages)
+    options = []
+    first = 1
+    for page_number, page in enumerate(pages, start=1):
+        last = first + len(page) - 1
+        options.append({'label': f'Circuits {first}-{last} of {n_circuits}', 'value': page_number})
+        first = last + 1
+
+    return options
@@ -0,0 +1,158 @@
+import base64
+import datetime
+import functools
+import time
+import numpy as np
+import pandas as pd
+import plotly.io.json as plotly_json
+from dash import Patch
+from plotly.io.json import to_json_plotly
+
+from app_config import config
+from background.manager import report_progress
+from monitoring.metrics import record_encode
+
+# Fast JSON encoder used by Dash (through plotly.io) when it is installed
+try:
+    import orjson  # noqa: F401
+    plotly_json.config.default_engine = 'orjson'
+except ImportError:
+    plotly_json.config.default_engine = 'json'
+
+# Typed array dtypes supported by plotly.js
+TYPED_ARRAY_DTYPES = {
+    np.dtype('int8'): 'i1',
+    np.dtype('uint8'): 'u1',
+    np.dtype('int16'): 'i2',
+    np.dtype('uint16'): 'u2',
+    np.dtype('int32'): 'i4',
+    np.dtype('uint32'): 'u4',
+    np.dtype('float32'): 'f4',
+    np.dtype('float64'): 'f8',
+}
+
+def _to_numeric_array(values) -> np.ndarray:
+    """
+    Convert the values to a numeric array supported by plotly.js typed arrays. Datetime values are converted
+    to milliseconds since epoch (the numeric representation of dates in plotly.js). Returns None if the values
+    are not numeric or datetime values.
+    """
+
+    values = np.asarray(values)
+
+    if values.dtype == object and len(values) and isinstance(values[0], (pd.Timestamp, datetime.datetime, np.datetime64)):
+        try:
+            values = pd.DatetimeIndex(values).to_numpy()
+        except (TypeError, ValueError):
+            return None
+
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64) / 1e6
+    if values.dtype == np.bool_:
+        return values.astype(np.uint8)
+    if np.issubdtype(values.dtype, np.integer) and values.dtype not in TYPED_ARRAY_DTYPES:
+        if len(values) == 0 or (values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max):
+            return values.astype(np.int32)
+        return values.astype(np.float64)
+    if values.dtype in TYPED_ARRAY_DTYPES:
+        return values
+
+    return None
+
+def encode_typed_array(values):
+    """
+    Encode a numeric or datetime array as a plotly.js typed array: a dictionary with the keys 'dtype'
+    (e.g. 'f8', 'i1') and 'bdata' (base64 string of the array bytes, little-endian).
+    Arrays of other types (e.g. strings) are returned unchanged.
+
+    Args:
+        values (np.ndarray, pd.Index or pd.Series): Values to be encoded.
+
+    Returns:
+        typed_array (dict): Encoded typed array, or the values unchanged.
+    """
+
+    numeric_values = _to_numeric_array(values)
+    if numeric_values is None or numeric_values.ndim != 1:
+        return values
+
+    numeric_values = np.ascontiguousarray(numeric_values, dtype=numeric_values.dtype.newbyteorder('<'))
+
+    return {
+        'dtype': TYPED_ARRAY_DTYPES[np.dtype(numeric_values.dtype.name)],
+        'bdata': base64.b64encode(numeric_values.tobytes()).decode('ascii')
+    }
+
+def encode_arrays(obj):
+    """
+    Walk a figure (or Patch) dictionary and encode all the numeric and datetime arrays as typed arrays.
+    """
+
+    if isinstance(obj, dict):
+        return {key: encode_arrays(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [encode_arrays(value) for value in obj]
+    if isinstance(obj, (np.ndarray, pd.Index, pd.Series)):
+        return encode_typed_array(obj)
+    return obj
+
+def encode_figure(figure, typed_arrays: bool = True):
+    """
+    Convert a figure (go.Figure, figure dictionary or dash.Patch) into the dictionary returned by the callbacks.
+    If 'typed_arrays' is True, the numeric and datetime arrays are encoded as plotly.js typed arrays.
+
+    Args:
+        figure (go.Figure, dict or dash.Patch): Figure to be converted.
+        typed_arrays (bool, default=True): Enable the typed arrays encoding.
+
+    Returns:
+        figure_dict (dict): Figure (or Patch) as a dictionary.
+    """
+
+    if isinstance(figure, Patch) or hasattr(figure, 'to_plotly_json'):
+        figure = figure.to_plotly_json()
+
+    if typed_arrays:
+        figure = encode_arrays(figure)
+
+    return figure
+
+def get_payload_bytes(output) -> int:
+    """
+    Return the size of the JSON payload of a callback output (as encoded by 'encode_figure').
+    """
+    return len(to_json_plotly(output))
+
+def _is_figure_output(output) -> bool:
+    return isinstance(output, Patch) or hasattr(output, 'to_plotly_json') or isinstance(output, dict)
+
+def serialize_figure_output(callback_name: str):
+    """
+    Decorator of the callbacks that return a figure (or Patch): the output is converted with 'encode_figure'
+    (typed arrays are enabled by 'typed_arrays' in the conf.yml file), and the encode time is recorded in the
+    payload metrics of the callback. The size of the payload is taken from the response ('instrument_callback'),
+    so the output is not encoded to JSON twice just to measure it. For callbacks with multiple outputs, each figure
+    or dictionary output is converted. If the callback receives the 'set_progress' keyword
+    argument (background callbacks), the serialize step is reported.
+
+    Args:
+        callback_name (str): Name of the callback in the payload metrics.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            output = func(*args, **kwargs)
+            outputs = output if isinstance(output, tuple) else (output,)
+            if not any(_is_figure_output(item) for item in outputs):
+                return output
+
+            report_progress(kwargs.get('set_progress'), 'serialize')
+            start_time = time.perf_counter()
+            outputs = tuple(encode_figure(item, typed_arrays=config.serialization_config.typed_arrays)
+                            if _is_figure_output(item) else item for item in outputs)
+            record_encode(callback_name, time.perf_counter() - start_time)
+
+            return outputs if isinstance(output, tuple) else outputs[0]
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
+import copy
 import datetime
+import typing as t
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
@@ -6,7 +8,27 @@ from plotly.subplots import make_subplots
 
 from app_config import config
 from data.process_data import ProcessData
+from monitoring.metrics import instrument_stage
+from visualization.density import calculate_kde
+from visualization.downsampling import downsample_index
 
+# Number of traces added to each row (circuit) of the full report figure: monthly and daily Bar plots,
+# histogram and fitted normal distribution curve
+REPORT_TRACES_PER_ROW = 4
+
+# Number of traces added to each row (circuit) of the Control Chart figure: scatter plot, and
+# violin outline, mean line and jittered points of the violin plot
+CONTROL_CHART_TRACES_PER_ROW = 4
+
+def _count_range_rows(arguments: dict) -> int:
+    """
+    Count the data rows between the 'start_date' and 'end_date' arguments of a call (processed rows metric).
+    """
+    index = arguments['process_data_obj'].data.index
+    return int(index.searchsorted(pd.Timestamp(arguments['end_date']), side='right') -
+            index.searchsorted(pd.Timestamp(arguments['start_date']), side='left'))
+
+@instrument_stage(rows=lambda arguments: len(arguments['ppk_rep_df']))
 def get_bar_plot_hovertemplate(*, time_unit: str, time_unit_format: str, process_data_obj: ProcessData,
                                 ppk_rep_df: pd.DataFrame, ppk_goal: float, prob_dist_name: str, circ: str) -> list:
     """
@@ -46,7 +68,9 @@ def get_bar_plot_hovertemplate(*, time_unit: str, time_unit_format: str, process
 
     return hovertemplate
 
-def get_scatter_plot_hovertemplate(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str) -> list:
+@instrument_stage(rows=_count_range_rows)
+def get_scatter_plot_hovertemplate(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str,
+                                    index: np.ndarray = None, data: pd.DataFrame = None) -> list:
     """
     Create the hovertemplate list for the Scatter plot.
     Obs.: All arguments must be passed as kwargs.
@@ -56,13 +80,22 @@ def get_scatter_plot_hovertemplate(*, process_data_obj: ProcessData, start_date:
         start_date (str): Start date considered when filtering the data before plot.
         end_date (str): End date considered when filtering the data before plot.
         circ (str): Circuit name related to the plotted report.
+        index (np.ndarray, optional): Positions (within the filtered data) of the plotted points.
+                                    If not given, all the points are considered.
+        data (pd.DataFrame, optional): Samples filtered by the dates (e.g. the new samples of the live mode).
+                                    Default: data of the Process Data object.
 
     Returns:
         hovertemplate (list): List of strings with the points informations.
     """
 
-    data_index = process_data_obj.data.loc[start_date:end_date, circ].index
-    data_values = process_data_obj.data.loc[start_date:end_date, circ].values
+    data = process_data_obj.data if data is None else data
+    data_index = data.loc[start_date:end_date, circ].index
+    data_values = data.loc[start_date:end_date, circ].values
+
+    if index is not None:
+        data_index = data_index[index]
+        data_values = data_values[index]
 
     hovertemplate = [
         '''<b>Date:</b> {}<br><br>
@@ -78,6 +111,80 @@ def get_scatter_plot_hovertemplate(*, process_data_obj: ProcessData, start_date:
 
     return hovertemplate
 
+def get_two_colors_colorscale() -> list:
+    """
+    Create the two-entry colorscale that maps the color codes returned by 'get_bar_plot_color_codes'
+    and 'get_scatter_plot_color_codes' to the colors 'plt_markers_color' (code 0) and
+    'plt_markers_outliers_color' (code 1) listed in the conf.yml file (conf/base folder).
+    The colorscale must be used together with 'cmin=0' and 'cmax=1'.
+
+    Returns:
+        colorscale (list): Plotly colorscale with the two marker colors.
+    """
+
+    return [[0.0, config.layout_config.plt_markers_color],
+            [1.0, config.layout_config.plt_markers_outliers_color]]
+
+def get_bar_plot_color_codes(*, ppk_rep_df, circ, ppk_goal) -> np.ndarray:
+    """
+    Create array with individual bar color codes for the Bar plot: 0 when the Ppk index reaches
+    the goal and 1 otherwise (including missing values).
+    Obs.: All arguments must be passed as kwargs.
+
+    Args:
+        ppk_rep_df (pd.DataFrame): Dataframe with calculated Ppk index.
+        circ (str): Circuit name related to the plotted report.
+        ppk_goal (float): Ppk goal value related to the plotted report.
+
+    Returns:
+        color_codes (np.ndarray): Array of int8 color codes, one for each bar.
+    """
+
+    ppk_values = ppk_rep_df[(circ, 'PPK')].to_numpy(dtype=float)
+
+    return np.where(ppk_values >= ppk_goal, 0, 1).astype(np.int8)
+
+def get_scatter_plot_color_codes(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str,
+                                index: np.ndarray = None, data: pd.DataFrame = None) -> np.ndarray:
+    """
+    Create array with individual marker color codes for the Scatter plot: 0 when the value is
+    inside the specification limits and 1 otherwise (including missing values).
+    Obs.: All arguments must be passed as kwargs.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circ (str): Circuit name related to the plotted report.
+        index (np.ndarray, optional): Positions (within the filtered data) of the plotted points.
+                                    If not given, all the points are considered.
+        data (pd.DataFrame, optional): Samples filtered by the dates (e.g. the new samples of the live mode).
+                                    Default: data of the Process Data object.
+
+    Returns:
+        color_codes (np.ndarray): Array of int8 color codes, one for each marker.
+    """
+
+    data = process_data_obj.data if data is None else data
+    values = data.loc[start_date:end_date, circ].to_numpy(dtype=float)
+    if index is not None:
+        values = values[index]
+    spec_limits = process_data_obj.specifications_limits[circ]
+
+    inside_limits = (values >= spec_limits['LSL']) & (values <= spec_limits['USL'])
+
+    return np.where(inside_limits, 0, 1).astype(np.int8)
+
+def _color_codes_to_colors(color_codes: np.ndarray) -> list:
+    """
+    Convert an array of color codes (0 or 1) into the list of colors of the two-entry colorscale.
+    """
+
+    colors = np.array([config.layout_config.plt_markers_color,
+                       config.layout_config.plt_markers_outliers_color], dtype=object)
+
+    return colors[color_codes].tolist()
+
 def get_bar_plot_colors(*, ppk_rep_df, circ, ppk_goal) -> list:
     """
     Create list with individual bar colors for the Bar plot.
@@ -94,14 +201,9 @@ def get_bar_plot_colors(*, ppk_rep_df, circ, ppk_goal) -> list:
         colors_plot (list): List with individual bar colors for the plot.
     """
 
-    colors_plot = []
-    for ppk_val in ppk_rep_df[(circ, 'PPK')].values:
-        if ppk_val >= ppk_goal:
-            colors_plot.append(config.layout_config.plt_markers_color)
-        else:
-            colors_plot.append(config.layout_config.plt_markers_outliers_color)
+    color_codes = get_bar_plot_color_codes(ppk_rep_df=ppk_rep_df, circ=circ, ppk_goal=ppk_goal)
 
-    return colors_plot
+    return _color_codes_to_colors(color_codes)
 
 def get_scatter_plot_colors(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str) -> list:
     """
@@ -120,21 +222,220 @@ def get_scatter_plot_colors(*, process_data_obj: ProcessData, start_date: str, e
         colors_plot (list): List with individual bar colors for the plot.
     """
 
-    colors_plot = []
-    for value in process_data_obj.data.loc[start_date:end_date, circ].values:
-        if (value >= process_data_obj.specifications_limits[circ]['LSL'] ) & (value <= process_data_obj.specifications_limits[circ]['USL']):
-            colors_plot.append(config.layout_config.plt_markers_color)
+    color_codes = get_scatter_plot_color_codes(process_data_obj=process_data_obj,
+                                            start_date=start_date,
+                                            end_date=end_date,
+                                            circ=circ)
+
+    return _color_codes_to_colors(color_codes)
+
+def get_control_chart_points_index(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str,
+                                    max_points: int, keep_mask: np.ndarray = None) -> np.ndarray:
+    """
+    Select the positions (within the filtered data) of the points plotted in the Control Chart.
+    If the number of samples exceeds 'max_points', the samples are downsampled with the
+    Largest-Triangle-Three-Buckets algorithm, always keeping the samples outside the
+    specification limits and the samples flagged in 'keep_mask'.
+    Obs.: All arguments must be passed as kwargs.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circ (str): Circuit name related to the plotted report.
+        max_points (int): Point budget of the plotted trace.
+        keep_mask (np.ndarray, optional): Boolean mask (aligned with the filtered data) with samples
+                                        flagged by control rules, which must always be kept.
+
+    Returns:
+        index (np.ndarray): Sorted positions of the plotted points.
+    """
+
+    data_circ = process_data_obj.data.loc[start_date:end_date, circ]
+
+    if len(data_circ) <= max_points:
+        return np.arange(len(data_circ))
+
+    spec_violations = get_scatter_plot_color_codes(process_data_obj=process_data_obj,
+                                                start_date=start_date,
+                                                end_date=end_date,
+                                                circ=circ).astype(bool)
+    if keep_mask is not None:
+        spec_violations = spec_violations | np.asarray(keep_mask, dtype=bool)
+
+    return downsample_index(data_circ.index.asi8, data_circ.to_numpy(dtype=float), max_points,
+                            keep_mask=spec_violations)
+
+@instrument_stage(rows=_count_range_rows)
+def get_control_chart_trace_data(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str,
+                                max_points: int) -> dict:
+    """
+    Create the data of the Control Chart scatter trace between 'start_date' and 'end_date' at the
+    resolution that fits the point budget:
+        - the raw samples, if their number does not exceed 'max_points';
+        - the minimum and maximum values of the buckets of the finest level of the multi-resolution
+        pyramid ('pyramid' attribute of the Process Data object) that fits the point budget;
+        - the raw samples downsampled with the LTTB algorithm ('get_control_chart_points_index'),
+        if the Process Data object has no pyramid or no pyramid level fits the point budget.
+    Obs.: All arguments must be passed as kwargs.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circ (str): Circuit name related to the plotted report.
+        max_points (int): Point budget of the plotted trace.
+
+    Returns:
+        trace_data (dict): Dictionary with the keys 'x', 'y', 'color_codes', 'hovertemplate' and 'title'
+                        (subplot title with the number of plotted and raw samples).
+    """
+
+    data_circ = process_data_obj.data.loc[start_date:end_date, circ]
+    n_raw_points = len(data_circ)
+    spec_limits = process_data_obj.specifications_limits[circ]
+
+    level = None
+    if n_raw_points > max_points and process_data_obj.pyramid is not None:
+        level = process_data_obj.pyramid.select_level(start_date, end_date, max_points)
+        if level is not None and 2 * process_data_obj.pyramid.count_buckets(start_date, end_date, level) > max_points:
+            level = None
+
+    if level is None:
+        points_index = get_control_chart_points_index(process_data_obj=process_data_obj,
+                                                    start_date=start_date,
+                                                    end_date=end_date,
+                                                    circ=circ,
+                                                    max_points=max_points)
+
+        x = data_circ.index[points_index]
+        y = data_circ.values[points_index]
+        hovertemplate = get_scatter_plot_hovertemplate(process_data_obj=process_data_obj,
+                                                    start_date=start_date,
+                                                    end_date=end_date,
+                                                    circ=circ,
+                                                    index=points_index)
+        color_codes = get_scatter_plot_color_codes(process_data_obj=process_data_obj,
+                                                start_date=start_date,
+                                                end_date=end_date,
+                                                circ=circ,
+                                                index=points_index)
+
+        if len(points_index) < n_raw_points:
+            title = f'Control Chart ({len(points_index):,} of {n_raw_points:,} points)'
         else:
-            colors_plot.append(config.layout_config.plt_markers_outliers_color)
-    return colors_plot
+            title = f'Control Chart ({n_raw_points:,} points)'
+    else:
+        x, y = process_data_obj.pyramid.get_min_max_points(circ, start_date, end_date, level)
+        hovertemplate = [
+            '''<b>{} from:</b> {}<br><br>
+            <b>{} ({}):</b> {:.3f}<br>
+            <b>LSL:</b> {}<br>
+            <b>USL:</b> {}<br>'''.format(
+                                            level,
+                                            x[i].strftime('%d.%m.%y %H:%M'),
+                                            circ,
+                                            'min' if i % 2 == 0 else 'max',
+                                            y[i],
+                                            spec_limits['LSL'],
+                                            spec_limits['USL']
+                                            ) for i in range(len(x))]
+        color_codes = np.where((y >= spec_limits['LSL']) & (y <= spec_limits['USL']), 0, 1).astype(np.int8)
+        title = f'Control Chart ({level} min/max of {n_raw_points:,} points)'
+
+    return dict(x=x, y=y, color_codes=color_codes, hovertemplate=hovertemplate, title=title)
+
+def get_control_chart_xaxis_ranges(relayout_data: dict, nrows: int) -> dict:
+    """
+    Get the x axis ranges of the Control Chart subplots (first column) changed by a zoom or pan
+    event ('relayoutData' property of the Graph component).
+
+    Args:
+        relayout_data (dict): Dictionary with the layout changes of the relayout event.
+        nrows (int): Number of rows (circuits) of the figure.
+
+    Returns:
+        xaxis_ranges (dict): Dictionary with the row position (starting at 0) as key and the tuple
+                            (range start, range end) as value. If the axis was reset (autorange),
+                            the value is None.
+    """
+
+    xaxis_ranges = {}
+    if not relayout_data:
+        return xaxis_ranges
+
+    for i in range(nrows):
+        # Subplots are numbered row by row, so the first column of row i uses the axis 2*i+1
+        xaxis_name = 'xaxis' if i == 0 else f'xaxis{2*i + 1}'
+
+        if f'{xaxis_name}.range[0]' in relayout_data:
+            xaxis_ranges[i] = (relayout_data[f'{xaxis_name}.range[0]'], relayout_data[f'{xaxis_name}.range[1]'])
+        elif f'{xaxis_name}.range' in relayout_data:
+            xaxis_ranges[i] = tuple(relayout_data[f'{xaxis_name}.range'])
+        elif relayout_data.get(f'{xaxis_name}.autorange'):
+            xaxis_ranges[i] = None
+
+    return xaxis_ranges
+
+@instrument_stage(rows=_count_range_rows)
+def get_violin_plot_data(*, process_data_obj: ProcessData, start_date: str, end_date: str, circ: str,
+                        n_grid: int, max_points: int) -> dict:
+    """
+    Create the data of the Violin plot of the Control Chart, calculated in the server: the outline of the
+    violin (kernel density estimate mirrored around zero), the mean line and a random sample of at most
+    'max_points' jittered points. The size of the data depends on 'n_grid' and 'max_points' and not on the
+    number of samples.
+    Obs.: All arguments must be passed as kwargs.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circ (str): Circuit name related to the plotted report.
+        n_grid (int): Number of points of the density grid.
+        max_points (int): Maximum number of jittered points (0 to disable the points).
+
+    Returns:
+        violin_data (dict): Dictionary with the keys 'x' and 'y' (outline), 'mean_x' and 'mean_y' (mean line),
+                            and 'points_x' and 'points_y' (jittered points).
+    """
+
+    values = process_data_obj.data.loc[start_date:end_date, circ].to_numpy(dtype=float)
+    values = values[~np.isnan(values)]
+
+    if len(values) == 0:
+        return dict(x=[], y=[], mean_x=[], mean_y=[], points_x=[], points_y=[])
+
+    grid, density = calculate_kde(values, n_grid)
+
+    mean = values.mean()
+    density_mean = np.interp(mean, grid, density)
+
+    rng = np.random.default_rng(0)
+    points_y = values
+    if len(values) > max_points:
+        points_y = rng.choice(values, size=max_points, replace=False)
+    points_x = rng.uniform(-0.5, 0.5, size=len(points_y)) * np.interp(points_y, grid, density)
+
+    return dict(
+        x=np.concatenate([density, -density[::-1]]),
+        y=np.concatenate([grid, grid[::-1]]),
+        mean_x=[-density_mean, density_mean],
+        mean_y=[mean, mean],
+        points_x=points_x,
+        points_y=points_y
+    )
 
-def calculate_normal_distribution(samples: np.array):
+def calculate_normal_distribution(samples: np.array, x_dist_plot: np.array = None):
     """
     Create a pair of arrays (x_dist_plot, y_dist_plot) for the normal probability curve
     fitted on the given samples.
 
     Args:
         samples (np.array): Sample values
+        x_dist_plot (np.array, optional): X coordinates where the fitted curve is evaluated
+                                        (e.g. the bin centers of the histogram). If not given,
+                                        100 points between 0.9 * min and 1.1 * max of the samples are used.
 
     Returns:
         x_dist_plot (np.array): X coordinates of the fitted curve.
@@ -144,83 +445,160 @@ def calculate_normal_distribution(samples: np.array):
     mu = np.mean(samples)
     sigma = np.std(samples)
 
-    x_dist_plot = np.linspace(0.9 * np.min(samples), 1.1 * np.max(samples), 100)
+    if x_dist_plot is None:
+        x_dist_plot = np.linspace(0.9 * np.min(samples), 1.1 * np.max(samples), 100)
     y_dist_plot = 1/sigma/np.sqrt(2*np.pi)*np.exp(-((x_dist_plot-mu)/(2*sigma))**2)
 
     return x_dist_plot, y_dist_plot
 
-def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.DataFrame,
-                    ppk_rep_daily: pd.DataFrame, process_data_selected_month: int) -> go.Figure:
+@instrument_stage(rows=lambda arguments: len(arguments['data']))
+def calculate_histograms(data: pd.DataFrame, n_bins: int) -> dict:
     """
-    Create figure of the full report.
+    Calculate the histogram (probability density) of each column of the given data, with 'n_bins'
+    equal-width bins between the minimum and maximum values of the column. The bin counts of all
+    columns are calculated at once, and the fitted normal curve is evaluated on the bin centers.
+
+    Args:
+        data (pd.DataFrame): DataFrame with one column for each circuit.
+        n_bins (int): Number of bins of each histogram.
+
+    Returns:
+        histograms (dict): Dictionary with the circuit names as keys and dictionaries with the keys
+                        'bin_centers', 'bin_width', 'counts', 'density', 'x_dist_plot' and 'y_dist_plot'
+                        as values.
+    """
+
+    values = data.to_numpy(dtype=float)
+    n_samples, n_columns = values.shape
+    valid = ~np.isnan(values)
+
+    min_values = np.min(np.where(valid, values, np.inf), axis=0, initial=np.inf)
+    max_values = np.max(np.where(valid, values, -np.inf), axis=0, initial=-np.inf)
+    min_values = np.where(np.isfinite(min_values), min_values, 0.0)
+
+    bin_widths = (max_values - min_values) / n_bins
+    bin_widths = np.where(np.isfinite(bin_widths) & (bin_widths > 0), bin_widths, 1.0)
+
+    # Bin index of each sample, shifted by column so all the histograms are counted in one call
+    bin_index = np.floor((np.where(valid, values, min_values) - min_values) / bin_widths).astype(np.int64)
+    bin_index = np.clip(bin_index, 0, n_bins - 1) + np.arange(n_columns) * n_bins
+    counts = np.bincount(bin_index[valid], minlength=n_columns * n_bins).reshape(n_columns, n_bins)
+
+    n_valid = valid.sum(axis=0)
+    density = counts / np.maximum(n_valid, 1)[:, None] / bin_widths[:, None]
+    bin_centers = min_values[:, None] + (np.arange(n_bins) + 0.5) * bin_widths[:, None]
+
+    histograms = {}
+    for j, circ in enumerate(data.columns):
+        if n_valid[j] == 0:
+            x_dist_plot, y_dist_plot = np.array([]), np.array([])
+        else:
+            x_dist_plot, y_dist_plot = calculate_normal_distribution(values[valid[:, j], j], x_dist_plot=bin_centers[j])
+
+        histograms[circ] = dict(
+            bin_centers=bin_centers[j],
+            bin_width=bin_widths[j],
+            counts=counts[j],
+            density=density[j],
+            x_dist_plot=x_dist_plot,
+            y_dist_plot=y_dist_plot
+        )
+
+    return histograms
+
+def get_histograms_selected_month(process_data_obj: ProcessData, selected_month: int, n_bins: int) -> dict:
+    """
+    Get the histograms of the samples of the selected month ('calculate_histograms'). The result is stored in the
+    derived cache of the Process Data object, so switching back to a month reuses the bin counts, and is only
+    calculated again when samples of the month are appended.
 
     Args:
         process_data_obj (ProcessData): Process Data object related to the plotted report.
-        ppk_rep_monthly (pd.DataFrame): Dataframe with calculated Ppk index using a monthly window.
-        ppk_rep_daily (pd.DataFrame): Dataframe with calculated Ppk index using a daily window.
-        process_data_selected_month (int): Selected month related to the daily report.
+        selected_month (int): Selected month related to the daily report.
+        n_bins (int): Number of bins of each histogram.
 
     Returns:
-        fig_report (go.Figure): Figure of the Ppk index full report.
+        histograms (dict): Histograms of each circuit, as returned by 'calculate_histograms'.
+    """
+
+    return process_data_obj.get_derived(
+        ('histograms', selected_month, n_bins),
+        lambda: calculate_histograms(process_data_obj.data.loc[process_data_obj.data.index.month == selected_month],
+                                    n_bins),
+        update=lambda histograms, new_index: None if selected_month in new_index.month else histograms
+    )
+
+def _get_circuit_names(process_data_obj: ProcessData, circuit_names: t.Sequence[str] = None) -> list:
+    """
+    Return the circuits plotted in a figure: the given circuits, or all the circuits of the Process Data object.
     """
+    return list(process_data_obj.circuit_names) if circuit_names is None else list(circuit_names)
 
-    nrows = len(process_data_obj.circuit_names)
+def apply_figure_updates(figure, updates: list):
+    """
+    Apply a list of updates on a figure. Each update is a pair (path, value), where the path is a tuple
+    of keys (and list positions) from the figure root, e.g. (('data', 0, 'x'), x_values).
+
+    Args:
+        figure (dict or dash.Patch): Figure (as dictionary) or Patch object where the updates are applied.
+        updates (list): List of pairs (path, value).
+
+    Returns:
+        figure (dict or dash.Patch): Updated figure.
+    """
+
+    for path, value in updates:
+        target = figure
+        for key in path[:-1]:
+            target = target.setdefault(key, {}) if isinstance(target, dict) else target[key]
+        target[path[-1]] = value
+
+    return figure
+
+def create_figure_report_skeleton(process_data_obj: ProcessData, circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Create the skeleton of the full report figure: subplots, axes, layout, empty traces and shapes with
+    placeholder coordinates. The data of the report is added with the updates of 'get_figure_report_updates'.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure (one row each). Default: all the
+                                                circuits of the Process Data object.
+
+    Returns:
+        skeleton (dict): Dictionary with the keys 'figure' (figure as dictionary) and 'shapes' (dictionary with
+                        the position of each shape, given by the key (row, shape name)).
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    nrows = len(circuit_names)
+    colorscale = get_two_colors_colorscale()
 
     fig_report = make_subplots(
         rows=nrows,
         cols=3,
         subplot_titles=['Monthly', 'Daily', 'Histogram (Selected month)'] * nrows,
-        row_titles = process_data_obj.circuit_names
+        row_titles = circuit_names
         )
 
-    for i, circ in enumerate(process_data_obj.circuit_names):
+    shapes_index = {}
 
-        ppk_goal = process_data_obj.ppk_goals[circ]
-
-        colors_month = get_bar_plot_colors(ppk_rep_df=ppk_rep_monthly, circ=circ, ppk_goal=ppk_goal)
-        hovertemplate_monthly = get_bar_plot_hovertemplate(time_unit='Month',
-                                                        time_unit_format='%b',
-                                                        process_data_obj=process_data_obj,
-                                                        ppk_rep_df=ppk_rep_monthly,
-                                                        ppk_goal=ppk_goal,
-                                                        prob_dist_name='Normal',
-                                                        circ=circ)
-
-        fig_report.add_trace(go.Bar(
-            x = ppk_rep_monthly.index,
-            y = ppk_rep_monthly[(circ, 'PPK')],
-            marker_color = colors_month,
-            hovertemplate=hovertemplate_monthly,
-            text=['{:.3f}'.format(ppk) for ppk in ppk_rep_monthly[(circ, 'PPK')]],
-            ),
-            row=i+1, col=1
-        )
+    for i, circ in enumerate(circuit_names):
 
-        colors_daily= get_bar_plot_colors(ppk_rep_df=ppk_rep_daily, circ=circ, ppk_goal=ppk_goal)
-        hovertemplate_daily = get_bar_plot_hovertemplate(time_unit='Date',
-                                                        time_unit_format='%d.%m',
-                                                        process_data_obj=process_data_obj,
-                                                        ppk_rep_df=ppk_rep_daily,
-                                                        ppk_goal=ppk_goal,
-                                                        prob_dist_name='Normal',
-                                                        circ=circ)
+        ppk_goal = process_data_obj.ppk_goals[circ]
 
-        fig_report.add_trace(go.Bar(
-            x = ppk_rep_daily.index,
-            y = ppk_rep_daily[(circ, 'PPK')],
-            marker_color = colors_daily,
-            hovertemplate = hovertemplate_daily,
-            text=['{:.3f}'.format(ppk) for ppk in ppk_rep_daily[(circ, 'PPK')]],
-            ),
-            row=i+1, col=2
-        )
+        for c in range(2):
+            fig_report.add_trace(go.Bar(
+                x = [],
+                y = [],
+                marker = dict(color = [], colorscale = colorscale, cmin = 0, cmax = 1),
+                ),
+                row=i+1, col=c+1
+            )
 
         # Adding the goal lines in the Bar plots
-        for c, (delta_x, ppk_rep_df) in enumerate(zip([15, 1], [ppk_rep_monthly, ppk_rep_daily])):
-
-            x0 = min(ppk_rep_df.index) - datetime.timedelta(days=delta_x)
-            x1 = max(ppk_rep_df.index) + datetime.timedelta(days=delta_x)
-
+        for c, shape_name in enumerate(['goal_monthly', 'goal_daily']):
+            shapes_index[(i, shape_name)] = len(fig_report.layout.shapes)
             fig_report.add_shape(
                 go.layout.Shape(
                     type='line',
@@ -228,8 +606,8 @@ def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.Data
                     yref='paper',
                     y0=ppk_goal,
                     y1=ppk_goal,
-                    x0=x0,
-                    x1=x1,
+                    x0=0,
+                    x1=1,
                     line = dict(
                             color=config.layout_config.plt_lim_line_color,
                             width=3
@@ -238,35 +616,34 @@ def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.Data
                 row=i+1, col=c+1
             )
 
-        # Histogram plot
-        fig_report.add_trace(go.Histogram(
-            x=process_data_selected_month[circ].values,
-            histnorm='probability density',
+        # Histogram plot (bins calculated in the server)
+        fig_report.add_trace(go.Bar(
+            x=[],
+            y=[],
             hoverinfo='skip',
             opacity=0.8,
             marker = dict(color = config.layout_config.plt_markers_color)
         ), row = i+1, col = 3)
 
         # Ploting the fitted normal distribution curve
-        x_dist_plot, y_dist_plot = calculate_normal_distribution(process_data_selected_month[circ].dropna().values)
-
         fig_report.add_trace(go.Scatter(
-            x = x_dist_plot,
-            y = y_dist_plot,
+            x = [],
+            y = [],
             mode = 'lines',
             marker = dict(color = config.layout_config.plt_line_color),
             hoverinfo='skip',
         ), row = i+1, col = 3)
 
         # Plotting the specification limits
-        for lim in process_data_obj.specifications_limits[circ].values():
+        for lim_text, lim in process_data_obj.specifications_limits[circ].items():
             if lim is not None:
+                shapes_index[(i, lim_text)] = len(fig_report.layout.shapes)
                 fig_report.add_shape(
                     dict(
                         x0=lim,
                         x1=lim,
                         y0=0.0,
-                        y1=1.5 * np.max(y_dist_plot),
+                        y1=1.0,
                         line=dict(
                             color=config.layout_config.plt_lim_line_color,
                             dash=config.layout_config.plt_lim_line_dash,
@@ -279,7 +656,7 @@ def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.Data
     for i in range(nrows):
         for c in [1, 2]:
             fig_report.update_yaxes(title_text='ppk', row=i+1, col=c)
-            fig_report.update_xaxes(title_text='date', row=i+1, col=c)
+            fig_report.update_xaxes(title_text='date', type='date', row=i+1, col=c)
 
         # Removing yaxes for the histogram
         fig_report.update_xaxes(title_text='controlled variable', visible=True, row=i+1, col=3)
@@ -293,56 +670,206 @@ def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.Data
         showlegend = False
     )
 
-    return fig_report
+    return dict(figure=fig_report.to_dict(), shapes=shapes_index)
 
-def create_figure_control_chart(process_data_obj: ProcessData, start_date: str, end_date: str) -> go.Figure:
+def get_figure_report_skeleton(process_data_obj: ProcessData, circuit_names: t.Sequence[str] = None) -> dict:
     """
-    Create figure of the Control Chart.
+    Get the skeleton of the full report figure ('create_figure_report_skeleton'), which is created once
+    for each set of circuits and stored in the derived cache of the Process Data object (the skeleton does not
+    depend on the samples, so it is kept when samples are appended).
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    return process_data_obj.get_derived(('figure_skeleton', 'report', tuple(circuit_names)),
+                                        lambda: create_figure_report_skeleton(process_data_obj, circuit_names),
+                                        update=lambda skeleton, new_index: skeleton)
+
+def get_figure_report_updates(process_data_obj: ProcessData, ppk_rep_monthly: pd.DataFrame,
+                            ppk_rep_daily: pd.DataFrame, histograms: dict, include_monthly: bool = True,
+                            circuit_names: t.Sequence[str] = None) -> list:
+    """
+    Create the updates (see 'apply_figure_updates') that fill the skeleton of the full report figure with
+    the trace data and the position of the moving shapes.
 
     Args:
         process_data_obj (ProcessData): Process Data object related to the plotted report.
-        start_date (str): Start date considered when filtering the data before plot.
-        end_date (str): End date considered when filtering the data before plot.
+        ppk_rep_monthly (pd.DataFrame): Dataframe with calculated Ppk index using a monthly window.
+        ppk_rep_daily (pd.DataFrame): Dataframe with calculated Ppk index using a daily window.
+        histograms (dict): Histograms of the selected month ('calculate_histograms').
+        include_monthly (bool, default=True): If False, the updates of the monthly Bar plots (which do not
+                                            depend on the selected month) are not created.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
 
     Returns:
-        fig_control_chart (go.Figure): Figure of the Control Chart plot.
+        updates (list): List of pairs (path, value).
     """
 
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    shapes_index = get_figure_report_skeleton(process_data_obj, circuit_names)['shapes']
+    updates = []
 
-    nrows = len(process_data_obj.circuit_names)
+    for i, circ in enumerate(circuit_names):
+
+        ppk_goal = process_data_obj.ppk_goals[circ]
+
+        for c, (time_unit, time_unit_format, delta_x, ppk_rep_df, shape_name) in enumerate(
+                                                                    [('Month', '%b', 15, ppk_rep_monthly, 'goal_monthly'),
+                                                                    ('Date', '%d.%m', 1, ppk_rep_daily, 'goal_daily')]):
+
+            if shape_name == 'goal_monthly' and not include_monthly:
+                continue
+
+            trace_idx = REPORT_TRACES_PER_ROW * i + c
+            color_codes = get_bar_plot_color_codes(ppk_rep_df=ppk_rep_df, circ=circ, ppk_goal=ppk_goal)
+            hovertemplate = get_bar_plot_hovertemplate(time_unit=time_unit,
+                                                    time_unit_format=time_unit_format,
+                                                    process_data_obj=process_data_obj,
+                                                    ppk_rep_df=ppk_rep_df,
+                                                    ppk_goal=ppk_goal,
+                                                    prob_dist_name='Normal',
+                                                    circ=circ)
+
+            updates += [
+                (('data', trace_idx, 'x'), ppk_rep_df.index),
+                (('data', trace_idx, 'y'), ppk_rep_df[(circ, 'PPK')].to_numpy()),
+                (('data', trace_idx, 'marker', 'color'), color_codes),
+                (('data', trace_idx, 'hovertemplate'), hovertemplate),
+                (('data', trace_idx, 'text'), ['{:.3f}'.format(ppk) for ppk in ppk_rep_df[(circ, 'PPK')]]),
+            ]
+
+            # Goal lines in the Bar plots
+            shape_idx = shapes_index[(i, shape_name)]
+            updates += [
+                (('layout', 'shapes', shape_idx, 'x0'), min(ppk_rep_df.index) - datetime.timedelta(days=delta_x)),
+                (('layout', 'shapes', shape_idx, 'x1'), max(ppk_rep_df.index) + datetime.timedelta(days=delta_x)),
+            ]
+
+        # Histogram plot and fitted normal distribution curve
+        histogram_circ = histograms[circ]
+        trace_idx = REPORT_TRACES_PER_ROW * i
+        updates += [
+            (('data', trace_idx + 2, 'x'), histogram_circ['bin_centers']),
+            (('data', trace_idx + 2, 'y'), histogram_circ['density']),
+            (('data', trace_idx + 2, 'width'), histogram_circ['bin_width']),
+            (('data', trace_idx + 3, 'x'), histogram_circ['x_dist_plot']),
+            (('data', trace_idx + 3, 'y'), histogram_circ['y_dist_plot']),
+        ]
+
+        # Specification limits (with the height of the skeleton if the circuit has no samples in the month)
+        y_dist_plot = histogram_circ['y_dist_plot']
+        lim_height = 1.5 * np.nanmax(y_dist_plot) if np.isfinite(y_dist_plot).any() else 1.0
+        for lim_text in process_data_obj.specifications_limits[circ].keys():
+            if (i, lim_text) in shapes_index:
+                updates.append((('layout', 'shapes', shapes_index[(i, lim_text)], 'y1'), lim_height))
+
+    return updates
+
+@instrument_stage(rows=lambda arguments: len(arguments['process_data_selected_month']))
+def create_figure_report(process_data_obj: ProcessData, ppk_rep_monthly: pd.DataFrame,
+                    ppk_rep_daily: pd.DataFrame, process_data_selected_month: pd.DataFrame,
+                    histograms: dict = None, circuit_names: t.Sequence[str] = None) -> go.Figure:
+    """
+    Create figure of the full report.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        ppk_rep_monthly (pd.DataFrame): Dataframe with calculated Ppk index using a monthly window.
+        ppk_rep_daily (pd.DataFrame): Dataframe with calculated Ppk index using a daily window.
+        process_data_selected_month (pd.DataFrame): Samples of the selected month related to the daily report.
+        histograms (dict, optional): Histograms of the selected month ('calculate_histograms'). If not given,
+                                    they are calculated from 'process_data_selected_month'.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
+
+    Returns:
+        fig_report (go.Figure): Figure of the Ppk index full report.
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    if histograms is None:
+        histograms = calculate_histograms(process_data_selected_month[circuit_names],
+                                        config.layout_config.plt_histogram_bins)
+
+    fig_report = copy.deepcopy(get_figure_report_skeleton(process_data_obj, circuit_names)['figure'])
+    apply_figure_updates(fig_report, get_figure_report_updates(process_data_obj, ppk_rep_monthly, ppk_rep_daily,
+                                                            histograms, circuit_names=circuit_names))
+
+    return go.Figure(fig_report)
+
+@instrument_stage(rows=lambda arguments: len(arguments['process_data_obj'].data))
+def create_report_month_store(process_data_obj: ProcessData, ppk_rep_monthly: pd.DataFrame,
+                            ppk_rep_daily: pd.DataFrame, n_bins: int, circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Create the data of the report month store: the updates of the full report figure (without the monthly
+    Bar plots) for each month of the data, so the month selection is applied in the browser by a clientside
+    callback. The paths of the updates are converted to lists to be serialized as JSON.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        ppk_rep_monthly (pd.DataFrame): Dataframe with calculated Ppk index using a monthly window.
+        ppk_rep_daily (pd.DataFrame): Dataframe with calculated Ppk index using a daily window (all months).
+        n_bins (int): Number of bins of each histogram.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
+
+    Returns:
+        store_data (dict): Dictionary with the plant name ('plant') and the updates of each month ('months',
+                        with the month number as string key).
+    """
+
+    months = {}
+    for month in ppk_rep_daily.index.month.unique():
+        histograms = get_histograms_selected_month(process_data_obj, month, n_bins)
+        updates = get_figure_report_updates(process_data_obj, ppk_rep_monthly,
+                                            ppk_rep_daily.loc[ppk_rep_daily.index.month == month],
+                                            histograms, include_monthly=False, circuit_names=circuit_names)
+        months[str(month)] = [[list(path), value] for path, value in updates]
+
+    return {'plant': process_data_obj.plant_name, 'months': months}
+
+def create_figure_control_chart_skeleton(process_data_obj: ProcessData, circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Create the skeleton of the Control Chart figure: subplots, axes, layout, empty traces, and shapes and
+    annotations with placeholder coordinates. The data of the Control Chart is added with the updates of
+    'get_figure_control_chart_updates'.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure (one row each). Default: all the
+                                                circuits of the Process Data object.
+
+    Returns:
+        skeleton (dict): Dictionary with the keys 'figure' (figure as dictionary), 'shapes' and 'annotations'
+                        (dictionaries with the position of each shape/annotation, given by the key (row, name)).
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    nrows = len(circuit_names)
+    colorscale = get_two_colors_colorscale()
 
     fig_control_chart = make_subplots(
         rows=nrows,
         cols=2,
         column_widths = [0.85, 0.15],
         subplot_titles=['Control Chart', 'Violin Plot'] * nrows,
-        row_titles = process_data_obj.circuit_names,
+        row_titles = circuit_names,
         shared_yaxes=True,
-        vertical_spacing=0.15,
+        # The figure height grows with the number of rows, so the spacing between rows is kept in pixels
+        vertical_spacing=min(0.15, 0.45 / nrows),
         horizontal_spacing=0.03
         )
 
-    for i, circ in enumerate(process_data_obj.circuit_names):
+    shapes_index = {}
+    annotations_index = {(i, 'title'): 2*i for i in range(nrows)}
 
-        hovertemplate_control_chart = get_scatter_plot_hovertemplate(process_data_obj=process_data_obj,
-                                                                    start_date=start_date,
-                                                                    end_date=end_date,
-                                                                    circ=circ)
-
-        colors_control_chart = get_scatter_plot_colors(process_data_obj=process_data_obj,
-                                                    start_date=start_date,
-                                                    end_date=end_date,
-                                                    circ=circ)
+    for i, circ in enumerate(circuit_names):
 
         fig_control_chart.add_trace(
             go.Scatter(
-                x = process_data_obj.data.loc[start_date:end_date, circ].index,
-                y = process_data_obj.data.loc[start_date:end_date, circ].values,
+                x = [],
+                y = [],
                 mode = 'markers',
-                marker = dict(color = colors_control_chart),
+                marker = dict(color = [], colorscale = colorscale, cmin = 0, cmax = 1),
                 line=dict(color = config.layout_config.plt_markers_color),
-                name = circ,
-                hovertemplate = hovertemplate_control_chart
+                name = circ
                 ),
                 row=i+1, col=1
         )
@@ -350,10 +877,11 @@ def create_figure_control_chart(process_data_obj: ProcessData, start_date: str,
         # Adding specification limits lines
         for lim_text, lim in process_data_obj.specifications_limits[circ].items():
             if lim is not None:
+                shapes_index[(i, lim_text)] = len(fig_control_chart.layout.shapes)
                 fig_control_chart.add_shape(
                     dict(
-                        x0=start_date,
-                        x1=end_date,
+                        x0=0,
+                        x1=1,
                         y0=lim,
                         y1=lim,
                         line=dict(
@@ -366,12 +894,13 @@ def create_figure_control_chart(process_data_obj: ProcessData, start_date: str,
                 )
 
                 # Adding text with names of the limits
+                annotations_index[(i, lim_text)] = len(fig_control_chart.layout.annotations)
                 fig_control_chart.add_annotation(
                     go.layout.Annotation(
                         text=f"<b>{lim_text}</b>",
                         xref='paper',
                         yref='paper',
-                        x=(pd.to_datetime(start_date, format='%Y-%m-%dT%H:%M:%S') - datetime.timedelta(days=1)),
+                        x=0,
                         y=lim,
                         showarrow=False,
                         font = dict(color=config.layout_config.plt_lim_line_color)
@@ -380,13 +909,13 @@ def create_figure_control_chart(process_data_obj: ProcessData, start_date: str,
                 )
 
         # Adding average line
-        average=process_data_obj.data.loc[start_date:end_date, circ].mean()
+        shapes_index[(i, 'Average')] = len(fig_control_chart.layout.shapes)
         fig_control_chart.add_shape(
             dict(
-                x0=start_date,
-                x1=end_date,
-                y0=average,
-                y1=average,
+                x0=0,
+                x1=1,
+                y0=0,
+                y1=0,
                 line=dict(
                     color=config.layout_config.plt_average_line,
                     width=3,
@@ -396,41 +925,65 @@ def create_figure_control_chart(process_data_obj: ProcessData, start_date: str,
             row=i+1, col=1
         )
 
+        annotations_index[(i, 'Average')] = len(fig_control_chart.layout.annotations)
         fig_control_chart.add_annotation(
             go.layout.Annotation(
                 text="<b>Average</b>",
                 xref='paper',
                 yref='paper',
-                x=(pd.to_datetime(start_date, format='%Y-%m-%dT%H:%M:%S') - datetime.timedelta(days=1)),
-                y=average,
+                x=0,
+                y=0,
                 showarrow=False,
                 font = dict(color=config.layout_config.plt_average_line)
             ),
             row=i+1, col=1
         )
 
-
+        # Violin plot (density estimated in the server)
         fig_control_chart.add_trace(
-            go.Violin(
-                y = process_data_obj.data.loc[start_date:end_date, circ].values,
-                name=circ,
-                box_visible=False,
-                points='all',
-                meanline_visible=True,
+            go.Scatter(
+                x = [],
+                y = [],
+                mode = 'lines',
+                fill = 'toself',
                 fillcolor=config.layout_config.plt_markers_color,
-                marker=dict(color=config.layout_config.plt_markers_color),
-                line_color='black',
+                line=dict(color='black', width=1),
                 opacity=0.6,
+                name=circ,
                 hoverinfo='skip'
             ),
             row = i+1, col=2
         )
 
+        fig_control_chart.add_trace(
+            go.Scatter(
+                x = [],
+                y = [],
+                mode = 'lines',
+                line=dict(color='black', width=2),
+                name=circ,
+                hoverinfo='skip'
+            ),
+            row = i+1, col=2
+        )
+
+        fig_control_chart.add_trace(
+            go.Scatter(
+                x = [],
+                y = [],
+                mode = 'markers',
+                marker=dict(color=config.layout_config.plt_markers_color, size=3),
+                opacity=0.6,
+                name=circ,
+                hoverinfo='skip'
+            ),
+            row = i+1, col=2
+        )
 
     for i in range(nrows):
         fig_control_chart.update_yaxes(title_text='process variable', row=i+1, col=1)
-        fig_control_chart.update_xaxes(title_text='date', row=i+1, col=1)
-        fig_control_chart.update_xaxes(title_text='', row=i+1, col=2)
+        fig_control_chart.update_xaxes(title_text='date', type='date', row=i+1, col=1)
+        fig_control_chart.update_xaxes(title_text='', showticklabels=False, zeroline=False, row=i+1, col=2)
 
     fig_control_chart.update_layout(
                 template = config.layout_config.plt_template_name,
@@ -440,4 +993,231 @@ def create_figure_control_chart(process_data_obj: ProcessData, start_date: str,
                 showlegend = False
     )
 
-    return fig_control_chart
+    return dict(figure=fig_control_chart.to_dict(), shapes=shapes_index, annotations=annotations_index)
+
+def get_figure_control_chart_skeleton(process_data_obj: ProcessData, circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Get the skeleton of the Control Chart figure ('create_figure_control_chart_skeleton'), which is created
+    once for each set of circuits and stored in the derived cache of the Process Data object (the skeleton
+    does not depend on the samples, so it is kept when samples are appended).
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    return process_data_obj.get_derived(('figure_skeleton', 'control_chart', tuple(circuit_names)),
+                                        lambda: create_figure_control_chart_skeleton(process_data_obj, circuit_names),
+                                        update=lambda skeleton, new_index: skeleton)
+
+def get_control_chart_scatter_updates(row: int, trace_data: dict) -> list:
+    """
+    Create the updates (see 'apply_figure_updates') of the scatter trace and subplot title of a row
+    of the Control Chart figure with the data returned by 'get_control_chart_trace_data'.
+    """
+
+    trace_idx = CONTROL_CHART_TRACES_PER_ROW * row
+
+    return [
+        (('data', trace_idx, 'x'), trace_data['x']),
+        (('data', trace_idx, 'y'), trace_data['y']),
+        (('data', trace_idx, 'marker', 'color'), trace_data['color_codes']),
+        (('data', trace_idx, 'hovertemplate'), trace_data['hovertemplate']),
+        (('layout', 'annotations', 2*row, 'text'), trace_data['title']),
+    ]
+
+def get_figure_control_chart_updates(process_data_obj: ProcessData, start_date: str, end_date: str,
+                                    circuit_names: t.Sequence[str] = None) -> list:
+    """
+    Create the updates (see 'apply_figure_updates') that fill the skeleton of the Control Chart figure with
+    the trace data and the position of the moving shapes and annotations.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
+
+    Returns:
+        updates (list): List of pairs (path, value).
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    skeleton = get_figure_control_chart_skeleton(process_data_obj, circuit_names)
+    shapes_index, annotations_index = skeleton['shapes'], skeleton['annotations']
+    updates = []
+
+    x_annotation = pd.Timestamp(start_date) - datetime.timedelta(days=1)
+
+    for i, circ in enumerate(circuit_names):
+
+        trace_data = get_control_chart_trace_data(process_data_obj=process_data_obj,
+                                                start_date=start_date,
+                                                end_date=end_date,
+                                                circ=circ,
+                                                max_points=config.layout_config.plt_control_chart_max_points)
+
+        # WebGL rendering for large ranges
+        n_raw_points = len(process_data_obj.data.loc[start_date:end_date, circ])
+        if n_raw_points > config.layout_config.plt_control_chart_webgl_threshold:
+            scatter_trace_type = 'scattergl'
+        else:
+            scatter_trace_type = 'scatter'
+
+        updates.append((('data', CONTROL_CHART_TRACES_PER_ROW * i, 'type'), scatter_trace_type))
+        updates += get_control_chart_scatter_updates(i, trace_data)
+
+        # Zoom reset of the control chart axis
+        xaxis_name = 'xaxis' if i == 0 else f'xaxis{2*i + 1}'
+        updates.append((('layout', xaxis_name, 'autorange'), True))
+
+        # Specification limits lines and their names
+        for lim_text in process_data_obj.specifications_limits[circ].keys():
+            if (i, lim_text) in shapes_index:
+                updates += [
+                    (('layout', 'shapes', shapes_index[(i, lim_text)], 'x0'), start_date),
+                    (('layout', 'shapes', shapes_index[(i, lim_text)], 'x1'), end_date),
+                    (('layout', 'annotations', annotations_index[(i, lim_text)], 'x'), x_annotation),
+                ]
+
+        # Average line
+        average = process_data_obj.data.loc[start_date:end_date, circ].mean()
+        updates += [
+            (('layout', 'shapes', shapes_index[(i, 'Average')], 'x0'), start_date),
+            (('layout', 'shapes', shapes_index[(i, 'Average')], 'x1'), end_date),
+            (('layout', 'shapes', shapes_index[(i, 'Average')], 'y0'), average),
+            (('layout', 'shapes', shapes_index[(i, 'Average')], 'y1'), average),
+            (('layout', 'annotations', annotations_index[(i, 'Average')], 'x'), x_annotation),
+            (('layout', 'annotations', annotations_index[(i, 'Average')], 'y'), average),
+        ]
+
+        # Violin plot (density estimated in the server)
+        violin_data = get_violin_plot_data(process_data_obj=process_data_obj,
+                                        start_date=start_date,
+                                        end_date=end_date,
+                                        circ=circ,
+                                        n_grid=config.layout_config.plt_violin_grid_points,
+                                        max_points=config.layout_config.plt_violin_max_points)
+
+        trace_idx = CONTROL_CHART_TRACES_PER_ROW * i
+        updates += [
+            (('data', trace_idx + 1, 'x'), violin_data['x']),
+            (('data', trace_idx + 1, 'y'), violin_data['y']),
+            (('data', trace_idx + 2, 'x'), violin_data['mean_x']),
+            (('data', trace_idx + 2, 'y'), violin_data['mean_y']),
+            (('data', trace_idx + 3, 'x'), violin_data['points_x']),
+            (('data', trace_idx + 3, 'y'), violin_data['points_y']),
+        ]
+
+    return updates
+
+@instrument_stage(rows=_count_range_rows)
+def create_figure_control_chart(process_data_obj: ProcessData, start_date: str, end_date: str,
+                                circuit_names: t.Sequence[str] = None) -> go.Figure:
+    """
+    Create figure of the Control Chart.
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        start_date (str): Start date considered when filtering the data before plot.
+        end_date (str): End date considered when filtering the data before plot.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
+
+    Returns:
+        fig_control_chart (go.Figure): Figure of the Control Chart plot.
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    fig_control_chart = copy.deepcopy(get_figure_control_chart_skeleton(process_data_obj, circuit_names)['figure'])
+    apply_figure_updates(fig_control_chart, get_figure_control_chart_updates(process_data_obj, start_date, end_date,
+                                                                            circuit_names))
+
+    return go.Figure(fig_control_chart)
+
+def get_control_chart_running_stats(process_data_obj: ProcessData, start_date: str, end_date: str,
+                                    circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Calculate the running statistics (number and sum of the valid samples) of each circuit between
+    'start_date' and 'end_date', which are updated incrementally by 'get_control_chart_live_updates'.
+
+    Returns:
+        running_stats (dict): Dictionary with the circuit name as key and the list [count, sum] as value.
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    data_range = process_data_obj.data.loc[start_date:end_date, circuit_names]
+
+    return {circ: [int(data_range[circ].count()), float(data_range[circ].sum())] for circ in circuit_names}
+
+def get_control_chart_live_updates(process_data_obj: ProcessData, last_timestamp, running_stats: dict,
+                                max_points: int, circuit_names: t.Sequence[str] = None) -> dict:
+    """
+    Create the incremental updates of the Control Chart in live mode with the samples newer than
+    'last_timestamp': the new points of the scatter traces (in the format of the 'extendData' property of the
+    Graph component) and the new position of the average and specification limits lines and annotations
+    (in the format of 'Plotly.relayout'). The average is updated from the running statistics, so the cost
+    depends only on the number of new samples (the data of the Process Data object is read with
+    'get_data_since', without consolidating the appended samples).
+
+    Args:
+        process_data_obj (ProcessData): Process Data object related to the plotted report.
+        last_timestamp: Timestamp of the last sample plotted in the figure.
+        running_stats (dict): Running statistics of the plotted samples ('get_control_chart_running_stats').
+        max_points (int): Maximum number of new points sent for each trace.
+        circuit_names (sequence of str, optional): Circuits plotted in the figure. Default: all the circuits.
+
+    Returns:
+        live_updates (dict): Dictionary with the keys 'extend_data' (dictionary with the new 'x', 'y',
+                            'marker.color' and 'hovertemplate' of each trace), 'trace_indices', 'relayout',
+                            'running_stats' (updated statistics) and 'last_timestamp' (timestamp of the last
+                            new sample). Returns None if there are no new samples.
+    """
+
+    circuit_names = _get_circuit_names(process_data_obj, circuit_names)
+    new_data = process_data_obj.get_data_since(last_timestamp)
+    new_data = new_data.iloc[new_data.index.searchsorted(pd.Timestamp(last_timestamp), side='right'):]
+    if len(new_data) == 0:
+        return None
+
+    skeleton = get_figure_control_chart_skeleton(process_data_obj, circuit_names)
+    shapes_index, annotations_index = skeleton['shapes'], skeleton['annotations']
+    running_stats = {circ: list(running_stats[circ]) for circ in circuit_names}
+
+    # Only the last points are sent, as older points would be removed by the 'max_points' limit of the trace
+    start_date, end_date = new_data.index[-min(len(new_data), max_points)], new_data.index[-1]
+    end_date_text = end_date.isoformat()
+
+    extend_data = {'x': [], 'y': [], 'marker.color': [], 'hovertemplate': []}
+    relayout = {}
+
+    for i, circ in enumerate(circuit_names):
+        new_values = new_data[circ]
+        running_stats[circ][0] += int(new_values.count())
+        running_stats[circ][1] += float(new_values.sum())
+
+        plotted_values = new_values.loc[start_date:end_date]
+        extend_data['x'].append([timestamp.isoformat() for timestamp in plotted_values.index])
+        extend_data['y'].append([None if np.isnan(value) else value for value in plotted_values.tolist()])
+        extend_data['marker.color'].append(
+            get_scatter_plot_color_codes(process_data_obj=process_data_obj, start_date=start_date,
+                                        end_date=end_date, circ=circ, data=new_data).tolist())
+        extend_data['hovertemplate'].append(
+            get_scatter_plot_hovertemplate(process_data_obj=process_data_obj, start_date=start_date,
+                                        end_date=end_date, circ=circ, data=new_data))
+
+        for lim_text in process_data_obj.specifications_limits[circ].keys():
+            if (i, lim_text) in shapes_index:
+                relayout[f'shapes[{shapes_index[(i, lim_text)]}].x1'] = end_date_text
+
+        count, total = running_stats[circ]
+        if count:
+            average = total / count
+            relayout.update({
+                f'shapes[{shapes_index[(i, "Average")]}].x1': end_date_text,
+                f'shapes[{shapes_index[(i, "Average")]}].y0': average,
+                f'shapes[{shapes_index[(i, "Average")]}].y1': average,
+                f'annotations[{annotations_index[(i, "Average")]}].y': average,
+            })
+
+    return dict(extend_data=extend_data,
+                trace_indices=[CONTROL_CHART_TRACES_PER_ROW * i for i in range(len(circuit_names))],
+                relayout=relayout,
+                running_stats=running_stats,
+                last_timestamp=end_date_text)
@@ -0,0 +1,54 @@
+import gc
+
+from app import create_app
+
+def create_server():
+    """
+    WSGI factory of the application for production servers (e.g. gunicorn, see 'gunicorn.conf.py').
+    The application is created, the data of the industrial park is loaded and the statistics and default
+    figures are precomputed before the server is returned, so with 'preload_app' they are created once in the
+    master process and shared copy-on-write by the forked workers.
+
+    Returns:
+        server (flask.Flask): Flask server of the Dash application.
+    """
+
+    from app_layout import precompute_default_figures
+    from pipeline import get_data_ind_park
+    from server.memory import enforce_configured_memory_budget
+    from server.warmup import warm_up
+
+    data_ind_park = get_data_ind_park()
+    app = create_app(data_ind_park)
+
+    warm_up(data_ind_park, [precompute_default_figures])
+    enforce_configured_memory_budget(data_ind_park)
+
+    # Objects created so far are moved to a permanent generation, so the garbage collector of the
+    # workers does not write to (and copy) the pages shared with the master process
+    gc.freeze()
+
+    return app.server
+
+def start_worker_scheduler():
+    """
+    Start the warm-up and alert schedulers and the live poller in a server worker. Threads are not copied to
+    forked processes, so the schedulers are started after the fork (see 'post_fork' in 'gunicorn.conf.py').
+    The data of each worker may receive new samples, so each worker evaluates its alerts, which are
+    deduplicated by the database.
+
+    Returns:
+        schedulers (tuple): Warm-up and alert schedulers and live poller (None if disabled).
+    """
+
+    from app_layout import precompute_default_figures
+    from pipeline import get_data_ind_park
+    from server.alerts import start_alert_scheduler
+    from server.live import start_live_poller
+    from server.memory import enforce_configured_memory_budget
+    from server.warmup import start_warm_up_scheduler
+
+    data_ind_park = get_data_ind_park()
+    return (start_warm_up_scheduler(data_ind_park, [precompute_default_figures], [enforce_configured_memory_budget]),
+            start_alert_scheduler(data_ind_park),
+            start_live_poller(data_ind_park))
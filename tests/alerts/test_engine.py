@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from src.alerts.engine import (
+    RULE_OUT_OF_SPEC,
+    RULE_PPK_BELOW_GOAL,
+    RULE_RUN_SAME_SIDE,
+    AlertEngine,
+    get_run_lengths
+)
+from src.alerts.sinks import SQLiteAlertSink
+from src.data.process_data import SetProcessData
+from tests.test_fixtures import create_seeded_process_data
+
+class _ListSink(object):
+    def __init__(self):
+        self.alerts = []
+
+    def write(self, alerts):
+        self.alerts += alerts
+        return list(alerts)
+
+def _reference_run_lengths(sides, previous_side, previous_length):
+    run_lengths = []
+    side, length = previous_side, previous_length
+    for s in sides:
+        length = 0 if s == 0 else (length + 1 if s == side else 1)
+        side = s
+        run_lengths.append(length)
+    return run_lengths
+
+def _split_process_data(process_data_obj, n_rows):
+    # Process Data object with the first 'n_rows' samples, and the remaining samples
+    data = process_data_obj.data
+    process_data_obj.update_data(data.iloc[:n_rows].copy())
+    return data.iloc[n_rows:]
+
+class TestRunLengths(object):
+
+    def test_run_lengths_match_reference(self):
+        rng = np.random.default_rng(0)
+        sides = rng.choice([-1, 0, 1], size=500, p=[0.45, 0.1, 0.45])
+
+        for previous_side, previous_length in [(0, 0), (1, 4), (-1, 8)]:
+            run_lengths = get_run_lengths(sides, previous_side, previous_length)
+
+            assert run_lengths.tolist() == _reference_run_lengths(sides, previous_side, previous_length)
+
+class TestAlertEngine(object):
+
+    def test_incremental_evaluation_matches_single_evaluation(self):
+        full_sink, incremental_sink = _ListSink(), _ListSink()
+        full_engine = AlertEngine(SetProcessData([create_seeded_process_data('Plant 1', 2_000, 4, seed=0)]),
+                                [full_sink], lookback_days=365)
+        process_data_obj = create_seeded_process_data('Plant 1', 2_000, 4, seed=0)
+        new_data = _split_process_data(process_data_obj, 1_200)
+        incremental_engine = AlertEngine(SetProcessData([process_data_obj]), [incremental_sink], lookback_days=365)
+
+        full_engine.evaluate()
+        incremental_engine.evaluate()
+        for chunk_rows in np.array_split(np.arange(len(new_data)), 4):
+            process_data_obj.append_data(new_data.iloc[chunk_rows])
+            incremental_engine.evaluate()
+
+        assert {alert['rule'] for alert in full_sink.alerts} == {RULE_OUT_OF_SPEC, RULE_PPK_BELOW_GOAL, RULE_RUN_SAME_SIDE}
+        assert sorted(alert['key'] for alert in incremental_sink.alerts) == sorted(alert['key'] for alert in full_sink.alerts)
+
+    def test_evaluation_processes_only_new_samples(self, monkeypatch):
+        process_data_obj = create_seeded_process_data('Plant 1', 2_000, 4, seed=0)
+        new_data = _split_process_data(process_data_obj, 1_990)
+        alert_engine = AlertEngine(SetProcessData([process_data_obj]), [_ListSink()], lookback_days=365)
+        alert_engine.evaluate()
+
+        evaluated_rows = []
+        evaluate_samples = alert_engine._evaluate_samples
+        def _evaluate_samples(process_data_obj, new_data, state):
+            evaluated_rows.append(len(new_data))
+            return evaluate_samples(process_data_obj, new_data, state)
+        monkeypatch.setattr(alert_engine, '_evaluate_samples', _evaluate_samples)
+
+        # Plants without new data are skipped
+        assert alert_engine.evaluate() == []
+        process_data_obj.append_data(new_data)
+        alert_engine.evaluate()
+
+        assert evaluated_rows == [len(new_data)]
+
+    def test_ppk_alerts_only_for_complete_buckets(self):
+        process_data_obj = create_seeded_process_data('Plant 1', 2_000, 4, seed=0)
+        sink = _ListSink()
+
+        AlertEngine(SetProcessData([process_data_obj]), [sink], lookback_days=365).evaluate()
+
+        last_day = process_data_obj.data.index[-1].normalize()
+        ppk_alert_days = {pd.Timestamp(alert['timestamp']) for alert in sink.alerts if alert['rule'] == RULE_PPK_BELOW_GOAL}
+        assert ppk_alert_days
+        assert max(ppk_alert_days) < last_day
+
+    def test_alerts_deduplicated_between_engines(self, tmp_path):
+        data_ind_park = SetProcessData([create_seeded_process_data('Plant 1', 500, 3, seed=0)])
+
+        alerts = AlertEngine(data_ind_park, [SQLiteAlertSink(tmp_path / 'alerts.sqlite3')]).evaluate()
+
+        assert len(alerts)
+        assert AlertEngine(data_ind_park, [SQLiteAlertSink(tmp_path / 'alerts.sqlite3')]).evaluate() == []
@@ -0,0 +1,35 @@
+import json
+
+from src.alerts.engine import make_alert
+from src.alerts.sinks import LogAlertSink, SQLiteAlertSink
+
+def _create_alerts(n_alerts, plant_name='Plant A'):
+    return [make_alert(plant_name, 'Circuit 1', 'out_of_spec', f'2023-01-01 {hour:02d}:00', 1.0, 'Out of spec')
+            for hour in range(n_alerts)]
+
+class TestSQLiteAlertSink(object):
+
+    def test_write_returns_only_new_alerts(self, tmp_path):
+        sink = SQLiteAlertSink(tmp_path / 'alerts.sqlite3')
+
+        assert sink.write(_create_alerts(2)) == _create_alerts(2)
+        assert sink.write(_create_alerts(3)) == _create_alerts(3)[2:]
+
+    def test_get_alerts(self, tmp_path):
+        sink = SQLiteAlertSink(tmp_path / 'alerts.sqlite3')
+        sink.write(_create_alerts(3) + _create_alerts(2, plant_name='Plant B'))
+
+        assert len(sink.get_alerts()) == 5
+        assert len(sink.get_alerts(limit=2)) == 2
+        assert {alert['plant'] for alert in sink.get_alerts(plant_name='Plant B')} == {'Plant B'}
+
+class TestLogAlertSink(object):
+
+    def test_write_appends_new_alerts(self, tmp_path):
+        sink = LogAlertSink(tmp_path / 'logs' / 'alerts.log')
+
+        sink.write(_create_alerts(2))
+        sink.write(_create_alerts(3))
+
+        lines = (tmp_path / 'logs' / 'alerts.log').read_text().splitlines()
+        assert [json.loads(line) for line in lines] == _create_alerts(3)
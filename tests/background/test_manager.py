@@ -0,0 +1,56 @@
+import time
+
+from src.background.manager import (
+    PROGRESS_STEPS,
+    create_background_callback_manager,
+    get_background_callback_kwargs,
+    progress_callback,
+    report_progress
+)
+from src.app_layout import _triggered_ids
+
+class TestBackgroundManager(object):
+
+    def test_disabled_manager(self, tmpdir):
+        assert create_background_callback_manager(False, str(tmpdir)) is None
+        assert get_background_callback_kwargs(progress_id='progress', running_id='running') == {}
+
+    def test_enabled_manager(self, tmpdir):
+        manager = create_background_callback_manager(True, str(tmpdir))
+
+        assert manager is not None
+        assert hasattr(manager, 'call_job_fn')
+
+    def test_report_progress(self):
+        progress = []
+
+        report_progress(None, 'compute')
+        for step in PROGRESS_STEPS:
+            report_progress(progress.append, step)
+
+        assert progress == [('0', '3'), ('1', '3'), ('2', '3')]
+
+    def test_progress_callback_without_manager(self):
+        @progress_callback
+        def func(a, b, set_progress=None):
+            return a, b, set_progress
+
+        assert func(1, 2) == (1, 2, None)
+
+    def test_triggered_ids_in_background_job(self, tmpdir):
+        # The Patch outputs of the figure callbacks depend on the trigger, which the job process receives
+        # in the callback context
+        manager = create_background_callback_manager(True, str(tmpdir))
+
+        def callback(set_progress, value):
+            set_progress(('0', '3'))
+            return sorted(_triggered_ids()), value
+
+        job = manager.call_job_fn('job-key', manager.make_job_fn(callback, progress=True), ['Plant A'],
+                                {'triggered_inputs': [{'prop_id': 'circuit-page.value', 'value': 2}]})
+
+        deadline = time.monotonic() + 30
+        while not manager.result_ready('job-key') and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert manager.get_result('job-key', job) == (['circuit-page'], 'Plant A')
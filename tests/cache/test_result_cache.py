@@ -0,0 +1,101 @@
+import src.cache.result_cache as result_cache_module
+from src.cache.result_cache import (
+    FileSystemResultCache,
+    LRUResultCache,
+    TieredResultCache,
+    cached_result,
+    create_result_cache,
+    get_result_cache,
+    make_cache_key
+)
+from tests.test_fixtures import create_seeded_process_data
+
+class TestResultCache(object):
+
+    def test_lru_eviction(self):
+        cache = LRUResultCache(maxsize=2)
+        keys = [make_cache_key('Plant A', 'v1', i) for i in range(3)]
+
+        cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.get(keys[0])
+        cache.set(keys[2], 2)
+
+        assert cache.get(keys[0]) == 0
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == 2
+
+    def test_invalidate_plant(self, tmpdir):
+        cache = TieredResultCache(LRUResultCache(maxsize=10), FileSystemResultCache(str(tmpdir)))
+        key_a = make_cache_key('Plant A', 'v1', 'figure')
+        key_b = make_cache_key('Plant B', 'v1', 'figure')
+
+        cache.set(key_a, {'data': [1, 2]})
+        cache.set(key_b, {'data': [3, 4]})
+        cache.invalidate_plant('Plant A')
+
+        assert cache.get(key_a) is None
+        assert cache.get(key_b) == {'data': [3, 4]}
+
+    def test_filesystem_cache_shared_between_instances(self, tmpdir):
+        key = make_cache_key('Plant A', 'v1', 'figure')
+        FileSystemResultCache(str(tmpdir)).set(key, {'data': [1, 2]})
+
+        assert FileSystemResultCache(str(tmpdir)).get(key) == {'data': [1, 2]}
+
+    def test_key_changes_with_data_version(self):
+        assert make_cache_key('Plant A', 'v1', 'figure', 5) == make_cache_key('Plant A', 'v1', 'figure', 5)
+        assert make_cache_key('Plant A', 'v1', 'figure', 5) != make_cache_key('Plant A', 'v2', 'figure', 5)
+        assert make_cache_key('Plant A', 'v1', 'figure', 5) != make_cache_key('Plant B', 'v1', 'figure', 5)
+
+    def test_create_result_cache_backends(self, tmpdir):
+        assert isinstance(create_result_cache('lru', 10, str(tmpdir)), LRUResultCache)
+        assert isinstance(create_result_cache('filesystem', 10, str(tmpdir)), TieredResultCache)
+
+    def test_result_cache_created_on_first_use(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(result_cache_module, '_result_cache', None)
+        monkeypatch.setattr(result_cache_module, 'PROJECT_ROOT', tmp_path)
+        monkeypatch.setattr(result_cache_module.config.cache_config, 'result_cache_backend', 'filesystem')
+        monkeypatch.setattr(result_cache_module.config.cache_config, 'result_cache_dir', 'results')
+
+        assert not (tmp_path / 'results').exists()
+        result_cache = get_result_cache()
+
+        assert isinstance(result_cache, TieredResultCache)
+        assert (tmp_path / 'results').is_dir()
+        assert get_result_cache() is result_cache
+
+    def test_shared_result_cache_with_background_callbacks(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(result_cache_module, '_result_cache', None)
+        monkeypatch.setattr(result_cache_module, 'PROJECT_ROOT', tmp_path)
+        monkeypatch.setattr(result_cache_module.config.cache_config, 'result_cache_backend', 'lru')
+        monkeypatch.setattr(result_cache_module.config.background_config, 'background_callbacks', True)
+
+        result_cache = get_result_cache()
+
+        assert isinstance(result_cache, TieredResultCache)
+        assert not isinstance(result_cache.shared_cache, LRUResultCache)
+
+    def test_results_of_past_ranges_kept_after_append(self, monkeypatch):
+        monkeypatch.setattr(result_cache_module, '_result_cache', LRUResultCache(10))
+        process_data_obj = create_seeded_process_data('Plant A', n_rows=200, n_circuits=2, seed=0)
+        new_data = process_data_obj.data.iloc[-10:]
+        process_data_obj.data = process_data_obj.data.iloc[:-10]
+        calls = []
+
+        @cached_result(lambda end_date: (process_data_obj, (end_date,), end_date))
+        def figure_until(end_date):
+            calls.append(end_date)
+            return len(process_data_obj.data.loc[:end_date])
+
+        past_date, last_date = process_data_obj.data.index[-20], process_data_obj.data.index[-1]
+        figure_until(past_date)
+        figure_until(last_date)
+        process_data_obj.append_data(new_data.iloc[:5])
+        figure_until(past_date)
+        figure_until(last_date)
+        figure_until(new_data.index[-1])
+        process_data_obj.append_data(new_data.iloc[5:])
+
+        assert figure_until(new_data.index[-1]) == len(process_data_obj.data)
+        assert calls == [past_date, last_date, new_data.index[-1], new_data.index[-1]]
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from src.data.frame_buffer import FrameBuffer
+
+def _create_frame(start, periods):
+    index = pd.date_range(start=start, periods=periods, freq='1H')
+    return pd.DataFrame(data=np.arange(periods, dtype=float), index=index, columns=['Circuit 1'])
+
+class TestFrameBuffer(object):
+
+    def test_appended_chunks_are_consolidated_when_read(self):
+        frame = _create_frame('2023-01-01', 100)
+        data_buffer = FrameBuffer(frame.iloc[:80])
+
+        data_buffer.append(frame.iloc[80:90])
+        data_buffer.append(frame.iloc[90:])
+
+        assert len(data_buffer) == 100
+        assert len(data_buffer.frames) == 3
+        assert data_buffer.last_index == frame.index[-1]
+        pd.testing.assert_frame_equal(data_buffer.frame, frame, check_freq=False)
+        assert len(data_buffer.frames) == 1
+
+    def test_append_replaces_the_rows_from_the_first_timestamp(self):
+        frame = _create_frame('2023-01-01', 100)
+        data_buffer = FrameBuffer(frame.iloc[:80])
+        data_buffer.append(frame.iloc[80:90])
+
+        data_buffer.append(frame.iloc[85:] + 1.0)
+        data_buffer.append(frame.iloc[70:75] + 2.0)
+
+        expected = pd.concat([frame.iloc[:70], frame.iloc[70:75] + 2.0])
+        pd.testing.assert_frame_equal(data_buffer.frame, expected, check_freq=False)
+
+    def test_tail_does_not_consolidate_the_chunks(self):
+        frame = _create_frame('2023-01-01', 100)
+        data_buffer = FrameBuffer(frame.iloc[:80], max_chunks=4)
+        for start in range(80, 100, 5):
+            data_buffer.append(frame.iloc[start:start + 5])
+
+        pd.testing.assert_frame_equal(data_buffer.tail(frame.index[78]), frame.iloc[78:], check_freq=False)
+        assert len(data_buffer.tail(frame.index[-1] + pd.Timedelta('1H'))) == 0
+        assert len(data_buffer.frames) == 5
+
+        data_buffer.append(_create_frame(frame.index[-1] + pd.Timedelta('1H'), 1))
+        assert len(data_buffer.frames) == 1
@@ -0,0 +1,63 @@
+import time
+
+import pandas as pd
+
+from src.data.live_feed import LivePoller, poll_live_data, simulate_live_samples
+from src.data.process_data import ProcessData, SetProcessData
+from tests.test_fixtures import test_process_data_parameters
+
+class TestLiveFeed(object):
+
+    def test_simulated_samples_are_reproducible(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        until = test_data.data.index[-1] + pd.Timedelta('5H')
+
+        new_data = simulate_live_samples(test_data, until=until)
+
+        assert len(new_data) == 5
+        assert list(new_data.columns) == test_data.circuit_names
+        pd.testing.assert_frame_equal(new_data, simulate_live_samples(test_data, until=until))
+
+    def test_poll_live_data_appends_samples(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        test_data.data = test_data.data.iloc[:-3]
+        n_samples = len(test_data.data)
+
+        assert poll_live_data(test_data)
+        assert len(test_data.data) >= n_samples + 3
+        assert not poll_live_data(test_data)
+
+    def test_plants_loaded_from_a_source_are_not_simulated(self, test_process_data_parameters):
+        sample_data = ProcessData(**test_process_data_parameters)
+        test_data = ProcessData(**test_process_data_parameters, data=sample_data.data.iloc[:-3])
+        n_samples = len(test_data.data)
+
+        assert sample_data.is_sample_data
+        assert not test_data.is_sample_data
+        assert not poll_live_data(test_data)
+        assert len(test_data.data) == n_samples
+
+    def test_live_poller_appends_samples_of_the_loaded_plants(self, test_process_data_parameters, tmp_path):
+        plants = [ProcessData(**dict(test_process_data_parameters, plant_name=f'Plant {i}')) for i in range(2)]
+        for plant in plants:
+            plant.data = plant.data.iloc[:-3]
+        plants[1].unload_data(tmp_path)
+        poller = LivePoller(SetProcessData(plants), interval_seconds=0.01)
+
+        assert poller.poll() == ['Plant 0']
+        assert not plants[1].is_loaded
+        assert poller.poll() == []
+
+    def test_live_poller_thread(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        test_data.data = test_data.data.iloc[:-3]
+        n_samples = len(test_data.data)
+        poller = LivePoller(SetProcessData([test_data]), interval_seconds=0.01)
+
+        poller.start()
+        deadline = time.time() + 5
+        while len(test_data.data) == n_samples and time.time() < deadline:
+            time.sleep(0.01)
+        poller.stop()
+
+        assert len(test_data.data) >= n_samples + 3
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.data.loaders import (DataSource, FileSource, HTTPSource, PlantDataLoadError, SQLiteSource,
+                            load_data_ind_park, load_plants_data, refresh_data_ind_park)
+from tests.test_fixtures import create_seeded_process_data
+
+class SlowSource(DataSource):
+    """
+    Source that waits 'delay' seconds before returning its data, failing the first 'n_failures' fetches.
+    """
+
+    def __init__(self, data: pd.DataFrame, delay: float = 0.0, n_failures: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.data = data
+        self.delay = delay
+        self.n_failures = n_failures
+        self.n_fetches = 0
+
+    async def fetch(self, timeout, executor):
+        self.n_fetches += 1
+        await asyncio.sleep(self.delay)
+        if self.n_fetches <= self.n_failures:
+            raise ConnectionError("Source unavailable")
+        return self.data
+
+    def parse(self, raw):
+        return raw
+
+SLOW_RESPONSE_SECONDS = 4
+
+@pytest.fixture
+def plants():
+    return [create_seeded_process_data(f'Plant {i}', n_rows=200, n_circuits=2, seed=i) for i in range(4)]
+
+def get_plant_parameters(plants):
+    return [{'plant_name': plant.plant_name, 'circuit_names': plant.circuit_names,
+            'specifications_limits': plant.specifications_limits, 'ppk_goals': plant.ppk_goals}
+            for plant in plants]
+
+@pytest.fixture
+def historian_url(plants):
+    # Local HTTP service that returns the data of the plants as JSON ('split' orientation)
+    # The path '/slow' does not respond for 'SLOW_RESPONSE_SECONDS' seconds
+    payloads = {f'/{i}': plant.data.to_json(orient='split', date_format='iso').encode('utf-8')
+                for i, plant in enumerate(plants)}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/slow':
+                time.sleep(SLOW_RESPONSE_SECONDS)
+            payload = payloads.get(self.path)
+            if payload is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+class TestLoaders(object):
+
+    def test_load_from_file_http_and_sqlite_sources(self, plants, historian_url, tmp_path):
+        plants[0].data.to_csv(tmp_path / 'plant_0.csv')
+
+        db_path = tmp_path / 'historian.sqlite3'
+        with sqlite3.connect(db_path) as connection:
+            plants[2].data.rename_axis('timestamp').reset_index().astype({'timestamp': str}).to_sql(
+                'plant_2', connection, index=False)
+        connection.close()
+
+        sources = {'Plant 0': FileSource(tmp_path / 'plant_0.csv'),
+                'Plant 1': HTTPSource(f'{historian_url}/1'),
+                'Plant 2': SQLiteSource(db_path, 'SELECT * FROM plant_2 ORDER BY timestamp'),
+                'Plant 3': HTTPSource(f'{historian_url}/3')}
+
+        data_ind_park = load_data_ind_park(get_plant_parameters(plants), sources)
+
+        assert data_ind_park.list_plant_names == [plant.plant_name for plant in plants]
+        for plant in plants:
+            pd.testing.assert_frame_equal(data_ind_park[plant.plant_name].data, plant.data, check_freq=False)
+
+    def test_sources_are_fetched_concurrently(self, plants):
+        sources = {plant.plant_name: SlowSource(plant.data, delay=0.3) for plant in plants}
+
+        start = time.perf_counter()
+        data_ind_park = load_data_ind_park(get_plant_parameters(plants), sources, max_concurrency=4)
+
+        assert time.perf_counter() - start < 0.3 * len(plants) / 2
+        assert len(data_ind_park.process_data_objs) == len(plants)
+
+    def test_concurrency_is_bounded(self, plants):
+        sources = {plant.plant_name: SlowSource(plant.data, delay=0.1) for plant in plants}
+
+        start = time.perf_counter()
+        asyncio.run(load_plants_data(sources, max_concurrency=1))
+
+        assert time.perf_counter() - start >= 0.1 * len(plants)
+
+    def test_failed_fetches_are_retried(self, plants):
+        source = SlowSource(plants[0].data, n_failures=2)
+
+        plants_data = asyncio.run(load_plants_data({'Plant 0': source}, retries=2, retry_backoff_seconds=0.01))
+
+        assert source.n_fetches == 3
+        pd.testing.assert_frame_equal(plants_data['Plant 0'], plants[0].data)
+
+    def test_timeout_and_retries_of_the_source(self, plants):
+        sources = {'Plant 0': SlowSource(plants[0].data, delay=1.0, timeout=0.05, retries=1),
+                'Plant 1': SlowSource(plants[1].data)}
+
+        plants_data = asyncio.run(load_plants_data(sources, timeout=30, retries=3, retry_backoff_seconds=0.01))
+
+        assert sources['Plant 0'].n_fetches == 2
+        assert isinstance(plants_data['Plant 0'], asyncio.TimeoutError)
+        pd.testing.assert_frame_equal(plants_data['Plant 1'], plants[1].data)
+
+        with pytest.raises(PlantDataLoadError, match='Plant 0'):
+            load_data_ind_park(get_plant_parameters(plants[:2]), sources, retries=0)
+
+    def test_refresh_appends_new_samples(self, plants):
+        data_ind_park = load_data_ind_park(get_plant_parameters(plants[:2]),
+                                        {plant.plant_name: SlowSource(plant.data.iloc[:-10]) for plant in plants[:2]})
+        data_versions = [obj.data_version for obj in data_ind_park.process_data_objs]
+
+        sources = {'Plant 0': SlowSource(plants[0].data),
+                'Plant 1': SlowSource(plants[1].data, n_failures=10)}
+        refreshed_plants = refresh_data_ind_park(data_ind_park, sources, retries=0)
+
+        assert refreshed_plants == ['Plant 0']
+        assert len(data_ind_park['Plant 0'].data) == len(plants[0].data)
+        assert data_ind_park['Plant 0'].data_version != data_versions[0]
+        assert len(data_ind_park['Plant 1'].data) == len(plants[1].data) - 10
+        assert data_ind_park['Plant 1'].data_version == data_versions[1]
+
+    def test_timeout_of_a_source_that_does_not_respond(self, plants, historian_url):
+        sources = {'Plant 0': HTTPSource(f'{historian_url}/slow', timeout=0.5, retries=1),
+                'Plant 1': HTTPSource(f'{historian_url}/1')}
+
+        start = time.perf_counter()
+        with pytest.raises(PlantDataLoadError, match='Plant 0'):
+            load_data_ind_park(get_plant_parameters(plants[:2]), sources, retry_backoff_seconds=0.01)
+
+        assert time.perf_counter() - start < SLOW_RESPONSE_SECONDS / 2
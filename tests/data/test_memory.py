@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.memory import enforce_memory_budget, estimate_size, get_memory_report
+from src.data.process_data import ProcessData, SetProcessData
+from tests.test_fixtures import create_seeded_process_data
+
+class TestEstimateSize(object):
+
+    def test_arrays_and_containers(self):
+        values = np.zeros(10_000)
+
+        assert estimate_size(values) >= values.nbytes
+        assert estimate_size({'a': values, 'b': [values]}) < 2 * values.nbytes
+        assert estimate_size(pd.DataFrame({'x': values})) >= values.nbytes
+        assert estimate_size(['x' * 1000]) > 1000
+
+class TestMemoryBudget(object):
+
+    def _create_park(self):
+        plants = [create_seeded_process_data(f'Plant {i + 1}', n_rows=2_000, n_circuits=5, seed=i) for i in range(3)]
+        for obj in plants:
+            obj.get_derived('table', lambda: np.zeros(100_000))
+        return SetProcessData(plants)
+
+    def test_memory_report(self):
+        data_ind_park = self._create_park()
+
+        memory_report = get_memory_report(data_ind_park, budget_bytes=100)
+
+        assert set(memory_report['plants']) == set(data_ind_park.list_plant_names)
+        assert memory_report['plants']['Plant 1']['derived'] >= 800_000
+        assert memory_report['plants']['Plant 1']['data'] >= 2_000 * 5 * 8
+        assert memory_report['total_bytes'] == sum(usage['total'] for usage in memory_report['plants'].values())
+
+    def test_derived_tables_evicted_first(self, tmp_path):
+        data_ind_park = self._create_park()
+        data_ind_park['Plant 3']
+        total_bytes = get_memory_report(data_ind_park)['total_bytes']
+
+        evictions = enforce_memory_budget(data_ind_park, total_bytes - 500_000, idle_seconds=0,
+                                        spill_directory=tmp_path)
+
+        # Least recently accessed plant first, and no plant unloaded
+        assert evictions == [('Plant 1', 'derived')]
+        assert all(obj.is_loaded for obj in data_ind_park.process_data_objs)
+
+    def test_idle_plants_unloaded_and_reloaded(self, tmp_path):
+        data_ind_park = self._create_park()
+        data = data_ind_park['Plant 1'].data.copy()
+        data_version = data_ind_park['Plant 1'].data_version
+        time.sleep(0.5)
+        data_ind_park['Plant 2']
+
+        evictions = enforce_memory_budget(data_ind_park, 1, idle_seconds=0.25, spill_directory=tmp_path)
+
+        assert ('Plant 1', 'plant') in evictions
+        assert ('Plant 2', 'plant') not in evictions
+        assert not data_ind_park.process_data_objs[0].is_loaded
+
+        pd.testing.assert_frame_equal(data_ind_park['Plant 1'].data, data)
+        assert data_ind_park['Plant 1'].is_loaded
+        assert data_ind_park['Plant 1'].pyramid is not None
+        assert data_ind_park['Plant 1'].data_version == data_version
+
+    def test_same_plant_unloaded_by_two_objects(self, tmp_path):
+        # e.g. the objects of the same plant in two server workers, with the same spill directory
+        plants = [create_seeded_process_data('Plant 1', n_rows=500, n_circuits=2, seed=0) for _ in range(2)]
+        data = plants[0].data.copy()
+
+        for plant in plants:
+            plant.unload_data(tmp_path)
+
+        assert len(list(tmp_path.iterdir())) == 2
+        for plant in plants:
+            pd.testing.assert_frame_equal(plant.data, data)
+        assert not list(tmp_path.iterdir())
@@ -1,7 +1,11 @@
 import pytest
+import pandas as pd
 
 from src.data.process_data import (ProcessData, SetProcessData)
+from src.process_capability_index.utils import calculate_cap_index_ppk, get_cap_index_ppk
+from src.visualization.utils import get_figure_report_skeleton, get_histograms_selected_month
 from tests.test_fixtures import (
+    create_seeded_process_data,
     test_process_data_parameters,
     test_process_data_parameters_with_data_input,
     test_one_circuit_process_data_parameters,
@@ -44,3 +48,86 @@ class TestProcessDataClass(object):
     def test_extra_columns_process_data_class_with_data_input(self, extra_columns_process_data_parameters_with_data_input):
         with pytest.raises(OSError) as excinfo:
             ProcessData(**extra_columns_process_data_parameters_with_data_input)
+
+    def test_derived_cache(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        calls = []
+
+        def func():
+            calls.append(1)
+            return len(calls)
+
+        assert test_data.get_derived('key', func) == 1
+        assert test_data.get_derived('key', func) == 1
+        test_data.clear_derived_cache()
+        assert test_data.get_derived('key', func) == 2
+
+    def test_update_data_changes_version_and_notifies(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        notified = []
+        test_data.add_data_listener(lambda plant_name, since: notified.append((plant_name, since)))
+        data_version = test_data.data_version
+
+        new_data = test_data.data.copy()
+        new_data.iloc[0] = new_data.iloc[0] + 1.0
+        test_data.update_data(new_data)
+
+        assert test_data.data_version != data_version
+        assert notified == [(test_data.plant_name, None)]
+
+    def test_append_data_only_adds_new_samples(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters, pyramid_levels=['1D'])
+        notified = []
+        test_data.add_data_listener(lambda plant_name, since: notified.append((plant_name, since)))
+        data_version = test_data.data_version
+        n_samples = len(test_data.data)
+
+        new_index = test_data.data.index[-2:].append(test_data.data.index[-1:] + pd.Timedelta('1H'))
+        new_data = pd.DataFrame(data=1.0, index=new_index, columns=test_data.circuit_names)
+
+        assert test_data.append_data(new_data)
+        assert len(test_data.data) == n_samples + 1
+        assert test_data.data_version != data_version
+        assert notified == [(test_data.plant_name, new_index[-1])]
+        assert not test_data.append_data(new_data)
+        assert len(notified) == 1
+
+    def test_append_data_updates_only_the_affected_derived_tables(self):
+        test_data = create_seeded_process_data('Plant', n_rows=2_000, n_circuits=2, seed=0)
+        new_data = test_data.data.iloc[-50:]
+        test_data.data = test_data.data.iloc[:-50]
+        ppk_daily = get_cap_index_ppk(test_data, freq='D')
+        skeleton = get_figure_report_skeleton(test_data)
+        get_histograms_selected_month(test_data, 11, n_bins=10)
+        get_histograms_selected_month(test_data, 12, n_bins=10)
+
+        test_data.append_data(new_data)
+
+        assert get_figure_report_skeleton(test_data) is skeleton
+        assert ('histograms', 11, 10) in test_data.derived_cache
+        assert ('histograms', 12, 10) not in test_data.derived_cache
+        assert get_cap_index_ppk(test_data, freq='D') is not ppk_daily
+        pd.testing.assert_frame_equal(get_cap_index_ppk(test_data, freq='D'),
+                                    calculate_cap_index_ppk(test_data, freq='D'), check_freq=False)
+
+    def test_data_version_until_a_timestamp(self):
+        test_data = create_seeded_process_data('Plant', n_rows=200, n_circuits=2, seed=0)
+        new_data = test_data.data.iloc[-20:]
+        test_data.data = test_data.data.iloc[:-20]
+        data_version = test_data.data_version
+        until = test_data.data.index[-1]
+
+        test_data.append_data(new_data.iloc[:10])
+        test_data.append_data(new_data.iloc[10:])
+
+        assert test_data.get_data_version(until) == data_version
+        assert test_data.get_data_version(new_data.index[9]) not in (data_version, test_data.data_version)
+        assert test_data.get_data_version(new_data.index[-1]) == test_data.get_data_version()
+        assert test_data.get_data_version() == test_data.data_version
+
+    def test_append_data_with_wrong_columns_raises_error(self, test_process_data_parameters):
+        test_data = ProcessData(**test_process_data_parameters)
+        new_data = pd.DataFrame(data=1.0, index=test_data.data.index[-1:] + pd.Timedelta('1H'), columns=['Other'])
+
+        with pytest.raises(OSError):
+            test_data.append_data(new_data)
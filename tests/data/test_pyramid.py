@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from src.data.pyramid import ResolutionPyramid
+
+def _create_minute_data(n_days):
+    index = pd.date_range(start='2021-01-01', periods=n_days * 24 * 60, freq='1min')
+    return pd.DataFrame(data=np.random.normal(size=(len(index), 2)), index=index, columns=['Circuit 1', 'Circuit 2'])
+
+class TestResolutionPyramid(object):
+
+    def test_levels_sorted_and_without_raw_resolution(self):
+        data = _create_minute_data(n_days=3)
+        pyramid = ResolutionPyramid(data, ['1D', '1min', '1H', '10min'])
+
+        assert pyramid.levels == ['10min', '1H', '1D']
+
+    def test_level_aggregates(self):
+        data = _create_minute_data(n_days=3)
+        pyramid = ResolutionPyramid(data, ['1H'])
+
+        table = pyramid.get_range('Circuit 1', '2021-01-02 00:00', '2021-01-02 05:00', '1H')
+        expected = data.loc['2021-01-02 00:00':'2021-01-02 05:59', 'Circuit 1'].resample('1H').agg(['min', 'max', 'mean'])
+
+        assert len(table) == 6
+        np.testing.assert_allclose(table.to_numpy(), expected.to_numpy())
+
+    def test_select_level_fits_point_budget(self):
+        data = _create_minute_data(n_days=10)
+        pyramid = ResolutionPyramid(data, ['1D', '1H', '10min'])
+
+        assert pyramid.select_level('2021-01-01', '2021-01-02', max_points=400) == '10min'
+        assert pyramid.select_level('2021-01-01', '2021-01-05', max_points=400) == '1H'
+        assert pyramid.select_level('2021-01-01', '2021-01-10', max_points=100) == '1D'
+
+    def test_min_max_points_keep_extremes(self):
+        data = _create_minute_data(n_days=1)
+        data.iloc[123, 0] = 100.0
+        pyramid = ResolutionPyramid(data, ['1H'])
+
+        x, y = pyramid.get_min_max_points('Circuit 1', data.index[0], data.index[-1], '1H')
+
+        assert len(x) == len(y) == 48
+        assert y.max() == 100.0
+
+    def test_update_matches_new_pyramid(self):
+        data = _create_minute_data(n_days=3)
+        pyramid = ResolutionPyramid(data.iloc[:-100], ['1D', '1H', '10min'])
+
+        pyramid.update(data, since=data.index[-100])
+        expected = ResolutionPyramid(data, ['1D', '1H', '10min'])
+
+        for level in expected.levels:
+            pd.testing.assert_frame_equal(pyramid.tables[level], expected.tables[level], check_freq=False)
+
+    def test_update_with_the_tail_of_the_data(self):
+        data = _create_minute_data(n_days=3)
+        pyramid = ResolutionPyramid(data.iloc[:-100], ['1D', '1H', '10min'])
+        since = data.index[-100]
+
+        start = pyramid.get_update_start(since)
+        pyramid.update(data.loc[start:], since=since)
+        expected = ResolutionPyramid(data, ['1D', '1H', '10min'])
+
+        assert start == pd.Timestamp('2021-01-03')
+        for level in expected.levels:
+            pd.testing.assert_frame_equal(pyramid.tables[level], expected.tables[level], check_freq=False)
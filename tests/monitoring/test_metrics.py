@@ -0,0 +1,67 @@
+import pytest
+
+from src.monitoring import metrics
+from src.monitoring.metrics import (
+    Histogram,
+    increment,
+    instrument_callback,
+    instrument_stage,
+    observe,
+    record_encode,
+    record_payload,
+    render_prometheus,
+    reset_metrics
+)
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+class TestHistogram(object):
+
+    def test_cumulative_counts(self):
+        histogram = Histogram([1.0, 2.0, 5.0])
+        for value in [0.5, 1.5, 1.7, 10.0]:
+            histogram.observe(value)
+
+        assert histogram.cumulative_counts() == [1, 3, 3]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(13.7)
+
+class TestInstrumentation(object):
+
+    def test_stages_are_labeled_by_callback(self):
+
+        @instrument_stage(rows=lambda arguments: len(arguments['values']))
+        def sum_values(values):
+            return sum(values)
+
+        @instrument_callback('test_callback')
+        def callback(values):
+            return sum_values(values)
+
+        assert callback([1, 2, 3]) == 6
+        histograms = metrics._histograms
+
+        assert histograms[('callback_seconds', (('callback', 'test_callback'),))].count == 1
+        assert histograms[('stage_seconds', (('callback', 'test_callback'), ('stage', 'sum_values')))].count == 1
+        assert histograms[('rows_processed', (('callback', 'test_callback'), ('stage', 'sum_values')))].sum == 3
+        assert metrics.get_current_callback() == 'none'
+
+    def test_render_prometheus(self):
+        observe('callback_seconds', 0.02, callback='test_callback')
+        record_payload('test_callback', 2000)
+        record_encode('test_callback', 0.003)
+        increment('result_cache_requests', callback='test_callback', result='hit')
+
+        metrics_text = render_prometheus()
+
+        assert '# TYPE capability_callback_seconds histogram' in metrics_text
+        assert 'capability_callback_seconds_bucket{callback="test_callback",le="0.01"} 0' in metrics_text
+        assert 'capability_callback_seconds_bucket{callback="test_callback",le="0.025"} 1' in metrics_text
+        assert 'capability_callback_seconds_bucket{callback="test_callback",le="+Inf"} 1' in metrics_text
+        assert 'capability_payload_bytes_sum{callback="test_callback"} 2000' in metrics_text
+        assert 'capability_stage_seconds_count{callback="test_callback",stage="serialize"} 1' in metrics_text
+        assert 'capability_result_cache_requests_total{callback="test_callback",result="hit"} 1' in metrics_text
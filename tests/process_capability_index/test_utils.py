@@ -1,5 +1,17 @@
-from src.process_capability_index.utils import calculate_cap_index_ppk
+import numpy as np
+import pandas as pd
+
+from src.data.process_data import SetProcessData
+from src.process_capability_index.utils import (
+    calculate_cap_index_ppk,
+    calculate_last_periods_ppk,
+    get_cap_index_ppk,
+    get_circuits_below_goal,
+    get_last_periods_ppk,
+    get_worst_circuits
+)
 from tests.test_fixtures import (
+    create_seeded_process_data,
     test_process_data_parameters,
     test_process_data_obj_stable_processes,
     test_process_data_obj_unstable_processes
@@ -27,3 +39,67 @@ class TestCalculateCapIndexPPK(object):
         message = \
         "The function 'calculate_cap_index_ppk' didn't present expected results for unstable processes. Expected results: PPK < 1.0"
         assert all(ppk_rep_monthly[ppk_columns].min(axis=0) < 1.0), message
+
+    def test_get_ppk_uses_derived_cache(self, test_process_data_obj_unstable_processes):
+
+        ppk_rep_daily = get_cap_index_ppk(test_process_data_obj_unstable_processes, freq='D')
+
+        assert get_cap_index_ppk(test_process_data_obj_unstable_processes, freq='D') is ppk_rep_daily
+        pd.testing.assert_frame_equal(ppk_rep_daily,
+                                    calculate_cap_index_ppk(test_process_data_obj_unstable_processes, freq='D'))
+
+    def test_circuits_below_goal_sorted_worst_first(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+
+        circuit_names = get_circuits_below_goal(process_data_obj, ppk_rep_monthly)
+
+        distances = [ppk_rep_monthly.iloc[-1][(circ, 'PPK')] - process_data_obj.ppk_goals[circ] for circ in circuit_names]
+        assert set(circuit_names) <= set(process_data_obj.circuit_names)
+        assert all(distance < 0 for distance in distances)
+        assert distances == sorted(distances)
+
+class TestWorstCircuits(object):
+
+    def test_last_periods_match_calculate_cap_index_ppk(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+
+        last_periods_ppk = calculate_last_periods_ppk(process_data_obj, freq='BMS')
+
+        assert last_periods_ppk['period'] == ppk_rep_monthly.index[-1]
+        for i, circ in enumerate(process_data_obj.circuit_names):
+            np.testing.assert_allclose(last_periods_ppk['ppk'][i], ppk_rep_monthly[(circ, 'PPK')].iloc[-1])
+            np.testing.assert_allclose(last_periods_ppk['previous_ppk'][i], ppk_rep_monthly[(circ, 'PPK')].iloc[-2])
+
+    def test_worst_circuits_match_sorted_circuits(self):
+        data_ind_park = SetProcessData([create_seeded_process_data(f'Plant {i}', 2_000, 15, seed=i) for i in range(4)])
+
+        worst_circuits = get_worst_circuits(data_ind_park, 10)
+
+        distances = []
+        for process_data_obj in data_ind_park.process_data_objs:
+            ppk_last_month = calculate_cap_index_ppk(process_data_obj, freq='BMS').iloc[-1]
+            distances += [(ppk_last_month[(circ, 'PPK')] - process_data_obj.ppk_goals[circ], process_data_obj.plant_name,
+                        circ) for circ in process_data_obj.circuit_names]
+        expected = sorted(distances)[:10]
+
+        assert [(row['plant'], row['circuit']) for row in worst_circuits] == [(plant, circ) for _, plant, circ in expected]
+        np.testing.assert_allclose([row['distance_to_goal'] for row in worst_circuits],
+                                [distance for distance, _, _ in expected])
+
+    def test_worst_circuits_recalculate_changed_plants(self):
+        data_ind_park = SetProcessData([create_seeded_process_data(f'Plant {i}', 500, 3, seed=i) for i in range(2)])
+        get_worst_circuits(data_ind_park, 3)
+        changed_ppk = get_last_periods_ppk(data_ind_park['Plant 0'])
+        unchanged_ppk = get_last_periods_ppk(data_ind_park['Plant 1'])
+
+        process_data_obj = data_ind_park['Plant 0']
+        new_index = pd.date_range(process_data_obj.data.index[-1], periods=3, freq='1H')[1:]
+        process_data_obj.append_data(pd.DataFrame(0.0, index=new_index, columns=process_data_obj.circuit_names))
+        worst_circuits = get_worst_circuits(data_ind_park, 3)
+
+        assert get_last_periods_ppk(data_ind_park['Plant 0']) is not changed_ppk
+        assert get_last_periods_ppk(data_ind_park['Plant 1']) is unchanged_ppk
+        # The new samples (constant, out of the specification limits) start a new month of Plant 0
+        assert [(row['plant'], row['period']) for row in worst_circuits] == [('Plant 0', pd.Timestamp('2024-01-01'))] * 3
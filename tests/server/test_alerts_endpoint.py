@@ -0,0 +1,21 @@
+from flask import Flask
+
+from src.alerts.engine import make_alert
+from src.alerts.sinks import SQLiteAlertSink
+from src.app_config import config
+import src.server.alerts as server_alerts
+
+class TestAlertsEndpoint(object):
+
+    def test_alerts(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(server_alerts, 'PROJECT_ROOT', tmp_path)
+        SQLiteAlertSink(tmp_path / config.alerts_config.alerts_db_path).write(
+            [make_alert('Plant A', 'Circuit 1', 'ppk_below_goal', '2023-01-01', 0.5, 'Ppk below goal')])
+        server = Flask(__name__)
+        server_alerts.register_alerts_endpoint(server)
+
+        response = server.test_client().get('/alerts?plant=Plant%20A')
+
+        assert response.status_code == 200
+        assert [alert['rule'] for alert in response.get_json()] == ['ppk_below_goal']
+        assert server.test_client().get('/alerts?plant=Plant%20B').get_json() == []
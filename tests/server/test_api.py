@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from flask import Flask
+
+from src.data.process_data import SetProcessData
+from src.server.api import register_api_routes
+from tests.test_fixtures import (
+    test_process_data_parameters,
+    test_process_data_obj_unstable_processes
+)
+
+@pytest.fixture
+def api_client(test_process_data_obj_unstable_processes):
+    server = Flask(__name__)
+    register_api_routes(server, SetProcessData(process_data_objs=[test_process_data_obj_unstable_processes]))
+    return server.test_client()
+
+class TestCapabilityAPI(object):
+
+    def test_plants_and_circuits(self, api_client, test_process_data_obj_unstable_processes):
+        plant_name = test_process_data_obj_unstable_processes.plant_name
+
+        plants = api_client.get('/api/plants').get_json()
+        circuits = api_client.get(f'/api/plants/{plant_name}/circuits').get_json()
+
+        assert plants[0]['plant'] == plant_name
+        assert [item['circuit'] for item in circuits] == test_process_data_obj_unstable_processes.circuit_names
+        assert api_client.get('/api/plants/Unknown/circuits').status_code == 404
+
+    def test_ppk_table_formats(self, api_client, test_process_data_obj_unstable_processes):
+        plant_name = test_process_data_obj_unstable_processes.plant_name
+        circ = test_process_data_obj_unstable_processes.circuit_names[0]
+
+        records = api_client.get(f'/api/plants/{plant_name}/ppk?freq=D&circuits={circ}').get_json()
+        response = api_client.get(f'/api/plants/{plant_name}/ppk?freq=D&circuits={circ}&format=ndjson')
+        ndjson_records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert len(records) > 1
+        assert all(record['circuit'] == circ for record in records)
+        assert ndjson_records == records
+        assert api_client.get(f'/api/plants/{plant_name}/ppk?freq=1min').status_code == 400
+
+    def test_etag_not_modified(self, api_client, test_process_data_obj_unstable_processes):
+        plant_name = test_process_data_obj_unstable_processes.plant_name
+
+        response = api_client.get(f'/api/plants/{plant_name}/ppk')
+        etag = response.headers['ETag']
+        response_not_modified = api_client.get(f'/api/plants/{plant_name}/ppk', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response_not_modified.status_code == 304
+
+        # The ETag changes with the data version
+        new_data = test_process_data_obj_unstable_processes.data + 1.0
+        test_process_data_obj_unstable_processes.update_data(new_data)
+        response_modified = api_client.get(f'/api/plants/{plant_name}/ppk', headers={'If-None-Match': etag})
+
+        assert response_modified.status_code == 200
+
+    def test_batch(self, api_client, test_process_data_obj_unstable_processes):
+        plant_name = test_process_data_obj_unstable_processes.plant_name
+        circuit_names = test_process_data_obj_unstable_processes.circuit_names
+
+        response = api_client.post('/api/ppk/batch', json={'queries': [
+            {'plant': plant_name, 'circuits': circuit_names[:1], 'freq': 'BMS'},
+            {'plant': plant_name, 'circuits': circuit_names[1:], 'freq': 'D'},
+        ]})
+
+        assert response.status_code == 200
+        assert {record['circuit'] for record in response.get_json()} == set(circuit_names)
+        assert api_client.post('/api/ppk/batch', json={'queries': [{'plant': 'Unknown'}]}).status_code == 404
+
+    def test_batch_circuits_types(self, api_client, test_process_data_obj_unstable_processes):
+        plant_name = test_process_data_obj_unstable_processes.plant_name
+        circuit_names = test_process_data_obj_unstable_processes.circuit_names
+
+        response = api_client.post('/api/ppk/batch', json={'queries': [
+            {'plant': plant_name, 'circuits': ','.join(circuit_names[:2])}]})
+
+        assert response.status_code == 200
+        assert {record['circuit'] for record in response.get_json()} == set(circuit_names[:2])
+        for circuits in [5, {'circuit': circuit_names[0]}, [circuit_names[0], 1]]:
+            response = api_client.post('/api/ppk/batch', json={'queries': [{'plant': plant_name, 'circuits': circuits}]})
+            assert response.status_code == 400
@@ -0,0 +1,24 @@
+from flask import Flask
+
+from src.server import health
+
+class TestHealthEndpoints(object):
+
+    def test_ready_after_warm_up(self, monkeypatch):
+        monkeypatch.setattr(health, '_status', {'ready': False, 'started_at': 0.0, 'warm_up_runs': 0,
+                                                'warm_up_seconds': None, 'last_warm_up_at': None,
+                                                'plants_warm_up_seconds': {}})
+        server = Flask(__name__)
+        health.register_health_endpoints(server)
+        client = server.test_client()
+
+        assert client.get('/health').status_code == 200
+        assert client.get('/ready').status_code == 503
+
+        health.record_warm_up(1.5, {'Plant A': 1.0})
+        response = client.get('/ready')
+
+        assert response.status_code == 200
+        assert response.get_json()['warm_up_seconds'] == 1.5
+        assert response.get_json()['plants_warm_up_seconds'] == {'Plant A': 1.0}
+        assert response.get_json()['warm_up_runs'] == 1
@@ -0,0 +1,22 @@
+from flask import Flask
+
+from src.data.process_data import SetProcessData
+from src.server.memory import register_memory_endpoint
+from tests.test_fixtures import (
+    test_process_data_parameters,
+    test_process_data_obj_unstable_processes
+)
+
+class TestMemoryEndpoint(object):
+
+    def test_memory_report(self, test_process_data_obj_unstable_processes):
+        server = Flask(__name__)
+        register_memory_endpoint(server, SetProcessData(process_data_objs=[test_process_data_obj_unstable_processes]))
+
+        response = server.test_client().get('/memory')
+
+        assert response.status_code == 200
+        memory_report = response.get_json()
+        assert memory_report['plants']['Plant A']['data'] > 0
+        assert memory_report['plants']['Plant A']['loaded']
+        assert 'budget_bytes' in memory_report
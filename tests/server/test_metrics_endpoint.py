@@ -0,0 +1,49 @@
+import uuid
+from types import SimpleNamespace
+
+from flask import Flask, jsonify
+
+from dash import Patch
+
+from src.cache.result_cache import cached_result
+from src.monitoring.metrics import instrument_callback
+from src.server.metrics import register_metrics_endpoint
+from src.visualization.serialization import serialize_figure_output
+
+class TestMetricsEndpoint(object):
+
+    def test_metrics_prometheus_text(self):
+        server = Flask(__name__)
+        register_metrics_endpoint(server)
+
+        response = server.test_client().get('/metrics')
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert '# TYPE capability_stage_seconds histogram' in response.get_data(as_text=True)
+
+    def test_payload_of_the_callback_responses(self):
+        # The responses of the result cache are recorded too, and the output is only encoded when calculated
+        server = Flask(__name__)
+        register_metrics_endpoint(server)
+        plant = SimpleNamespace(plant_name='Test plant', data_version=uuid.uuid4().hex)
+
+        @instrument_callback('test_payload_callback')
+        @cached_result(lambda: (plant, ()))
+        @serialize_figure_output('test_payload_callback')
+        def callback():
+            patch = Patch()
+            patch['data'][0]['y'] = list(range(100))
+            return patch
+
+        @server.route('/_dash-update-component', methods=['POST'])
+        def update_component():
+            return jsonify(callback())
+
+        client = server.test_client()
+        response_bytes = [len(client.post('/_dash-update-component').get_data()) for _ in range(2)]
+        metrics_text = client.get('/metrics').get_data(as_text=True)
+
+        assert 'capability_payload_bytes_count{callback="test_payload_callback"} 2' in metrics_text
+        assert f'capability_payload_bytes_sum{{callback="test_payload_callback"}} {sum(response_bytes)}' in metrics_text
+        assert 'capability_stage_seconds_count{callback="test_payload_callback",stage="serialize"} 1' in metrics_text
@@ -0,0 +1,39 @@
+from flask import Flask
+
+from src.server.profiling import PROFILE_FILE_HEADER, PROFILE_HEADER, register_request_profiling
+
+def _create_server(enabled, directory):
+    server = Flask(__name__)
+    register_request_profiling(server, enabled, directory)
+
+    @server.route('/sum')
+    def sum_route():
+        return str(sum(range(1000)))
+
+    return server
+
+class TestRequestProfiling(object):
+
+    def test_profile_saved_with_header(self, tmp_path):
+        client = _create_server(True, tmp_path).test_client()
+
+        response = client.get('/sum', headers={PROFILE_HEADER: 'cprofile'})
+
+        assert response.get_data(as_text=True) == '499500'
+        assert (tmp_path / response.headers[PROFILE_FILE_HEADER]).is_file()
+        assert (tmp_path / response.headers[PROFILE_FILE_HEADER]).with_suffix('.txt').is_file()
+
+    def test_requests_without_header_not_profiled(self, tmp_path):
+        client = _create_server(True, tmp_path).test_client()
+
+        response = client.get('/sum')
+
+        assert PROFILE_FILE_HEADER not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiling_disabled(self, tmp_path):
+        client = _create_server(False, tmp_path).test_client()
+
+        response = client.get('/sum', headers={PROFILE_HEADER: 'cprofile'})
+
+        assert PROFILE_FILE_HEADER not in response.headers
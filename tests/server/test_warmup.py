@@ -0,0 +1,72 @@
+import time
+
+import src.app_layout
+from src.app_layout import precompute_default_figures
+from src.data.memory import enforce_memory_budget
+from src.data.process_data import SetProcessData
+from src.server.warmup import WarmUpScheduler, warm_up
+from tests.test_fixtures import (
+    create_seeded_process_data,
+    test_process_data_parameters,
+    test_process_data_obj_unstable_processes
+)
+
+class TestWarmUp(object):
+
+    def test_warm_up_fills_derived_cache(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+
+        warm_up(SetProcessData(process_data_objs=[process_data_obj]))
+
+        assert ('ppk', 'BMS') in process_data_obj.derived_cache
+        assert ('ppk', 'D') in process_data_obj.derived_cache
+        assert ('last_periods_ppk', 'BMS') in process_data_obj.derived_cache
+        assert ('figure_skeleton', 'report', tuple(process_data_obj.circuit_names)) in process_data_obj.derived_cache
+
+    def test_warm_up_runs_precompute_funcs(self, test_process_data_obj_unstable_processes):
+        precomputed = []
+
+        warm_up(SetProcessData(process_data_objs=[test_process_data_obj_unstable_processes]),
+                precompute_funcs=[lambda obj: precomputed.append(obj.plant_name)], max_workers=2)
+
+        assert precomputed == [test_process_data_obj_unstable_processes.plant_name]
+
+    def test_scheduler_refreshes(self, test_process_data_obj_unstable_processes):
+        precomputed = []
+        scheduler = WarmUpScheduler(SetProcessData(process_data_objs=[test_process_data_obj_unstable_processes]),
+                                    interval_seconds=0.01,
+                                    precompute_funcs=[lambda obj: precomputed.append(obj.plant_name)])
+
+        scheduler.start()
+        deadline = time.time() + 5
+        while len(precomputed) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+
+        assert len(precomputed) >= 2
+
+    def test_idle_plant_unloaded_after_scheduler_cycle(self, monkeypatch, tmp_path):
+        data_ind_park = SetProcessData([create_seeded_process_data(f'Plant {i + 1}', n_rows=2_000, n_circuits=2,
+                                                                seed=i) for i in range(2)])
+        monkeypatch.setattr(src.app_layout, 'get_data_ind_park', lambda: data_ind_park)
+        warm_up(data_ind_park, [precompute_default_figures])
+        time.sleep(0.5)
+        data_ind_park['Plant 2']
+
+        evictions = []
+        scheduler = WarmUpScheduler(data_ind_park, interval_seconds=0.01,
+                                    precompute_funcs=[precompute_default_figures],
+                                    post_warm_up_funcs=[lambda park: evictions.extend(enforce_memory_budget(
+                                        park, 1, idle_seconds=0.25, spill_directory=tmp_path))])
+
+        scheduler.start()
+        deadline = time.time() + 5
+        while ('Plant 1', 'plant') not in evictions and time.time() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+
+        # The warm-up does not access the idle plant, and the plants evicted are not precomputed again
+        assert ('Plant 1', 'plant') in evictions
+        assert not data_ind_park.process_data_objs[0].is_loaded
+        assert data_ind_park.process_data_objs[1].is_derived_evicted
+        assert not data_ind_park.process_data_objs[1].derived_cache
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / 'src'
+
+# Script that checks whether the import of a startup module loads the layout and callbacks (and pandas) or
+# creates the data of the industrial park, which are left to 'create_app'
+_IMPORT_CHECK_SCRIPT = """
+import json
+import sys
+import {module_name}
+import pipeline
+print(json.dumps({{'pandas': 'pandas' in sys.modules,
+                  'app_layout': 'app_layout' in sys.modules,
+                  'data_created': pipeline._data_ind_park is not None}}))
+"""
+
+_CREATE_APP_SCRIPT = """
+import json
+import pipeline
+from app import create_app
+from tests.test_fixtures import create_seeded_process_data
+from data.process_data import SetProcessData
+
+data_ind_park = SetProcessData([create_seeded_process_data('Plant Z', 200, 2, seed=0)])
+app = create_app(data_ind_park)
+client = app.server.test_client()
+layout = client.get('/_dash-layout').get_json()
+plants = client.get('/api/plants').get_json()
+print(json.dumps({'same_park': pipeline.get_data_ind_park() is data_ind_park,
+                  'layout': json.dumps(layout),
+                  'plants': [plant['plant'] for plant in plants]}))
+"""
+
+def _run_in_new_interpreter(script: str) -> dict:
+    # The application is imported as by the servers (from the 'src' directory), in a new interpreter so
+    # no module is already imported
+    result = subprocess.run([sys.executable, '-c', script], cwd=SRC_ROOT, capture_output=True, text=True,
+                            check=True, env={**os.environ, 'PYTHONPATH': str(SRC_ROOT.parent)})
+    return json.loads(result.stdout.splitlines()[-1])
+
+class TestStartup(object):
+
+    def test_import_has_no_side_effects(self):
+        for module_name in ['app', 'wsgi']:
+            imported = _run_in_new_interpreter(_IMPORT_CHECK_SCRIPT.format(module_name=module_name))
+
+            assert imported == {'pandas': False, 'app_layout': False, 'data_created': False}
+
+    def test_create_app_with_data(self):
+        created = _run_in_new_interpreter(_CREATE_APP_SCRIPT)
+
+        assert created['same_park']
+        assert created['plants'] == ['Plant Z']
+        assert '"data": "Plant Z"' in created['layout']
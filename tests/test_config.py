@@ -13,6 +13,15 @@ host: 0.0.0.0
 port: 8080
 debug: False
 
+# Server config
+workers: 2
+threads: 4
+timeout: 120
+
+# Warm-up config
+warm_up_workers: 4
+warm_up_refresh_seconds: 600
+
 # Layout config
 banner_bkg_color: "#004c6d"
 banner_txt_color: "#F1F1F1"
@@ -34,9 +43,65 @@ plt_control_chart_width: 1400
 plt_control_chart_height: 400
 plt_full_report_width: 1400
 plt_full_report_height: 400
+plt_control_chart_max_points: 5000
+plt_control_chart_webgl_threshold: 1000
+plt_histogram_bins: 40
+plt_violin_grid_points: 200
+plt_violin_max_points: 200
+plt_circuits_page_size: 10
+worst_circuits_default_n: 20
 
 plt_template_name: seaborn
 
+# Data config
+pyramid_levels:
+  - 1D
+  - 1H
+  - 10min
+  - 1min
+
+# Serialization config
+typed_arrays: False
+
+# Cache config
+result_cache_backend: lru
+result_cache_maxsize: 128
+result_cache_dir: .cache/results
+
+# Background callbacks config
+background_callbacks: False
+background_cache_dir: .cache/background
+
+# Live config
+live_interval_seconds: 60
+live_max_points: 5000
+live_simulated_samples: true
+live_sample_freq: 1H
+
+# Monitoring config
+profiling_enabled: False
+profiles_dir: .cache/profiles
+
+# Memory config
+memory_budget_mb: 2048
+memory_idle_plant_seconds: 1800
+memory_spill_dir: .cache/plants
+
+# Alerts config
+alerts_interval_seconds: 300
+alerts_ppk_freq: D
+alerts_run_length: 9
+alerts_lookback_days: 7
+alerts_db_path: .cache/alerts.sqlite3
+alerts_log_file: src/logs/alerts.log
+
+# Loader config
+loader_max_concurrency: 4
+loader_timeout_seconds: 30
+loader_retries: 2
+loader_retry_backoff_seconds: 0.5
+loader_parse_workers: 0
+
 # Documentation tab config
 basics_on_cap_control_file: 'basics_on_cap_control.md'
 doc_tab_width: '50%'
@@ -60,7 +125,17 @@ class TestConfiguration(object):
         config = create_and_validate_config(parsed_config=parsed_config)
 
         assert config.app_config
+        assert config.server_config
+        assert config.warm_up_config
         assert config.layout_config
+        assert config.data_config
+        assert config.cache_config
+        assert config.background_config
+        assert config.live_config
+        assert config.monitoring_config
+        assert config.memory_config
+        assert config.alerts_config
+        assert config.loader_config
         assert config.documentation_tab_config
 
     def test_missing_config_field_raises_error(self, tmpdir):
@@ -6,6 +6,43 @@ import pytest
 
 from src.data.process_data import ProcessData
 
+def create_seeded_process_data(plant_name: str, n_rows: int, n_circuits: int, seed: int, freq: str = '1H') -> ProcessData:
+    """
+    Create a Process Data object with seeded synthetic samples (normal samples with a shifted and noisier
+    period, like the sample data of the application), so the benchmarks and budget tests are reproducible.
+    The last sample is at the end of 2023, with 'n_rows' samples of the given time frequency.
+    """
+
+    rng = np.random.default_rng(seed)
+    circuit_names = [f'Circuit {i + 1}' for i in range(n_circuits)]
+    specifications_limits = {}
+    values = np.zeros(shape=(n_rows, n_circuits))
+
+    for i, circ in enumerate(circuit_names):
+        lsl = float(rng.uniform(10.0, 90.0))
+        usl = lsl + float(rng.uniform(5.0, 30.0))
+        specifications_limits[circ] = {'LSL': lsl, 'USL': usl}
+
+        max_expected_std = (usl - lsl) / 7
+        values[:, i] = rng.normal(loc=(usl + lsl) / 2, scale=rng.uniform(0.1, 1.0) * max_expected_std, size=n_rows)
+
+        n_samples_instability = n_rows // 3
+        idx_instability = rng.integers(0, n_rows - n_samples_instability)
+        values[idx_instability:idx_instability + n_samples_instability, i] += rng.normal(
+            loc=rng.uniform(-max_expected_std, max_expected_std),
+            scale=rng.uniform(1.0, 1.25) * max_expected_std,
+            size=n_samples_instability)
+
+    index = pd.date_range(end=pd.Timestamp('2023-12-31 23:50'), periods=n_rows, freq=freq)
+    data = pd.DataFrame(data=values, index=index, columns=circuit_names)
+
+    return ProcessData(plant_name=plant_name,
+                    circuit_names=circuit_names,
+                    specifications_limits=specifications_limits,
+                    ppk_goals={circ: 1.0 for circ in circuit_names},
+                    data=data,
+                    pyramid_levels=['1D', '1H'])
+
 @pytest.fixture
 def test_process_data_parameters():
     parameters = {
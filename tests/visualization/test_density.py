@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.visualization import density
+from src.visualization.density import calculate_kde
+
+class TestCalculateKDE(object):
+
+    def test_kde_integrates_to_one(self):
+        samples = np.random.normal(loc=10.0, scale=2.0, size=500)
+
+        grid, kde = calculate_kde(samples, n_grid=200)
+
+        assert len(grid) == len(kde) == 200
+        assert abs(np.sum(kde) * (grid[1] - grid[0]) - 1.0) < 0.01
+
+    def test_binned_kde_matches_direct_kde(self, monkeypatch):
+        samples = np.random.normal(loc=10.0, scale=2.0, size=density.DIRECT_KDE_MAX_SAMPLES + 1)
+
+        grid_binned, kde_binned = calculate_kde(samples, n_grid=400)
+        monkeypatch.setattr(density, 'DIRECT_KDE_MAX_SAMPLES', len(samples))
+        grid_direct, kde_direct = calculate_kde(samples, n_grid=400)
+
+        np.testing.assert_allclose(grid_binned, grid_direct)
+        assert np.max(np.abs(kde_binned - kde_direct)) < 0.01 * np.max(kde_direct)
+
+    def test_kde_ignores_missing_values(self):
+        samples = np.array([1.0, 2.0, np.nan, 3.0])
+
+        grid, kde = calculate_kde(samples, n_grid=50)
+
+        assert not np.isnan(kde).any()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.visualization.downsampling import downsample_index, lttb_downsample_index
+
+class TestDownsampling(object):
+
+    def test_lttb_respects_point_budget(self):
+        x = np.arange(10000, dtype=float)
+        y = np.random.normal(size=len(x))
+
+        index = lttb_downsample_index(x, y, 500)
+
+        assert len(index) == 500
+        assert index[0] == 0 and index[-1] == len(x) - 1
+        assert np.all(np.diff(index) > 0)
+
+    def test_lttb_keeps_peaks(self):
+        x = np.arange(10000, dtype=float)
+        y = np.zeros(len(x))
+        y[1234] = 100.0
+        y[8765] = -100.0
+
+        index = lttb_downsample_index(x, y, 100)
+
+        assert 1234 in index
+        assert 8765 in index
+
+    def test_lttb_without_downsampling(self):
+        x = np.arange(50, dtype=float)
+
+        index = lttb_downsample_index(x, x, 100)
+
+        assert np.array_equal(index, np.arange(50))
+
+    def test_downsample_keeps_flagged_points_and_drops_missing_values(self):
+        x = np.arange(10000, dtype=float)
+        y = np.random.normal(size=len(x))
+        y[10:20] = np.nan
+        keep_mask = np.zeros(len(x), dtype=bool)
+        keep_mask[::97] = True
+
+        index = downsample_index(x, y, 300, keep_mask=keep_mask)
+
+        assert set(np.flatnonzero(keep_mask & ~np.isnan(y))).issubset(index)
+        assert not np.isnan(y[index]).any()
+        assert len(index) <= 300 + 3
@@ -0,0 +1,19 @@
+from src.visualization.pagination import get_circuit_page_options, get_circuit_pages
+
+class TestCircuitPagination(object):
+
+    def test_circuit_pages(self):
+        circuit_names = [f'Circuit {i}' for i in range(1, 24)]
+
+        pages = get_circuit_pages(circuit_names, page_size=10)
+
+        assert [len(page) for page in pages] == [10, 10, 3]
+        assert sum(pages, []) == circuit_names
+
+    def test_circuit_page_options(self):
+        pages = get_circuit_pages([f'Circuit {i}' for i in range(1, 24)], page_size=10)
+
+        options = get_circuit_page_options(pages)
+
+        assert [option['value'] for option in options] == [1, 2, 3]
+        assert options[-1]['label'] == 'Circuits 21-23 of 23'
@@ -0,0 +1,96 @@
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+from strictyaml import load
+
+from src.app_config import config
+from src.process_capability_index.utils import get_cap_index_ppk
+from src.visualization.pagination import get_circuit_pages
+from src.visualization.serialization import encode_figure, get_payload_bytes
+from src.visualization.utils import (
+    create_figure_control_chart,
+    create_figure_report,
+    create_report_month_store,
+    get_histograms_selected_month
+)
+from tests.test_fixtures import create_seeded_process_data
+
+# Budgets of the scenarios (not part of the application configuration)
+PAYLOAD_BUDGET_FILE_PATH = Path(__file__).resolve().parent / 'payload_budget.yml'
+
+# The build time budgets are measured in the development machine, so the tests only fail when the build time
+# exceeds the budget by this factor (e.g. in slower CI machines); the timings are tracked by the benchmarks
+BUILD_SECONDS_TOLERANCE = 3.0
+
+class PayloadBudgetScenario(BaseModel):
+    """
+    Create configuration object of a payload budget scenario: plant with 'circuits' circuits and 'days' days
+    of hourly samples, with the budgets of the payload (full report with its month store, and Control Chart of
+    the whole time range, summed over all the circuit pages) and of the build time of the figures.
+    """
+
+    name: str
+    days: int
+    circuits: int
+    max_report_bytes: int
+    max_control_chart_bytes: int
+    max_build_seconds: float
+
+def load_payload_budget_scenarios() -> t.List[PayloadBudgetScenario]:
+    """
+    Load the payload budget scenarios of the 'payload_budget.yml' file.
+    """
+    parsed_scenarios = load(PAYLOAD_BUDGET_FILE_PATH.read_text())
+    return [PayloadBudgetScenario(**scenario) for scenario in parsed_scenarios.data['payload_budget_scenarios']]
+
+def _measure_payloads(process_data_obj) -> dict:
+    """
+    Build the full report (last month, with the month store) and the Control Chart (whole time range) of every
+    circuit page of the plant, as the callbacks do, and return the payload sizes and the build time.
+    """
+
+    typed_arrays = config.serialization_config.typed_arrays
+    n_bins = config.layout_config.plt_histogram_bins
+    data = process_data_obj.data
+    month = data.index[-1].month
+    start_date = data.index[0].strftime('%Y-%m-%dT%H:%M:%S')
+    end_date = data.index[-1].strftime('%Y-%m-%dT%H:%M:%S')
+    report_bytes = control_chart_bytes = 0
+
+    start_time = time.perf_counter()
+    for circuit_names in get_circuit_pages(process_data_obj.circuit_names, config.layout_config.plt_circuits_page_size):
+        ppk_rep_monthly = get_cap_index_ppk(process_data_obj, freq='BMS')
+        ppk_rep_daily = get_cap_index_ppk(process_data_obj, freq='D')
+
+        fig_report = create_figure_report(process_data_obj, ppk_rep_monthly,
+                                        ppk_rep_daily.loc[ppk_rep_daily.index.month == month],
+                                        data.loc[data.index.month == month],
+                                        histograms=get_histograms_selected_month(process_data_obj, month, n_bins),
+                                        circuit_names=circuit_names)
+        report_month_store = create_report_month_store(process_data_obj, ppk_rep_monthly, ppk_rep_daily, n_bins,
+                                                    circuit_names=circuit_names)
+        report_bytes += get_payload_bytes(encode_figure(fig_report, typed_arrays=typed_arrays))
+        report_bytes += get_payload_bytes(report_month_store)
+
+        fig_control_chart = create_figure_control_chart(process_data_obj, start_date, end_date, circuit_names)
+        control_chart_bytes += get_payload_bytes(encode_figure(fig_control_chart, typed_arrays=typed_arrays))
+
+    return dict(report_bytes=report_bytes, control_chart_bytes=control_chart_bytes,
+                build_seconds=time.perf_counter() - start_time)
+
+@pytest.mark.parametrize('scenario', load_payload_budget_scenarios(),
+                        ids=lambda scenario: scenario.name)
+class TestPayloadBudget(object):
+
+    def test_figures_within_budget(self, scenario):
+        process_data_obj = create_seeded_process_data('Plant 1', n_rows=scenario.days * 24,
+                                                    n_circuits=scenario.circuits, seed=0)
+
+        payloads = _measure_payloads(process_data_obj)
+
+        assert payloads['report_bytes'] <= scenario.max_report_bytes
+        assert payloads['control_chart_bytes'] <= scenario.max_control_chart_bytes
+        assert payloads['build_seconds'] <= scenario.max_build_seconds * BUILD_SECONDS_TOLERANCE
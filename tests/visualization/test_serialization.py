@@ -0,0 +1,47 @@
+import base64
+import numpy as np
+import pandas as pd
+from dash import Patch
+
+from src.visualization.serialization import encode_figure, encode_typed_array
+
+def _decode_typed_array(typed_array):
+    return np.frombuffer(base64.b64decode(typed_array['bdata']), dtype='<' + typed_array['dtype'])
+
+class TestTypedArrays(object):
+
+    def test_float_array_round_trip(self):
+        values = np.random.normal(size=100)
+
+        typed_array = encode_typed_array(values)
+
+        assert typed_array['dtype'] == 'f8'
+        np.testing.assert_array_equal(_decode_typed_array(typed_array), values)
+
+    def test_int64_array_is_downcast(self):
+        typed_array = encode_typed_array(np.arange(10, dtype=np.int64))
+
+        assert typed_array['dtype'] == 'i4'
+        np.testing.assert_array_equal(_decode_typed_array(typed_array), np.arange(10))
+
+    def test_datetime_array_as_milliseconds(self):
+        index = pd.date_range('2021-01-01', periods=5, freq='1H')
+
+        typed_array = encode_typed_array(index.to_numpy(dtype=object))
+
+        np.testing.assert_array_equal(_decode_typed_array(typed_array), index.asi8 / 1e6)
+
+    def test_string_array_unchanged(self):
+        values = np.array(['a', 'b'], dtype=object)
+
+        assert encode_typed_array(values) is values
+
+    def test_encode_patch(self):
+        patch = Patch()
+        patch['data'][0]['y'] = np.arange(3, dtype=float)
+        patch['layout']['shapes'][0]['x0'] = 1.0
+
+        encoded = encode_figure(patch)
+
+        assert encoded['operations'][0]['params']['value']['dtype'] == 'f8'
+        assert encoded['operations'][1]['params']['value'] == 1.0
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from src.app_config import config
+from src.process_capability_index.utils import calculate_cap_index_ppk
+from src.visualization.utils import (
+    apply_figure_updates,
+    calculate_histograms,
+    create_figure_control_chart,
+    create_figure_report,
+    create_report_month_store,
+    get_figure_control_chart_skeleton,
+    get_figure_control_chart_updates,
+    get_control_chart_live_updates,
+    get_control_chart_running_stats,
+    get_bar_plot_colors,
+    get_histograms_selected_month,
+    get_bar_plot_color_codes,
+    get_scatter_plot_colors,
+    get_scatter_plot_color_codes,
+    get_two_colors_colorscale
+)
+from tests.test_fixtures import (
+    test_process_data_parameters,
+    test_process_data_obj_unstable_processes
+)
+
+def _reference_bar_plot_colors(ppk_rep_df, circ, ppk_goal):
+    colors_plot = []
+    for ppk_val in ppk_rep_df[(circ, 'PPK')].values:
+        if ppk_val >= ppk_goal:
+            colors_plot.append(config.layout_config.plt_markers_color)
+        else:
+            colors_plot.append(config.layout_config.plt_markers_outliers_color)
+    return colors_plot
+
+def _reference_scatter_plot_colors(process_data_obj, start_date, end_date, circ):
+    colors_plot = []
+    spec_limits = process_data_obj.specifications_limits[circ]
+    for value in process_data_obj.data.loc[start_date:end_date, circ].values:
+        if (value >= spec_limits['LSL']) & (value <= spec_limits['USL']):
+            colors_plot.append(config.layout_config.plt_markers_color)
+        else:
+            colors_plot.append(config.layout_config.plt_markers_outliers_color)
+    return colors_plot
+
+class TestPlotColors(object):
+
+    def test_bar_plot_colors_match_reference(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+        ppk_rep_daily.iloc[0] = np.nan
+
+        for circ in process_data_obj.circuit_names:
+            ppk_goal = process_data_obj.ppk_goals[circ]
+            colors = get_bar_plot_colors(ppk_rep_df=ppk_rep_daily, circ=circ, ppk_goal=ppk_goal)
+
+            assert colors == _reference_bar_plot_colors(ppk_rep_daily, circ, ppk_goal)
+
+    def test_scatter_plot_colors_match_reference(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        process_data_obj.data.iloc[0] = np.nan
+        start_date = process_data_obj.data.index[0]
+        end_date = process_data_obj.data.index[-1]
+
+        for circ in process_data_obj.circuit_names:
+            colors = get_scatter_plot_colors(process_data_obj=process_data_obj, start_date=start_date,
+                                            end_date=end_date, circ=circ)
+
+            assert colors == _reference_scatter_plot_colors(process_data_obj, start_date, end_date, circ)
+
+    def test_color_codes_map_to_colorscale(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        start_date = process_data_obj.data.index[0]
+        end_date = process_data_obj.data.index[-1]
+        colorscale = dict((int(code), color) for code, color in get_two_colors_colorscale())
+
+        for circ in process_data_obj.circuit_names:
+            color_codes = get_scatter_plot_color_codes(process_data_obj=process_data_obj, start_date=start_date,
+                                                    end_date=end_date, circ=circ)
+
+            assert color_codes.dtype == np.int8
+            assert [colorscale[code] for code in color_codes] == \
+                _reference_scatter_plot_colors(process_data_obj, start_date, end_date, circ)
+
+class TestCalculateHistograms(object):
+
+    def test_histograms_match_numpy(self, test_process_data_obj_unstable_processes):
+        data = test_process_data_obj_unstable_processes.data.copy()
+        data.iloc[:5, 0] = np.nan
+
+        histograms = calculate_histograms(data, n_bins=25)
+
+        for circ in data.columns:
+            samples = data[circ].dropna().values
+            density, edges = np.histogram(samples, bins=25, density=True)
+
+            np.testing.assert_allclose(histograms[circ]['density'], density)
+            np.testing.assert_allclose(histograms[circ]['bin_centers'], (edges[:-1] + edges[1:]) / 2)
+            assert histograms[circ]['counts'].sum() == len(samples)
+            assert len(histograms[circ]['y_dist_plot']) == 25
+
+class TestFigureUpdates(object):
+
+    def test_apply_figure_updates_on_dict(self):
+        figure = {'data': [{'type': 'scatter'}], 'layout': {'shapes': [{'x0': 0}]}}
+        updates = [(('data', 0, 'x'), [1, 2]),
+                   (('data', 0, 'marker', 'color'), [0, 1]),
+                   (('layout', 'shapes', 0, 'x0'), 5)]
+
+        apply_figure_updates(figure, updates)
+
+        assert figure['data'][0]['x'] == [1, 2]
+        assert figure['data'][0]['marker'] == {'color': [0, 1]}
+        assert figure['layout']['shapes'][0]['x0'] == 5
+
+    def test_control_chart_from_skeleton(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        start_date = process_data_obj.data.index[-100].strftime('%Y-%m-%dT%H:%M:%S')
+        end_date = process_data_obj.data.index[-1].strftime('%Y-%m-%dT%H:%M:%S')
+
+        fig_control_chart = create_figure_control_chart(process_data_obj, start_date, end_date)
+        skeleton = get_figure_control_chart_skeleton(process_data_obj)
+
+        # The cached skeleton is not modified by the figure data
+        assert len(skeleton['figure']['data'][0]['x']) == 0
+        assert len(fig_control_chart.data[0].x) == 100
+        average_shape = fig_control_chart.layout.shapes[skeleton['shapes'][(0, 'Average')]]
+        assert average_shape.y0 == process_data_obj.data.loc[start_date:end_date, 'Circuit 1'].mean()
+
+    def test_control_chart_updates_with_picker_dates(self, test_process_data_obj_unstable_processes):
+        # The dates selected in the DatePickerRange are sent without time
+        process_data_obj = test_process_data_obj_unstable_processes
+        start_date = process_data_obj.data.index[-100].strftime('%Y-%m-%d')
+        end_date = process_data_obj.data.index[-1].strftime('%Y-%m-%d')
+
+        updates = get_figure_control_chart_updates(process_data_obj, start_date, end_date)
+
+        annotations_x = [value for path, value in updates if path[:2] == ('layout', 'annotations') and path[-1] == 'x']
+        assert annotations_x
+        assert all(x == pd.Timestamp(start_date) - pd.Timedelta(days=1) for x in annotations_x)
+
+class TestReportMonthStore(object):
+
+    def test_month_updates_match_report(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+        months = ppk_rep_daily.index.month.unique()
+
+        store_data = create_report_month_store(process_data_obj, ppk_rep_monthly, ppk_rep_daily, n_bins=20)
+        assert sorted(store_data['months']) == sorted(str(month) for month in months)
+
+        def create_report(month):
+            return create_figure_report(process_data_obj, ppk_rep_monthly,
+                                        ppk_rep_daily.loc[ppk_rep_daily.index.month == month],
+                                        process_data_obj.data.loc[process_data_obj.data.index.month == month],
+                                        histograms=get_histograms_selected_month(process_data_obj, month, 20))
+
+        # Updates of the last month applied on the report of the first month (as the clientside callback does)
+        figure = create_report(months[0]).to_plotly_json()
+        apply_figure_updates(figure, [(tuple(path), value) for path, value in store_data['months'][str(months[-1])]])
+        expected = create_report(months[-1])
+
+        for trace, expected_trace in zip(figure['data'], expected.data):
+            np.testing.assert_array_equal(np.asarray(trace['y']), np.asarray(expected_trace.y))
+
+    def test_month_without_samples_of_a_circuit(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        circ = process_data_obj.circuit_names[0]
+        data = process_data_obj.data.copy()
+        data.loc[data.index.month == data.index.month[-1], circ] = np.nan
+        process_data_obj.update_data(data)
+        ppk_rep_monthly = calculate_cap_index_ppk(process_data_obj, freq='BMS')
+        ppk_rep_daily = calculate_cap_index_ppk(process_data_obj, freq='D')
+
+        store_data = create_report_month_store(process_data_obj, ppk_rep_monthly, ppk_rep_daily, n_bins=20)
+
+        assert str(data.index.month[-1]) in store_data['months']
+
+class TestControlChartLiveUpdates(object):
+
+    def test_live_updates_send_only_new_samples(self, test_process_data_obj_unstable_processes):
+        process_data_obj = test_process_data_obj_unstable_processes
+        start_date, last_timestamp = process_data_obj.data.index[-100], process_data_obj.data.index[-11]
+        running_stats = get_control_chart_running_stats(process_data_obj, start_date, last_timestamp)
+
+        live_updates = get_control_chart_live_updates(process_data_obj, last_timestamp, running_stats, max_points=5)
+        skeleton = get_figure_control_chart_skeleton(process_data_obj)
+
+        assert live_updates['last_timestamp'] == process_data_obj.data.index[-1].isoformat()
+        for i, circ in enumerate(process_data_obj.circuit_names):
+            np.testing.assert_allclose(live_updates['extend_data']['y'][i], process_data_obj.data[circ].iloc[-5:])
+            assert len(live_updates['extend_data']['hovertemplate'][i]) == 5
+            assert live_updates['running_stats'][circ][0] == 100
+
+            average = live_updates['relayout'][f"shapes[{skeleton['shapes'][(i, 'Average')]}].y0"]
+            np.testing.assert_allclose(average, process_data_obj.data[circ].iloc[-100:].mean())
+
+        assert get_control_chart_live_updates(process_data_obj, process_data_obj.data.index[-1], running_stats,
+                                            max_points=5) is None